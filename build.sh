@@ -6,6 +6,10 @@ echo "Installing dependencies..."
 pip install --upgrade pip
 pip install -r requirements.txt
 
+if [ -z "$REDIS_URL" ]; then
+  echo "WARNING: REDIS_URL is not set. Workers will not share a cache: stats are rebuilt on every request."
+fi
+
 echo "Navigating to Django project directory..."
 cd kusanyikoo
 
@@ -30,6 +30,8 @@ interface Member {
   career: string;
   attending_date: string;
   picture: string;
+  // Resized copies, null until generated after upload
+  picture_srcset?: { webp?: string; jpeg?: string } | null;
   created_by: {
     id: number;
     username: string;
@@ -194,6 +196,8 @@ const MemberSearchPage: React.FC = () => {
                           {member.picture ? (
                             <img 
                               src={getImageUrl(member.picture)} 
+                              srcSet={member.picture_srcset?.webp}
+                              sizes="60px"
                               alt={`${member.first_name} ${member.last_name}'s Profile`} 
                               className="member-avatar-img"
                               onError={(e) => {
@@ -1,8 +1,9 @@
-import React, { useEffect, useState } from 'react';
+import React, { useCallback, useEffect, useState } from 'react';
 import { Link } from 'react-router-dom';
 import { useAppDispatch, useAppSelector } from '../../hooks/redux';
 import { fetchAdminStats } from '../../store/slices/statsSlice';
-import { fetchMembers } from '../../store/slices/membersSlice';
+import { membersAPI } from '../../services/api';
+import { Member } from '../../types';
 import {
   UsersIcon,
   UserPlusIcon,
@@ -38,24 +39,41 @@ ChartJS.register(CategoryScale, LinearScale, BarElement, LineElement, PointEleme
 const AdminDashboard: React.FC = () => {
   const dispatch = useAppDispatch();
   const { adminStats, loading } = useAppSelector((state) => state.stats);
-  const { members } = useAppSelector((state) => state.members);
   const { user } = useAppSelector((state) => state.auth);
+  const [recentMembers, setRecentMembers] = useState<Member[]>([]);
+  const [myRecentMembers, setMyRecentMembers] = useState<Member[]>([]);
+  const [myMembersTotal, setMyMembersTotal] = useState(0);
   const [lastUpdated, setLastUpdated] = useState<Date>(new Date());
   const [isAutoRefresh, setIsAutoRefresh] = useState(false);
   const [refreshInterval, setRefreshInterval] = useState<NodeJS.Timeout | null>(null);
 
+  // Only the members listed here are fetched; every count comes from the stats endpoint
+  const loadMembers = useCallback(async () => {
+    try {
+      const [recent, mine] = await Promise.all([
+        membersAPI.getMembers({ page_size: 3 }),
+        membersAPI.getMembers({ created_by: user?.id, page_size: 3, include_total: true }),
+      ]);
+      setRecentMembers(recent.data.results || []);
+      setMyRecentMembers(mine.data.results || []);
+      setMyMembersTotal(mine.data.total_count || 0);
+    } catch (error) {
+      console.error('Failed to load recent members:', error);
+    }
+  }, [user?.id]);
+
   useEffect(() => {
     dispatch(fetchAdminStats());
-    dispatch(fetchMembers({}));
+    loadMembers();
     setLastUpdated(new Date());
-  }, [dispatch]);
+  }, [dispatch, loadMembers]);
 
   // Auto-refresh data every 30 seconds if enabled
   useEffect(() => {
     if (isAutoRefresh && !refreshInterval) {
       const interval = setInterval(() => {
         dispatch(fetchAdminStats());
-        dispatch(fetchMembers({}));
+        loadMembers();
         setLastUpdated(new Date());
       }, 30000); // 30 seconds
       setRefreshInterval(interval);
@@ -70,36 +88,23 @@ const AdminDashboard: React.FC = () => {
         setRefreshInterval(null);
       }
     };
-  }, [dispatch, isAutoRefresh, refreshInterval]);
+  }, [dispatch, loadMembers, isAutoRefresh, refreshInterval]);
 
   const handleManualRefresh = () => {
     dispatch(fetchAdminStats());
-    dispatch(fetchMembers({}));
+    loadMembers();
     setLastUpdated(new Date());
   };
 
   // Calculate real-time statistics
+  const dailyRegistrations = adminStats?.daily_registrations || [];
+
   const calculateTodayRegistrations = () => {
-    const today = new Date();
-    today.setHours(0, 0, 0, 0);
-
-    return members.filter(member => {
-      if (!member.created_at) return false;
-      const createdDate = new Date(member.created_at);
-      createdDate.setHours(0, 0, 0, 0);
-      return createdDate.getTime() === today.getTime();
-    }).length;
+    return dailyRegistrations.length ? dailyRegistrations[dailyRegistrations.length - 1].count : 0;
   };
 
   const calculateWeeklyGrowth = () => {
-    const oneWeekAgo = new Date();
-    oneWeekAgo.setDate(oneWeekAgo.getDate() - 7);
-
-    const weeklyCount = members.filter(member => {
-      if (!member.created_at) return false;
-      const createdDate = new Date(member.created_at);
-      return createdDate >= oneWeekAgo;
-    }).length;
+    const weeklyCount = dailyRegistrations.reduce((sum, day) => sum + day.count, 0);
 
     // Calculate percentage growth (assuming previous week had similar pattern)
     const estimatedPreviousWeek = Math.max(1, (adminStats?.total_members || 0) - weeklyCount);
@@ -200,12 +205,7 @@ const AdminDashboard: React.FC = () => {
   ];
 
   const getRecentRegistrations = () => {
-    const filtered = members
-      .filter(member => member.created_at)
-      .sort((a, b) => new Date(b.created_at!).getTime() - new Date(a.created_at!).getTime())
-      .slice(0, 3);
-
-    return filtered.map(member => ({
+    return recentMembers.map(member => ({
       name: `${member.first_name} ${member.last_name}`,
       region: member.region || 'Unknown',
       registrant: member.registered_by ? `User ${member.registered_by}` : 'System',
@@ -216,44 +216,15 @@ const AdminDashboard: React.FC = () => {
   };
 
   const getMyMembers = () => {
-    const filteredMembers = members.filter(member => {
-      // Check if the admin created this member
-      // Handle different formats of created_by field
-      const memberCreatedBy = member.created_by;
-      const currentUserId = user?.id;
-      const currentUsername = user?.username;
-
-      // Check against user ID (number)
-      if (typeof memberCreatedBy === 'number' && memberCreatedBy === currentUserId) {
-        return true;
-      }
-
-      // Check against username (string)
-      if (typeof memberCreatedBy === 'string' && memberCreatedBy === currentUsername) {
-        return true;
-      }
-
-      // Additional check for registered_by field if created_by is not available
-      if (!memberCreatedBy && member.registered_by === currentUserId) {
-        return true;
-      }
-
-      return false;
-    });
-
-    return filteredMembers
-      .filter(member => member.created_at)
-      .sort((a, b) => new Date(b.created_at!).getTime() - new Date(a.created_at!).getTime())
-      .slice(0, 3)
-      .map(member => ({
-        id: member.id,
-        name: `${member.first_name} ${member.last_name}`,
-        initials: `${member.first_name?.[0] || ''}${member.last_name?.[0] || ''}`,
-        region: member.region || 'Unknown',
-        time: formatTimeAgo(member.created_at!),
-        profilePicture: typeof member.picture === 'string' ? member.picture : member.picture ? URL.createObjectURL(member.picture) : null,
-        saved: member.saved,
-      }));
+    return myRecentMembers.map(member => ({
+      id: member.id,
+      name: `${member.first_name} ${member.last_name}`,
+      initials: `${member.first_name?.[0] || ''}${member.last_name?.[0] || ''}`,
+      region: member.region || 'Unknown',
+      time: formatTimeAgo(member.created_at!),
+      profilePicture: typeof member.picture === 'string' ? member.picture : member.picture ? URL.createObjectURL(member.picture) : null,
+      saved: member.saved,
+    }));
   };
 
   const formatTimeAgo = (dateString: string) => {
@@ -275,87 +246,22 @@ const AdminDashboard: React.FC = () => {
     }
   };
 
-  const getMyMembersTotal = () => {
-    const filteredMembers = members.filter(member => {
-      const memberCreatedBy = member.created_by;
-      const currentUserId = user?.id;
-      const currentUsername = user?.username;
-
-      // Check against user ID (number)
-      if (typeof memberCreatedBy === 'number' && memberCreatedBy === currentUserId) {
-        return true;
-      }
-
-      // Check against username (string)
-      if (typeof memberCreatedBy === 'string' && memberCreatedBy === currentUsername) {
-        return true;
-      }
-
-      // Additional check for registered_by field if created_by is not available
-      if (!memberCreatedBy && member.registered_by === currentUserId) {
-        return true;
-      }
-
-      return false;
-    });
-
-    return filteredMembers.length;
-  };
-
   const recentRegistrations = getRecentRegistrations();
   const myMembers = getMyMembers();
-  const myMembersTotal = getMyMembersTotal();
 
   // Chart data calculations
   const getDailyRegistrationsChart = () => {
-    // Get the last 7 days (including today)
-    const last7Days: Date[] = [];
-    const dailyCounts = Array(7).fill(0);
-
-    for (let i = 6; i >= 0; i--) {
-      const date = new Date();
-      date.setDate(date.getDate() - i);
-      // Set to start of day for consistent comparison
-      date.setHours(0, 0, 0, 0);
-      last7Days.push(date);
-    }
-
-    members.forEach(member => {
-      if (member.created_at) {
-        try {
-          const memberDate = new Date(member.created_at);
-          if (isNaN(memberDate.getTime())) {
-            return; // Skip invalid dates
-          }
-
-          // Set member date to start of day for comparison
-          memberDate.setHours(0, 0, 0, 0);
-
-          // Find which day this member was created
-          const dayIndex = last7Days.findIndex(day =>
-            day.getTime() === memberDate.getTime()
-          );
-
-          if (dayIndex !== -1) {
-            dailyCounts[dayIndex]++;
-          }
-        } catch (error) {
-          // Skip members with invalid date formats
-        }
-      }
-    });
-
     return {
-      labels: last7Days.map(date => {
+      labels: dailyRegistrations.map(day => {
         const options: Intl.DateTimeFormatOptions = {
           month: 'short',
           day: 'numeric'
         };
-        return date.toLocaleDateString('en-US', options);
+        return new Date(`${day.date}T00:00:00`).toLocaleDateString('en-US', options);
       }),
       datasets: [{
         label: 'Daily Registrations',
-        data: dailyCounts,
+        data: dailyRegistrations.map(day => day.count),
         borderColor: 'rgb(34, 197, 94)',
         backgroundColor: 'rgba(34, 197, 94, 0.2)',
         tension: 0.4,
@@ -366,19 +272,18 @@ const AdminDashboard: React.FC = () => {
 
   const getGenderDistributionChart = () => {
     const genderCount = { Male: 0, Female: 0, Other: 0 };
-    members.forEach(member => {
-      let gender = member.gender;
+    (adminStats?.gender_stats || []).forEach(({ gender, count }) => {
       if (!gender) {
-        genderCount.Other++;
+        genderCount.Other += count;
       } else {
         // Normalize gender values - handle different formats
         const genderStr = gender.toString().toLowerCase().trim();
         if (genderStr === 'male' || genderStr === 'm' || genderStr === 'man' || genderStr === 'boy') {
-          genderCount.Male++;
+          genderCount.Male += count;
         } else if (genderStr === 'female' || genderStr === 'f' || genderStr === 'woman' || genderStr === 'girl') {
-          genderCount.Female++;
+          genderCount.Female += count;
         } else {
-          genderCount.Other++;
+          genderCount.Other += count;
         }
       }
     });
@@ -396,21 +301,14 @@ const AdminDashboard: React.FC = () => {
   };
 
   const getTopRegionsChart = () => {
-    const regionCount: { [key: string]: number } = {};
-    members.forEach(member => {
-      const region = member.region || 'Unknown';
-      regionCount[region] = (regionCount[region] || 0) + 1;
-    });
-
-    const topRegions = Object.entries(regionCount)
-      .sort(([,a], [,b]) => b - a)
-      .slice(0, 5);
+    // region_stats is sorted by count, largest first
+    const topRegions = (adminStats?.region_stats || []).slice(0, 5);
 
     return {
-      labels: topRegions.map(([region]) => region),
+      labels: topRegions.map(({ region }) => region || 'Unknown'),
       datasets: [{
         label: 'Members',
-        data: topRegions.map(([, count]) => count),
+        data: topRegions.map(({ count }) => count),
         backgroundColor: 'rgba(139, 92, 246, 0.6)',
       }],
     };
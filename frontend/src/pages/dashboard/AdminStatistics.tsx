@@ -1,7 +1,8 @@
-import React, { useEffect, useState } from 'react';
+import React, { useCallback, useEffect, useState } from 'react';
 import { useAppDispatch, useAppSelector } from '../../hooks/redux';
 import { fetchAdminStats } from '../../store/slices/statsSlice';
-import { fetchMembers } from '../../store/slices/membersSlice';
+import { membersAPI } from '../../services/api';
+import { Member } from '../../types';
 import {
   ChartBarIcon,
   UsersIcon,
@@ -32,25 +33,35 @@ ChartJS.register(CategoryScale, LinearScale, BarElement, Title, Tooltip, Legend,
 const AdminStatistics: React.FC = () => {
   const dispatch = useAppDispatch();
   const { adminStats, loading, error } = useAppSelector((state) => state.stats);
-  const { members } = useAppSelector((state) => state.members);
+  const [recentMembers, setRecentMembers] = useState<Member[]>([]);
   const [timeFilter, setTimeFilter] = useState('all');
   const [lastUpdated, setLastUpdated] = useState<Date>(new Date());
   const [isAutoRefresh, setIsAutoRefresh] = useState(false);
   const [refreshInterval, setRefreshInterval] = useState<NodeJS.Timeout | null>(null);
 
+  // Only the latest members are listed; every count comes from the stats endpoint
+  const loadRecentMembers = useCallback(async () => {
+    try {
+      const response = await membersAPI.getMembers({ page_size: 4 });
+      setRecentMembers(response.data.results || []);
+    } catch (error) {
+      console.error('Failed to load recent members:', error);
+    }
+  }, []);
+
   useEffect(() => {
     // Initial fetch
     dispatch(fetchAdminStats());
-    dispatch(fetchMembers({}));
+    loadRecentMembers();
     setLastUpdated(new Date());
-  }, [dispatch]);
+  }, [dispatch, loadRecentMembers]);
 
   // Auto-refresh every 30 seconds
   useEffect(() => {
     if (isAutoRefresh && !refreshInterval) {
       const interval = setInterval(() => {
         dispatch(fetchAdminStats());
-        dispatch(fetchMembers({}));
+        loadRecentMembers();
         setLastUpdated(new Date());
       }, 30000); // 30 seconds
       setRefreshInterval(interval);
@@ -65,14 +76,20 @@ const AdminStatistics: React.FC = () => {
         setRefreshInterval(null);
       }
     };
-  }, [dispatch, isAutoRefresh, refreshInterval]);
+  }, [dispatch, loadRecentMembers, isAutoRefresh, refreshInterval]);
 
   const handleManualRefresh = () => {
     dispatch(fetchAdminStats());
-    dispatch(fetchMembers({}));
+    loadRecentMembers();
     setLastUpdated(new Date());
   };
 
+  // Registrations per month of the current year, January first
+  const monthlyCounts = Array(12).fill(0);
+  (adminStats?.monthly_registrations || []).forEach(({ month, count }) => {
+    monthlyCounts[month - 1] = count;
+  });
+
   // Enhanced admin statistics data
   const statisticsData = [
     {
@@ -104,7 +121,7 @@ const AdminStatistics: React.FC = () => {
     },
     {
       title: 'This Month',
-      value: 156,
+      value: monthlyCounts[new Date().getMonth()],
       change: '+32%',
       trend: 'up',
       icon: CalendarDaysIcon,
@@ -141,12 +158,7 @@ const AdminStatistics: React.FC = () => {
   };
 
   const getRecentRegistrations = () => {
-    const filtered = members
-      .filter(member => member.created_at)
-      .sort((a, b) => new Date(b.created_at!).getTime() - new Date(a.created_at!).getTime())
-      .slice(0, 4);
-
-    return filtered.map(member => ({
+    return recentMembers.map(member => ({
       name: `${member.first_name} ${member.last_name}`,
       region: member.region || 'Unknown',
       registrant: member.registered_by ? `User ${member.registered_by}` : 'System',
@@ -162,17 +174,6 @@ const AdminStatistics: React.FC = () => {
     'Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun',
     'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec'
   ];
-  const now = new Date();
-  const year = now.getFullYear();
-  const monthlyCounts = Array(12).fill(0);
-  members.forEach(member => {
-    if (member.created_at) {
-      const date = new Date(member.created_at);
-      if (date.getFullYear() === year) {
-        monthlyCounts[date.getMonth()]++;
-      }
-    }
-  });
   const monthlyGrowth = months.map((month, i) => ({ month, members: monthlyCounts[i] }));
   const monthlyBarData = {
     labels: months,
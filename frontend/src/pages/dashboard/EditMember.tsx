@@ -4,7 +4,7 @@ import { yupResolver } from '@hookform/resolvers/yup';
 import * as yup from 'yup';
 import { useNavigate, useParams } from 'react-router-dom';
 import { useAppDispatch, useAppSelector } from '../../hooks/redux';
-import { updateMember } from '../../store/slices/membersSlice';
+import { fetchMember, updateMember } from '../../store/slices/membersSlice';
 import {
   UserIcon,
   PhoneIcon,
@@ -154,7 +154,7 @@ const EditMember: React.FC = () => {
   const navigate = useNavigate();
   const dispatch = useAppDispatch();
   const { user } = useAppSelector((state) => state.auth);
-  const { members, loading } = useAppSelector((state) => state.members);
+  const { loading } = useAppSelector((state) => state.members);
   
   const [member, setMember] = useState<Member | null>(null);
   const [isSubmitted, setIsSubmitted] = useState(false);
@@ -205,40 +205,43 @@ const EditMember: React.FC = () => {
 
   useEffect(() => {
     if (id) {
-      const foundMember = members.find(m => m.id === parseInt(id));
-      if (foundMember) {
-        setMember(foundMember);
-        reset({
-          first_name: foundMember.first_name,
-          middle_name: foundMember.middle_name || '',
-          last_name: foundMember.last_name,
-          gender: foundMember.gender as 'male' | 'female',
-          age: foundMember.age || 0,
-          marital_status: foundMember.marital_status as any,
-          saved: foundMember.saved,
-          church_registration_number: foundMember.church_registration_number || '',
-          country: foundMember.country || 'Tanzania',
-          region: foundMember.region || '',
-          center_area: foundMember.center_area || '',
-          zone: foundMember.zone || '',
-          cell: foundMember.cell || '',
-          postal_address: foundMember.postal_address || '',
-          mobile_no: foundMember.mobile_no,
-          email: foundMember.email || '',
-          church_position: foundMember.church_position || '',
-          visitors_count: foundMember.visitors_count || 0,
-          origin: foundMember.origin as 'invited' | 'efatha',
-          residence: foundMember.residence || '',
-          career: foundMember.career || '',
-          attending_date: foundMember.attending_date || new Date().toISOString().split('T')[0]
-        });
+      // The member list only holds the pages loaded so far, so load this member directly
+      dispatch(fetchMember(parseInt(id)))
+        .unwrap()
+        .then((foundMember: Member) => {
+          setMember(foundMember);
+          reset({
+            first_name: foundMember.first_name,
+            middle_name: foundMember.middle_name || '',
+            last_name: foundMember.last_name,
+            gender: foundMember.gender as 'male' | 'female',
+            age: foundMember.age || 0,
+            marital_status: foundMember.marital_status as any,
+            saved: foundMember.saved,
+            church_registration_number: foundMember.church_registration_number || '',
+            country: foundMember.country || 'Tanzania',
+            region: foundMember.region || '',
+            center_area: foundMember.center_area || '',
+            zone: foundMember.zone || '',
+            cell: foundMember.cell || '',
+            postal_address: foundMember.postal_address || '',
+            mobile_no: foundMember.mobile_no,
+            email: foundMember.email || '',
+            church_position: foundMember.church_position || '',
+            visitors_count: foundMember.visitors_count || 0,
+            origin: foundMember.origin as 'invited' | 'efatha',
+            residence: foundMember.residence || '',
+            career: foundMember.career || '',
+            attending_date: foundMember.attending_date || new Date().toISOString().split('T')[0]
+          });
         
-        if (foundMember.picture && typeof foundMember.picture === 'string') {
-          setProfileImage(foundMember.picture);
-        }
-      }
+          if (foundMember.picture && typeof foundMember.picture === 'string') {
+            setProfileImage(foundMember.picture);
+          }
+        })
+        .catch((error) => console.error('Failed to load member:', error));
     }
-  }, [id, members, reset]);
+  }, [id, dispatch, reset]);
 
   const handleBack = () => {
     const basePath = user?.role === 'admin' ? '/admin' : '/registrant';
@@ -1,8 +1,7 @@
 import React, { useState, useEffect } from 'react';
 import { useAppDispatch, useAppSelector } from '../../hooks/redux';
-import { fetchMembers } from '../../store/slices/membersSlice';
 import { fetchAdminStats } from '../../store/slices/statsSlice';
-import { exportAPI } from '../../services/api';
+import { exportAPI, membersAPI } from '../../services/api';
 import {
   DocumentArrowDownIcon,
   TableCellsIcon,
@@ -28,7 +27,6 @@ interface ExportOption {
 
 const ExportData: React.FC = () => {
   const dispatch = useAppDispatch();
-  const { members, loading: membersLoading } = useAppSelector((state) => state.members);
   const { adminStats, loading: statsLoading } = useAppSelector((state) => state.stats);
   const { user } = useAppSelector((state) => state.auth);
   
@@ -40,45 +38,20 @@ const ExportData: React.FC = () => {
   });
   const [exportProgress, setExportProgress] = useState<{ [key: string]: number }>({});
   const [exportStatus, setExportStatus] = useState<{ [key: string]: 'idle' | 'exporting' | 'completed' | 'error' }>({});
-
-  // Calculate summary statistics
-  const calculateSummaryStats = () => {
-    const stats = {
-      totalMembers: members.length,
-      males: members.filter(m => m.gender === 'male').length,
-      females: members.filter(m => m.gender === 'female').length,
-      saved: members.filter(m => m.saved).length,
-      unsaved: members.filter(m => !m.saved).length,
-      countries: {} as { [key: string]: number },
-      tanzaniaRegions: {} as { [key: string]: number },
-      darEsSalaamAreas: {} as { [key: string]: number }
-    };
-
-    // Count members by country
-    members.forEach(member => {
-      stats.countries[member.country] = (stats.countries[member.country] || 0) + 1;
-    });
-
-    // Count members by region (only for Tanzania)
-    members.filter(m => m.country === 'Tanzania' && m.region).forEach(member => {
-      stats.tanzaniaRegions[member.region!] = (stats.tanzaniaRegions[member.region!] || 0) + 1;
-    });
-
-    // Count members by center/area (only for Dar es Salaam)
-    members.filter(m => m.country === 'Tanzania' && m.region === 'Dar es Salaam' && m.center_area).forEach(member => {
-      stats.darEsSalaamAreas[member.center_area!] = (stats.darEsSalaamAreas[member.center_area!] || 0) + 1;
-    });
-
-    return stats;
+  const [myMembersCount, setMyMembersCount] = useState(0);
+
+  // Summary statistics from the stats endpoint, which counts every member
+  const countOf = (rows: Array<{ count: number }> | undefined, match: (row: any) => boolean) =>
+    (rows || []).filter(match).reduce((sum, row) => sum + row.count, 0);
+
+  const summaryStats = {
+    totalMembers: adminStats?.total_members || 0,
+    males: countOf(adminStats?.gender_stats, row => row.gender === 'male'),
+    females: countOf(adminStats?.gender_stats, row => row.gender === 'female'),
+    saved: countOf(adminStats?.saved_stats, row => row.saved),
+    unsaved: countOf(adminStats?.saved_stats, row => !row.saved),
   };
 
-  const summaryStats = calculateSummaryStats();
-
-  // Calculate real data for export options
-  const myMembersCount = members.filter(member => 
-    member.created_by === user?.id || member.registered_by === user?.id
-  ).length;
-
   const totalAnalyticsSize = adminStats ? 
     Math.round((adminStats.total_members * 0.05 + adminStats.recent_registrations * 0.02) * 100) / 100 : 0;
 
@@ -116,11 +89,11 @@ const ExportData: React.FC = () => {
     {
       id: 'members-all',
       name: 'All Members (Detailed)',
-      description: `Complete member database with ${members.length} members including personal details, contact information, and registration data`,
+      description: `Complete member database with ${summaryStats.totalMembers} members including personal details, contact information, and registration data`,
       icon: UsersIcon,
       dataType: 'members',
       formats: ['csv', 'excel', 'pdf'],
-      estimatedSize: `${Math.max(0.1, members.length * 0.015).toFixed(1)} MB`,
+      estimatedSize: `${Math.max(0.1, summaryStats.totalMembers * 0.015).toFixed(1)} MB`,
       category: 'member-data'
     },
     {
@@ -176,10 +149,17 @@ const ExportData: React.FC = () => {
   ];
 
   useEffect(() => {
-    dispatch(fetchMembers({}));
     dispatch(fetchAdminStats());
   }, [dispatch]);
 
+  // Counted by the server: the member list only holds the pages loaded so far
+  useEffect(() => {
+    if (!user?.id) return;
+    membersAPI.getMembers({ created_by: user.id, page_size: 1, include_total: true })
+      .then((response) => setMyMembersCount(response.data.total_count || 0))
+      .catch((error) => console.error('Failed to count my members:', error));
+  }, [user?.id]);
+
   const handleExportToggle = (exportId: string) => {
     setSelectedExports(prev => 
       prev.includes(exportId) 
@@ -468,7 +448,7 @@ const ExportData: React.FC = () => {
     );
   };
 
-  if (membersLoading || statsLoading) {
+  if (statsLoading) {
     return (
       <div className="min-h-screen bg-gradient-to-br from-blue-50 via-white to-green-50">
         <div className="flex items-center justify-center min-h-screen">
@@ -498,7 +478,7 @@ const ExportData: React.FC = () => {
             </div>
             <div className="text-right">
               <p className="text-sm text-gray-500">Total Members</p>
-              <p className="text-2xl font-bold text-green-600">{members.length}</p>
+              <p className="text-2xl font-bold text-green-600">{summaryStats.totalMembers}</p>
             </div>
           </div>
         </div>
@@ -1,7 +1,7 @@
 import React, { useState, useEffect } from 'react';
 import { useParams, useNavigate } from 'react-router-dom';
 import { useAppDispatch, useAppSelector } from '../../hooks/redux';
-import { deleteMember } from '../../store/slices/membersSlice';
+import { deleteMember, fetchMember } from '../../store/slices/membersSlice';
 import {
   ArrowLeftIcon,
   UserIcon,
@@ -32,7 +32,6 @@ const MemberDetails: React.FC = () => {
   const navigate = useNavigate();
   const dispatch = useAppDispatch();
   const { user } = useAppSelector((state) => state.auth);
-  const { members } = useAppSelector((state) => state.members);
   
   const [member, setMember] = useState<Member | null>(null);
   const [loading, setLoading] = useState(true);
@@ -50,18 +49,15 @@ const MemberDetails: React.FC = () => {
 
   useEffect(() => {
     if (id) {
-      // Find member in the current state first
-      const foundMember = members.find(m => m.id === parseInt(id));
-      if (foundMember) {
-        setMember(foundMember);
-        setLoading(false);
-      } else {
-        // If not found, you could fetch individual member here
-        // For now, we'll just show not found
-        setLoading(false);
-      }
+      // The member list only holds the pages loaded so far, so load this member directly
+      setLoading(true);
+      dispatch(fetchMember(parseInt(id)))
+        .unwrap()
+        .then((foundMember) => setMember(foundMember))
+        .catch(() => setMember(null))
+        .finally(() => setLoading(false));
     }
-  }, [id, members]);
+  }, [id, dispatch]);
 
   const handleBack = () => {
     const basePath = user?.role === 'admin' ? '/admin' : '/registrant';
@@ -1,7 +1,8 @@
 import React, { useState, useEffect } from 'react';
 import { useNavigate, useSearchParams, useLocation } from 'react-router-dom';
 import { useAppDispatch, useAppSelector } from '../../hooks/redux';
-import { fetchMembers, setFilters, deleteMember } from '../../store/slices/membersSlice';
+import { fetchMembers, fetchMoreMembers, setFilters, deleteMember } from '../../store/slices/membersSlice';
+import { membersAPI } from '../../services/api';
 import {
   UsersIcon,
   MagnifyingGlassIcon,
@@ -32,7 +33,7 @@ const MyMembers: React.FC = () => {
   const [searchParams] = useSearchParams();
   const location = useLocation();
   const { user } = useAppSelector((state) => state.auth);
-  const { members, loading, totalCount, filters } = useAppSelector((state) => state.members);
+  const { members, loading, loadingMore, nextCursor, totalCount, filters } = useAppSelector((state) => state.members);
 
   // Check if we should filter to only show admin's created members
   const showOnlyMyMembers = 
@@ -47,6 +48,8 @@ const MyMembers: React.FC = () => {
   const [showFilters, setShowFilters] = useState(false);
   const [viewMode, setViewMode] = useState<'grid' | 'list'>('grid');
   const [isMobile, setIsMobile] = useState(window.innerWidth <= 768);
+  const [savedCount, setSavedCount] = useState(0);
+  const [monthCount, setMonthCount] = useState(0);
 
   // Detect mobile screen size
   useEffect(() => {
@@ -58,48 +61,44 @@ const MyMembers: React.FC = () => {
     return () => window.removeEventListener('resize', handleResize);
   }, []);
 
-  // Fetch all members when component mounts and when filters change
-  useEffect(() => {
-    dispatch(fetchMembers({
-      search: searchTerm,
-      gender: selectedGender,
-      region: selectedRegion,
-      saved: selectedSaved,
-    }));
-  }, [dispatch, searchTerm, selectedGender, selectedRegion, selectedSaved]);
-
-  // Filter members created by current admin (only when needed)
-  const getMyMembers = (): Member[] => {
-    if (!showOnlyMyMembers) {
-      return members; // Show all members for admin "All Members" view
-    }
+  // Filters are applied by the server; registrants only ever get their own members
+  const listParams = React.useMemo(() => ({
+    search: searchTerm,
+    gender: selectedGender,
+    region: selectedRegion,
+    saved: selectedSaved,
+    created_by: showOnlyMyMembers && user?.role === 'admin' ? user.id : undefined,
+  }), [searchTerm, selectedGender, selectedRegion, selectedSaved, showOnlyMyMembers, user]);
 
-    return members.filter(member => {
-      const memberCreatedBy = member.created_by;
-      const currentUserId = user?.id;
-      const currentUsername = user?.username;
-      
-      // Check against user ID (number)
-      if (typeof memberCreatedBy === 'number' && memberCreatedBy === currentUserId) {
-        return true;
-      }
-      
-      // Check against username (string)
-      if (typeof memberCreatedBy === 'string' && memberCreatedBy === currentUsername) {
-        return true;
-      }
-      
-      // Additional check for registered_by field if created_by is not available
-      if (!memberCreatedBy && member.registered_by === currentUserId) {
-        return true;
-      }
-      
-      return false;
-    });
-  };
+  // Fetch the first page when component mounts and when filters change
+  useEffect(() => {
+    dispatch(fetchMembers(listParams));
+  }, [dispatch, listParams]);
 
-  const displayedMembers = getMyMembers();
-  const totalDisplayedMembers = showOnlyMyMembers ? displayedMembers.length : totalCount;
+  // Counts for the summary cards, asked of the server since only some pages are loaded
+  useEffect(() => {
+    const countMembers = async (extra: Record<string, any>) => {
+      const response = await membersAPI.getMembers({
+        ...listParams, ...extra, page_size: 1, include_total: true,
+      });
+      return response.data.total_count || 0;
+    };
+    const now = new Date();
+    const monthStart = new Date(now.getFullYear(), now.getMonth(), 1).toISOString();
+
+    Promise.all([
+      selectedSaved === false ? Promise.resolve(0) : countMembers({ saved: true }),
+      countMembers({ created_after: monthStart }),
+    ])
+      .then(([saved, thisMonth]) => {
+        setSavedCount(saved);
+        setMonthCount(thisMonth);
+      })
+      .catch((error) => console.error('Failed to load member counts:', error));
+  }, [listParams, totalCount]);
+
+  const displayedMembers = members;
+  const totalDisplayedMembers = totalCount;
 
   const handleSearch = (value: string) => {
     setSearchTerm(value);
@@ -872,7 +871,7 @@ const MyMembers: React.FC = () => {
               <div>
                 <p className={`${isMobile ? 'text-xs' : 'text-sm'} font-medium text-gray-600`}>Saved Members</p>
                 <p className={`${isMobile ? 'text-xl' : 'text-2xl'} font-bold text-green-600`}>
-                  {members.filter(m => m.saved).length}
+                  {savedCount}
                 </p>
               </div>
               <div className={`${isMobile ? 'w-10 h-10' : 'w-12 h-12'} bg-green-100 rounded-lg flex items-center justify-center`}>
@@ -888,12 +887,7 @@ const MyMembers: React.FC = () => {
               <div>
                 <p className={`${isMobile ? 'text-xs' : 'text-sm'} font-medium text-gray-600`}>This Month</p>
                 <p className={`${isMobile ? 'text-xl' : 'text-2xl'} font-bold text-blue-600`}>
-                  {members.filter(m => {
-                    const memberDate = new Date(m.created_at || m.attending_date);
-                    const now = new Date();
-                    return memberDate.getMonth() === now.getMonth() && 
-                           memberDate.getFullYear() === now.getFullYear();
-                  }).length}
+                  {monthCount}
                 </p>
               </div>
               <div className={`${isMobile ? 'w-10 h-10' : 'w-12 h-12'} bg-blue-100 rounded-lg flex items-center justify-center`}>
@@ -959,6 +953,21 @@ const MyMembers: React.FC = () => {
           </div>
         )}
 
+        {/* Load the next page of members */}
+        {!loading && nextCursor && (
+          <div className={`flex justify-center ${isMobile ? 'px-4 mt-6 mb-24' : 'mt-8'}`}>
+            <button
+              onClick={() => dispatch(fetchMoreMembers())}
+              disabled={loadingMore}
+              className={`${
+                isMobile ? 'w-full px-4 py-3 text-sm' : 'px-6 py-3'
+              } bg-white border border-gray-200 text-gray-700 rounded-xl font-semibold hover:bg-gray-50 transition-all duration-300 disabled:opacity-50`}
+            >
+              {loadingMore ? 'Loading...' : `Load More (${members.length} of ${totalCount})`}
+            </button>
+          </div>
+        )}
+
         {/* Mobile Floating Action Button */}
         {isMobile && (
           <button
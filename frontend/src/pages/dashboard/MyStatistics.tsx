@@ -1,7 +1,6 @@
 import React, { useEffect, useState } from 'react';
 import { useAppDispatch, useAppSelector } from '../../hooks/redux';
 import { fetchRegistrantStats } from '../../store/slices/statsSlice';
-import { fetchMembers } from '../../store/slices/membersSlice';
 import {
   ChartBarIcon,
   UsersIcon,
@@ -33,7 +32,6 @@ import {
 const MyStatistics: React.FC = () => {
   const dispatch = useAppDispatch();
   const { registrantStats, loading, error } = useAppSelector((state) => state.stats);
-  const { members } = useAppSelector((state) => state.members);
   const { user } = useAppSelector((state) => state.auth);
   const [timeFilter, setTimeFilter] = useState('all');
   const [lastUpdated, setLastUpdated] = useState<Date>(new Date());
@@ -41,7 +39,6 @@ const MyStatistics: React.FC = () => {
 
   useEffect(() => {
     dispatch(fetchRegistrantStats());
-    dispatch(fetchMembers({}));
     setLastUpdated(new Date());
   }, [dispatch]);
 
@@ -49,61 +46,48 @@ const MyStatistics: React.FC = () => {
   useEffect(() => {
     const interval = setInterval(() => {
       dispatch(fetchRegistrantStats());
-      dispatch(fetchMembers({}));
       setLastUpdated(new Date());
     }, 5 * 60 * 1000); // 5 minutes
 
     return () => clearInterval(interval);
   }, [dispatch]);
 
-  // Calculate real-time statistics
+  // Calculate real-time statistics from the stats endpoint, which counts every member
+  // rather than only the loaded page
+  const totalRegistered = registrantStats?.total_registered || 0;
+  const dailyRegistrations = registrantStats?.daily_registrations || [];
+  const regionStats = (registrantStats?.region_stats || []).filter(({ region }) => region);
+  const weekdayRegistrations = (registrantStats?.weekday_registrations || []).filter(({ count }) => count > 0);
+
   const calculateWeeklyRegistrations = () => {
-    const oneWeekAgo = new Date();
-    oneWeekAgo.setDate(oneWeekAgo.getDate() - 7);
-    
-    return members.filter(member => {
-      if (!member.created_at) return false;
-      const createdDate = new Date(member.created_at);
-      return createdDate >= oneWeekAgo;
-    }).length;
+    return dailyRegistrations.slice(-7).reduce((sum, day) => sum + day.count, 0);
   };
 
   const calculateMonthlyRegistrations = () => {
-    const oneMonthAgo = new Date();
-    oneMonthAgo.setMonth(oneMonthAgo.getMonth() - 1);
-    
-    return members.filter(member => {
-      if (!member.created_at) return false;
-      const createdDate = new Date(member.created_at);
-      return createdDate >= oneMonthAgo;
-    }).length;
+    return registrantStats?.recent_registrations || 0;
   };
 
   const calculateRegionsCovered = () => {
-    const uniqueRegions = new Set(
-      members
-        .filter(member => member.region)
-        .map(member => member.region)
-    );
-    return uniqueRegions.size;
+    return regionStats.length;
+  };
+
+  // Deleted members are not counted, so every counted registration succeeded
+  const getSuccessRate = () => {
+    return totalRegistered > 0 ? 100 : 0;
   };
 
   const calculateSuccessRate = () => {
-    if (members.length === 0) return '0%';
-    const successfulRegistrations = members.filter(member => !member.is_deleted).length;
-    return `${Math.round((successfulRegistrations / members.length) * 100)}%`;
+    return `${getSuccessRate()}%`;
   };
 
   const getRecentActivity = () => {
-    return members
-      .filter(member => member.created_at)
-      .sort((a, b) => new Date(b.created_at!).getTime() - new Date(a.created_at!).getTime())
+    return (registrantStats?.recent_activity || [])
       .slice(0, 4)
       .map(member => ({
         action: `Registered ${member.first_name} ${member.last_name}`,
         region: member.region || 'Unknown',
-        time: formatTimeAgo(member.created_at!),
-        status: member.is_deleted ? 'error' : 'success',
+        time: formatTimeAgo(member.created_at),
+        status: 'success',
       }));
   };
 
@@ -124,95 +108,45 @@ const MyStatistics: React.FC = () => {
   };
 
   const getBestPerformanceDay = () => {
-    const dayCount: { [key: string]: number } = {};
-    const dayNames = ['Sunday', 'Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday'];
-    
-    members.forEach(member => {
-      if (member.created_at) {
-        const day = new Date(member.created_at).getDay();
-        const dayName = dayNames[day];
-        dayCount[dayName] = (dayCount[dayName] || 0) + 1;
-      }
-    });
+    if (weekdayRegistrations.length === 0) return 'No data available';
 
-    if (Object.keys(dayCount).length === 0) return 'No data available';
-
-    const bestDay = Object.entries(dayCount).reduce((a, b) => a[1] > b[1] ? a : b);
-    return `${bestDay[0]} (${bestDay[1]} registrations)`;
+    const bestDay = weekdayRegistrations.reduce((a, b) => a.count > b.count ? a : b);
+    return `${bestDay.day} (${bestDay.count} registrations)`;
   };
 
   const getTopRegion = () => {
-    const regionCount: { [key: string]: number } = {};
-    
-    members.forEach(member => {
-      if (member.region) {
-        regionCount[member.region] = (regionCount[member.region] || 0) + 1;
-      }
-    });
-
-    if (Object.keys(regionCount).length === 0) return 'No data available';
+    if (regionStats.length === 0) return 'No data available';
 
-    const totalMembers = members.length;
-    const topRegion = Object.entries(regionCount).reduce((a, b) => a[1] > b[1] ? a : b);
-    const percentage = Math.round((topRegion[1] / totalMembers) * 100);
-    return `${topRegion[0]} (${percentage}%)`;
-  };
-
-  const getSuccessRate = () => {
-    if (members.length === 0) return 0;
-    const successfulRegistrations = members.filter(member => !member.is_deleted).length;
-    return Math.round((successfulRegistrations / members.length) * 100);
+    // region_stats is sorted by count, largest first
+    const topRegion = regionStats[0];
+    const percentage = Math.round((topRegion.count / totalRegistered) * 100);
+    return `${topRegion.region} (${percentage}%)`;
   };
 
   const getWeeklyData = () => {
-    const weeklyData = [];
     const days = ['Sun', 'Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat'];
-    
-    for (let i = 6; i >= 0; i--) {
-      const date = new Date();
-      date.setDate(date.getDate() - i);
-      const dayName = days[date.getDay()];
-      
-      const registrations = members.filter(member => {
-        if (!member.created_at) return false;
-        const memberDate = new Date(member.created_at);
-        return memberDate.toDateString() === date.toDateString();
-      }).length;
-      
-      weeklyData.push({ day: dayName, registrations });
-    }
-    
-    return weeklyData;
+
+    return dailyRegistrations.slice(-7).map(({ date, count }) => ({
+      day: days[new Date(`${date}T00:00:00`).getDay()],
+      registrations: count,
+    }));
   };
 
   // Chart data preparation functions
   const getGenderChartData = () => {
-    const genderCount: { [key: string]: number } = {};
-    members.forEach(member => {
-      if (member.gender) {
-        genderCount[member.gender] = (genderCount[member.gender] || 0) + 1;
-      }
-    });
-
-    return Object.entries(genderCount).map(([gender, count]) => ({
-      name: gender === 'male' ? 'Male' : 'Female',
-      value: count,
-      fill: gender === 'male' ? '#3B82F6' : '#EC4899'
-    }));
+    return (registrantStats?.gender_stats || [])
+      .filter(({ gender }) => gender)
+      .map(({ gender, count }) => ({
+        name: gender === 'male' ? 'Male' : 'Female',
+        value: count,
+        fill: gender === 'male' ? '#3B82F6' : '#EC4899'
+      }));
   };
 
   const getRegionChartData = () => {
-    const regionCount: { [key: string]: number } = {};
-    members.forEach(member => {
-      if (member.region) {
-        regionCount[member.region] = (regionCount[member.region] || 0) + 1;
-      }
-    });
-
-    return Object.entries(regionCount)
-      .sort(([,a], [,b]) => b - a)
+    return regionStats
       .slice(0, 8)
-      .map(([region, count]) => ({
+      .map(({ region, count }) => ({
         region,
         members: count
       }));
@@ -223,18 +157,7 @@ const MyStatistics: React.FC = () => {
   };
 
   const getPerformanceData = () => {
-    const dayCount: { [key: string]: number } = {};
-    const dayNames = ['Sunday', 'Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday'];
-
-    members.forEach(member => {
-      if (member.created_at) {
-        const day = new Date(member.created_at).getDay();
-        const dayName = dayNames[day];
-        dayCount[dayName] = (dayCount[dayName] || 0) + 1;
-      }
-    });
-
-    return Object.entries(dayCount).map(([day, count]) => ({
+    return weekdayRegistrations.map(({ day, count }) => ({
       day: day.substring(0, 3), // Short day name
       registrations: count
     }));
@@ -286,10 +209,7 @@ const MyStatistics: React.FC = () => {
   const handleRefresh = async () => {
     setIsRefreshing(true);
     try {
-      await Promise.all([
-        dispatch(fetchRegistrantStats()),
-        dispatch(fetchMembers({}))
-      ]);
+      await dispatch(fetchRegistrantStats());
       setLastUpdated(new Date());
     } finally {
       setIsRefreshing(false);
@@ -1,7 +1,8 @@
-import React, { useEffect, useState } from 'react';
+import React, { useCallback, useEffect, useState } from 'react';
 import { useAppDispatch, useAppSelector } from '../../hooks/redux';
 import { fetchRegistrantStats } from '../../store/slices/statsSlice';
-import { fetchMembers } from '../../store/slices/membersSlice';
+import { membersAPI } from '../../services/api';
+import { Member } from '../../types';
 import {
   UsersIcon,
   UserPlusIcon,
@@ -30,62 +31,56 @@ ChartJS.register(CategoryScale, LinearScale, BarElement, LineElement, PointEleme
 const RegistrantDashboard: React.FC = () => {
   const dispatch = useAppDispatch();
   const { registrantStats, loading } = useAppSelector((state) => state.stats);
-  const { members } = useAppSelector((state) => state.members);
   const { user } = useAppSelector((state) => state.auth);
   const [lastUpdated, setLastUpdated] = useState<Date>(new Date());
+  const [recentMembers, setRecentMembers] = useState<Member[]>([]);
+
+  // Only the latest members are listed; every count comes from the stats endpoint
+  const loadRecentMembers = useCallback(async () => {
+    try {
+      const response = await membersAPI.getMembers({ page_size: 3 });
+      setRecentMembers(response.data.results || []);
+    } catch (error) {
+      console.error('Failed to load recent members:', error);
+    }
+  }, []);
 
   useEffect(() => {
     dispatch(fetchRegistrantStats());
-    dispatch(fetchMembers({}));
+    loadRecentMembers();
     setLastUpdated(new Date());
-  }, [dispatch]);
+  }, [dispatch, loadRecentMembers]);
 
   // Auto-refresh data every 3 minutes for dashboard
   useEffect(() => {
     const interval = setInterval(() => {
       dispatch(fetchRegistrantStats());
-      dispatch(fetchMembers({}));
+      loadRecentMembers();
       setLastUpdated(new Date());
     }, 3 * 60 * 1000); // 3 minutes
 
     return () => clearInterval(interval);
-  }, [dispatch]);
+  }, [dispatch, loadRecentMembers]);
 
   // Calculate real-time statistics
+  const dailyRegistrations = registrantStats?.daily_registrations || [];
+
   const calculateWeeklyRegistrations = () => {
-    const oneWeekAgo = new Date();
-    oneWeekAgo.setDate(oneWeekAgo.getDate() - 7);
-    
-    return members.filter(member => {
-      if (!member.created_at) return false;
-      const createdDate = new Date(member.created_at);
-      return createdDate >= oneWeekAgo;
-    }).length;
+    return dailyRegistrations.slice(-7).reduce((sum, day) => sum + day.count, 0);
   };
 
   const calculateRecentRegistrations = () => {
-    const thirtyDaysAgo = new Date();
-    thirtyDaysAgo.setDate(thirtyDaysAgo.getDate() - 30);
-    
-    return members.filter(member => {
-      if (!member.created_at) return false;
-      const createdDate = new Date(member.created_at);
-      return createdDate >= thirtyDaysAgo;
-    }).length;
+    return registrantStats?.recent_registrations || 0;
   };
 
   const getRecentRegistrationsList = () => {
-    return members
-      .filter(member => member.created_at)
-      .sort((a, b) => new Date(b.created_at!).getTime() - new Date(a.created_at!).getTime())
-      .slice(0, 3)
-      .map(member => ({
-        name: `${member.first_name} ${member.last_name}`,
-        region: member.region || 'Unknown',
-        time: formatTimeAgo(member.created_at!),
-        profilePicture: typeof member.picture === 'string' ? member.picture : member.picture ? URL.createObjectURL(member.picture) : null,
-        initials: `${member.first_name?.[0] || ''}${member.last_name?.[0] || ''}`,
-      }));
+    return recentMembers.map(member => ({
+      name: `${member.first_name} ${member.last_name}`,
+      region: member.region || 'Unknown',
+      time: formatTimeAgo(member.created_at!),
+      profilePicture: typeof member.picture === 'string' ? member.picture : member.picture ? URL.createObjectURL(member.picture) : null,
+      initials: `${member.first_name?.[0] || ''}${member.last_name?.[0] || ''}`,
+    }));
   };
 
   const formatTimeAgo = (dateString: string) => {
@@ -173,13 +168,12 @@ const RegistrantDashboard: React.FC = () => {
     const month = now.getMonth();
     const year = now.getFullYear();
 
-    members.forEach(member => {
-      if (member.created_at) {
-        const date = new Date(member.created_at);
-        if (date.getMonth() === month && date.getFullYear() === year) {
-          const week = Math.floor(date.getDate() / 7);
-          if (week < 4) weeklyCounts[week]++;
-        }
+    // The last 31 days cover the whole current month
+    dailyRegistrations.forEach(({ date: day, count }) => {
+      const date = new Date(`${day}T00:00:00`);
+      if (date.getMonth() === month && date.getFullYear() === year) {
+        const week = Math.floor(date.getDate() / 7);
+        if (week < 4) weeklyCounts[week] += count;
       }
     });
 
@@ -196,21 +190,14 @@ const RegistrantDashboard: React.FC = () => {
   };
 
   const getRegionChartData = () => {
-    const regionCount: { [key: string]: number } = {};
-    members.forEach(member => {
-      const region = member.region || 'Unknown';
-      regionCount[region] = (regionCount[region] || 0) + 1;
-    });
-
-    const topRegions = Object.entries(regionCount)
-      .sort(([,a], [,b]) => b - a)
-      .slice(0, 5);
+    // region_stats is sorted by count, largest first
+    const topRegions = (registrantStats?.region_stats || []).slice(0, 5);
 
     return {
-      labels: topRegions.map(([region]) => region),
+      labels: topRegions.map(({ region }) => region || 'Unknown'),
       datasets: [{
         label: 'Members by Region',
-        data: topRegions.map(([, count]) => count),
+        data: topRegions.map(({ count }) => count),
         backgroundColor: [
           '#FF6384', '#36A2EB', '#FFCE56', '#4BC0C0', '#9966FF'
         ],
@@ -221,17 +208,9 @@ const RegistrantDashboard: React.FC = () => {
   const getMonthlyProgressData = () => {
     const months = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun'];
     const monthlyCounts = Array(6).fill(0);
-    const now = new Date();
-    const year = now.getFullYear();
 
-    members.forEach(member => {
-      if (member.created_at) {
-        const date = new Date(member.created_at);
-        if (date.getFullYear() === year) {
-          const month = date.getMonth();
-          if (month < 6) monthlyCounts[month]++;
-        }
-      }
+    (registrantStats?.monthly_registrations || []).forEach(({ month, count }) => {
+      if (month <= 6) monthlyCounts[month - 1] = count;
     });
 
     return {
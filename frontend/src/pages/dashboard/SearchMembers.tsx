@@ -1,7 +1,7 @@
 import React, { useState, useEffect } from 'react';
 import { useAppSelector } from '../../hooks/redux';
 import { Search, User, Phone, Mail, MapPin, Calendar, Filter } from 'lucide-react';
-import { userManagementAPI, membersAPI } from '../../services/api';
+import { cursorFrom, userManagementAPI, membersAPI } from '../../services/api';
 import { toast } from 'react-toastify';
 import '../../styles/search-members.css';
 
@@ -30,6 +30,8 @@ interface Member {
   career: string;
   attending_date: string;
   picture: string;
+  // Resized copies, null until generated after upload
+  picture_srcset?: { webp?: string; jpeg?: string } | null;
   created_by: {
     id: number;
     username: string;
@@ -51,25 +53,48 @@ const SearchMembers: React.FC = () => {
   const { user } = useAppSelector((state) => state.auth);
   const [searchTerm, setSearchTerm] = useState('');
   const [members, setMembers] = useState<Member[]>([]);
-  const [users, setUsers] = useState<SystemUser[]>([]);
   const [loading, setLoading] = useState(false);
   const [selectedUser, setSelectedUser] = useState<string>('');
   const [selectedMember, setSelectedMember] = useState<Member | null>(null);
   const [showFilters, setShowFilters] = useState(false);
 
-  // Fetch all users for filtering
+  // User filter: searches the paged user list as the admin types
+  const [userQuery, setUserQuery] = useState('');
+  const [userOptions, setUserOptions] = useState<SystemUser[]>([]);
+  const [userOptionsCursor, setUserOptionsCursor] = useState<string | null>(null);
+  const [showUserOptions, setShowUserOptions] = useState(false);
+
+  const fetchUserOptions = async (cursor?: string) => {
+    try {
+      const response = await userManagementAPI.getUsers({
+        search: userQuery.trim() || undefined,
+        page_size: 20,
+        cursor,
+      });
+      const results: SystemUser[] = response.data.results || [];
+      setUserOptions(prev => cursor ? [...prev, ...results] : results);
+      setUserOptionsCursor(cursorFrom(response.data.next));
+    } catch (error) {
+      console.error('Error fetching users:', error);
+    }
+  };
+
   useEffect(() => {
-    const fetchUsers = async () => {
-      try {
-        const response = await userManagementAPI.getUsers();
-        setUsers(response.data);
-      } catch (error) {
-        console.error('Error fetching users:', error);
-      }
-    };
+    if (!showUserOptions) {
+      return;
+    }
+    const timer = setTimeout(() => fetchUserOptions(), 300);
+    return () => clearTimeout(timer);
+    // eslint-disable-next-line react-hooks/exhaustive-deps
+  }, [userQuery, showUserOptions]);
 
-    fetchUsers();
-  }, []);
+  const userLabel = (option: SystemUser) => `${option.first_name} ${option.last_name} (${option.username})`;
+
+  const selectUser = (option: SystemUser | null) => {
+    setSelectedUser(option ? option.id.toString() : '');
+    setUserQuery(option ? userLabel(option) : '');
+    setShowUserOptions(false);
+  };
 
   const handleSearch = async () => {
     if (!searchTerm.trim() && !selectedUser) {
@@ -88,10 +113,11 @@ const SearchMembers: React.FC = () => {
       }
 
       const response = await membersAPI.getMembers(params);
-      setMembers(response.data);
+      const results = response.data.results || [];
+      setMembers(results);
       setSelectedMember(null);
 
-      if (response.data.length === 0) {
+      if (results.length === 0) {
         toast.info('No members found matching your search criteria');
       }
     } catch (error) {
@@ -138,18 +164,49 @@ const SearchMembers: React.FC = () => {
             />
           </div>
 
-          <select
-            value={selectedUser}
-            onChange={(e) => setSelectedUser(e.target.value)}
-            className="user-filter-select"
-          >
-            <option value="">All Users</option>
-            {users.map((user) => (
-              <option key={user.id} value={user.id.toString()}>
-                {user.first_name} {user.last_name} ({user.username})
-              </option>
-            ))}
-          </select>
+          <div className="user-filter-combobox">
+            <input
+              type="text"
+              placeholder="All Users"
+              value={userQuery}
+              onChange={(e) => {
+                setUserQuery(e.target.value);
+                setSelectedUser('');
+                setShowUserOptions(true);
+              }}
+              onFocus={() => setShowUserOptions(true)}
+              onBlur={() => setTimeout(() => setShowUserOptions(false), 200)}
+              className="user-filter-select"
+            />
+            {showUserOptions && (
+              <ul className="user-filter-options">
+                <li>
+                  <button type="button" onMouseDown={(e) => e.preventDefault()} onClick={() => selectUser(null)}>
+                    All Users
+                  </button>
+                </li>
+                {userOptions.map((option) => (
+                  <li key={option.id}>
+                    <button type="button" onMouseDown={(e) => e.preventDefault()} onClick={() => selectUser(option)}>
+                      {userLabel(option)}
+                    </button>
+                  </li>
+                ))}
+                {userOptionsCursor && (
+                  <li>
+                    <button
+                      type="button"
+                      className="user-filter-more"
+                      onMouseDown={(e) => e.preventDefault()}
+                      onClick={() => fetchUserOptions(userOptionsCursor)}
+                    >
+                      Load more users
+                    </button>
+                  </li>
+                )}
+              </ul>
+            )}
+          </div>
 
           <button
             onClick={() => setShowFilters(!showFilters)}
@@ -197,7 +254,13 @@ const SearchMembers: React.FC = () => {
               <div className="member-header">
                 <div className="member-avatar">
                   {member.picture ? (
-                    <img src={member.picture} alt="Profile" className="avatar-image" />
+                    <img
+                      src={member.picture}
+                      srcSet={member.picture_srcset?.webp}
+                      sizes="56px"
+                      alt="Profile"
+                      className="avatar-image"
+                    />
                   ) : (
                     <User size={24} className="avatar-icon" />
                   )}
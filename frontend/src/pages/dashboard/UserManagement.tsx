@@ -1,6 +1,6 @@
 import React, { useState, useEffect } from 'react';
 import { useAppDispatch, useAppSelector } from '../../hooks/redux';
-import { userManagementAPI } from '../../services/api';
+import { cursorFrom, userManagementAPI } from '../../services/api';
 import {
   UsersIcon,
   PlusIcon,
@@ -53,9 +53,13 @@ const UserManagement: React.FC = () => {
   // eslint-disable-next-line @typescript-eslint/no-unused-vars
   const [showBulkActions, setShowBulkActions] = useState(false);
   
-  // Real data state
+  // Real data state; search, role and status are filtered by the server
   const [users, setUsers] = useState<User[]>([]);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [matchingCount, setMatchingCount] = useState(0);
+  const [userCounts, setUserCounts] = useState({ total: 0, active: 0, admin: 0, registrant: 0 });
   const [loading, setLoading] = useState(false);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [searchTerm, setSearchTerm] = useState('');
   const [roleFilter, setRoleFilter] = useState<string>('all');
   const [statusFilter, setStatusFilter] = useState<string>('all');
@@ -73,19 +77,31 @@ const UserManagement: React.FC = () => {
     is_superuser: false,
   });
 
-  // Fetch users from database
+  // Fetch the first page whenever the filters change; wait for typing to pause
   useEffect(() => {
-    fetchUsers();
+    const timer = setTimeout(fetchUsers, searchTerm ? 300 : 0);
+    return () => clearTimeout(timer);
+    // eslint-disable-next-line react-hooks/exhaustive-deps
+  }, [searchTerm, roleFilter, statusFilter]);
+
+  useEffect(() => {
+    fetchUserCounts();
   }, []);
 
+  const listParams = () => ({
+    search: searchTerm.trim() || undefined,
+    role: roleFilter,
+    status: statusFilter,
+  });
+
   const fetchUsers = async () => {
-    console.log('fetchUsers called');
     setLoading(true);
     try {
-      const response = await userManagementAPI.getUsers();
-      console.log('API response:', response);
-      setUsers(response.data);
-      console.log('Users set:', response.data);
+      const response = await userManagementAPI.getUsers({ ...listParams(), include_total: 1 });
+      setUsers(response.data.results || []);
+      setMatchingCount(response.data.total_count || 0);
+      setNextCursor(cursorFrom(response.data.next));
+      setSelectedUsers([]);
     } catch (error) {
       console.error('Failed to fetch users:', error);
       // For development, fall back to mock data if API fails
@@ -120,21 +136,50 @@ const UserManagement: React.FC = () => {
         },
       ];
       setUsers(mockUsers);
-      console.log('Fallback to mock data:', mockUsers);
+      setUsers(mockUsers);
+      setMatchingCount(mockUsers.length);
+      setNextCursor(null);
     } finally {
       setLoading(false);
     }
   };
 
-  const filteredUsers = users.filter(user => {
-    const matchesSearch = user.username.toLowerCase().includes(searchTerm.toLowerCase()) ||
-                         user.email.toLowerCase().includes(searchTerm.toLowerCase()) ||
-                         `${user.first_name} ${user.last_name}`.toLowerCase().includes(searchTerm.toLowerCase());
-    const matchesRole = roleFilter === 'all' || user.role === roleFilter;
-    const matchesStatus = statusFilter === 'all' || user.status === statusFilter;
-    
-    return matchesSearch && matchesRole && matchesStatus;
-  });
+  const fetchMoreUsers = async () => {
+    if (!nextCursor) return;
+    setLoadingMore(true);
+    try {
+      const response = await userManagementAPI.getUsers({ ...listParams(), cursor: nextCursor });
+      const results: User[] = response.data.results || [];
+      setUsers(prev => {
+        const known = new Set(prev.map(user => user.id));
+        return [...prev, ...results.filter(user => !known.has(user.id))];
+      });
+      setNextCursor(cursorFrom(response.data.next));
+    } catch (error) {
+      console.error('Failed to fetch more users:', error);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
+  // Header counts: the server counts each with include_total on a one-row page
+  const fetchUserCounts = async () => {
+    const countUsers = async (params: Record<string, string>) => {
+      const response = await userManagementAPI.getUsers({ ...params, page_size: 1, include_total: 1 });
+      return response.data.total_count || 0;
+    };
+    try {
+      const [total, active, admin, registrant] = await Promise.all([
+        countUsers({}),
+        countUsers({ status: 'active' }),
+        countUsers({ role: 'admin' }),
+        countUsers({ role: 'registrant' }),
+      ]);
+      setUserCounts({ total, active, admin, registrant });
+    } catch (error) {
+      console.error('Failed to fetch user counts:', error);
+    }
+  };
 
   const handleCreateUser = () => {
     setEditingUser(null);
@@ -220,6 +265,7 @@ const UserManagement: React.FC = () => {
         setUsers(prev => [...prev, response.data]);
         alert('User created successfully!');
       }
+      fetchUserCounts();
       
       setShowUserModal(false);
       setUserForm({
@@ -268,6 +314,7 @@ const UserManagement: React.FC = () => {
       await userManagementAPI.deleteUser(user.id);
       setUsers(prev => prev.filter(u => u.id !== user.id));
       setShowDeleteModal(null);
+      fetchUserCounts();
       alert(`User ${user.username} has been deleted successfully.`);
     } catch (error: any) {
       console.error('Failed to delete user:', error);
@@ -296,6 +343,7 @@ const UserManagement: React.FC = () => {
       setUsers(prev => prev.map(u => 
         u.id === user.id ? { ...u, status: newStatus } : u
       ));
+      fetchUserCounts();
     } catch (error) {
       console.error('Failed to update user status:', error);
       alert(`Failed to update user status: ${error instanceof Error ? error.message : 'Unknown error'}`);
@@ -318,6 +366,7 @@ const UserManagement: React.FC = () => {
       setUsers(prev => prev.map(u => 
         u.id === user.id ? { ...u, ...response.data } : u
       ));
+      fetchUserCounts();
     } catch (error) {
       console.error('Failed to update user role:', error);
       alert(`Failed to update user role: ${error instanceof Error ? error.message : 'Unknown error'}`);
@@ -366,7 +415,7 @@ const UserManagement: React.FC = () => {
     try {
       const response = await userManagementAPI.getUserActivity(user.id);
       // Open activity in a modal or new window
-      const activityData = response.data;
+      const activityData = response.data.results || response.data;
       const activityText = activityData.map((activity: any) => 
         `${new Date(activity.timestamp).toLocaleString()} - ${activity.action} (${activity.details || 'No details'})`
       ).join('\n');
@@ -390,10 +439,10 @@ const UserManagement: React.FC = () => {
   };
 
   const handleSelectAll = () => {
-    if (selectedUsers.length === filteredUsers.length) {
+    if (selectedUsers.length === users.length) {
       setSelectedUsers([]);
     } else {
-      setSelectedUsers(filteredUsers.map(user => user.id));
+      setSelectedUsers(users.map(user => user.id));
     }
   };
 
@@ -416,6 +465,7 @@ const UserManagement: React.FC = () => {
       setUsers(prev => prev.map(user => 
         selectedUsers.includes(user.id) ? { ...user, status: newStatus } : user
       ));
+      fetchUserCounts();
       
       setSelectedUsers([]);
       alert(`Successfully updated ${selectedUsers.length} users`);
@@ -444,6 +494,7 @@ const UserManagement: React.FC = () => {
       );
       
       setUsers(prev => prev.filter(user => !selectedUsers.includes(user.id)));
+      fetchUserCounts();
       setSelectedUsers([]);
       alert(`Successfully deleted ${selectedUsers.length} users`);
     } catch (error) {
@@ -538,7 +589,7 @@ const UserManagement: React.FC = () => {
               </div>
               <div className="ml-4">
                 <p className="text-sm font-medium text-gray-600">Total Users</p>
-                <p className="text-2xl font-bold text-gray-900">{users.length}</p>
+                <p className="text-2xl font-bold text-gray-900">{userCounts.total}</p>
               </div>
             </div>
           </div>
@@ -551,7 +602,7 @@ const UserManagement: React.FC = () => {
               <div className="ml-4">
                 <p className="text-sm font-medium text-gray-600">Active Users</p>
                 <p className="text-2xl font-bold text-gray-900">
-                  {users.filter(u => u.status === 'active').length}
+                  {userCounts.active}
                 </p>
               </div>
             </div>
@@ -565,7 +616,7 @@ const UserManagement: React.FC = () => {
               <div className="ml-4">
                 <p className="text-sm font-medium text-gray-600">Administrators</p>
                 <p className="text-2xl font-bold text-gray-900">
-                  {users.filter(u => u.role === 'admin').length}
+                  {userCounts.admin}
                 </p>
               </div>
             </div>
@@ -579,7 +630,7 @@ const UserManagement: React.FC = () => {
               <div className="ml-4">
                 <p className="text-sm font-medium text-gray-600">Registrants</p>
                 <p className="text-2xl font-bold text-gray-900">
-                  {users.filter(u => u.role === 'registrant').length}
+                  {userCounts.registrant}
                 </p>
               </div>
             </div>
@@ -624,7 +675,7 @@ const UserManagement: React.FC = () => {
 
             <div className="flex items-center text-sm text-gray-600">
               <FunnelIcon className="h-4 w-4 mr-2" />
-              {filteredUsers.length} of {users.length} users
+              {users.length} of {matchingCount} users
             </div>
           </div>
         </div>
@@ -681,7 +732,7 @@ const UserManagement: React.FC = () => {
         {/* Debug Info - Remove this after fixing */}
         <div className="mb-4 p-4 bg-blue-50 border border-blue-200 rounded-lg">
           <p className="text-sm text-blue-700">
-            Debug: Users loaded: {users.length}, Filtered: {filteredUsers.length}, Loading: {loading.toString()}
+            Debug: Users loaded: {users.length}, Matching: {matchingCount}, Loading: {loading.toString()}
           </p>
           <p className="text-sm text-blue-700">
             Screen size check - FORCED DESKTOP VIEW (temporarily)
@@ -693,7 +744,7 @@ const UserManagement: React.FC = () => {
           {/* Mobile Card View */}
           <div className="hidden">
             <div className="space-y-4 p-4">
-              {filteredUsers.map((user) => (
+              {users.map((user) => (
                 <div key={user.id} className="border border-gray-200 rounded-lg p-4 bg-gray-50">
                   <div className="flex items-start justify-between mb-3">
                     <div className="flex items-center space-x-3">
@@ -829,7 +880,7 @@ const UserManagement: React.FC = () => {
                   <th className="px-6 py-3 text-left">
                     <input
                       type="checkbox"
-                      checked={selectedUsers.length === filteredUsers.length && filteredUsers.length > 0}
+                      checked={selectedUsers.length === users.length && users.length > 0}
                       onChange={handleSelectAll}
                       className="h-4 w-4 text-green-600 focus:ring-green-500 border-gray-300 rounded"
                     />
@@ -852,7 +903,7 @@ const UserManagement: React.FC = () => {
                 </tr>
               </thead>
               <tbody className="bg-white divide-y divide-gray-200">
-                {filteredUsers.map((user) => (
+                {users.map((user) => (
                   <tr key={user.id} className="hover:bg-gray-50">
                     <td className="px-6 py-4 whitespace-nowrap">
                       <input
@@ -1003,7 +1054,7 @@ const UserManagement: React.FC = () => {
             </table>
           </div>
 
-          {filteredUsers.length === 0 && !loading && (
+          {users.length === 0 && !loading && (
             <div className="text-center py-12">
               <UsersIcon className="mx-auto h-12 w-12 text-gray-400" />
               <h3 className="mt-2 text-sm font-medium text-gray-900">No users found</h3>
@@ -1023,6 +1074,19 @@ const UserManagement: React.FC = () => {
           )}
         </div>
 
+        {/* Load the next page of users */}
+        {!loading && nextCursor && (
+          <div className="flex justify-center mt-8">
+            <button
+              onClick={fetchMoreUsers}
+              disabled={loadingMore}
+              className="px-6 py-3 bg-white border border-gray-200 text-gray-700 rounded-xl font-semibold hover:bg-gray-50 transition-all duration-300 disabled:opacity-50"
+            >
+              {loadingMore ? 'Loading...' : `Load More (${users.length} of ${matchingCount})`}
+            </button>
+          </div>
+        )}
+
         {/* User Modal */}
         {showUserModal && (
           <div className="fixed inset-0 bg-gray-600 bg-opacity-50 flex items-center justify-center z-50">
@@ -148,6 +148,14 @@ export const DAR_ES_SALAAM_AREAS = [
   { value: 'temeke', label: 'Temeke' },
 ];
 
+// The `cursor` query parameter of a paginated response's `next` link
+export const cursorFrom = (next?: string | null): string | null => {
+  if (!next) {
+    return null;
+  }
+  return new URL(next, window.location.origin).searchParams.get('cursor');
+};
+
 // Members API
 export const membersAPI = {
   getMembers: (params?: any) => api.get('/api/members/', { params }),
@@ -164,8 +172,29 @@ export const membersAPI = {
     }
     return api.post('/api/members/', memberData);
   },
+  // Register up to 500 members at once; invalid entries come back in `errors` by index.
+  // Reuse the same idempotencyKey when retrying a batch so it is not registered twice.
+  bulkCreateMembers: (members: any[], idempotencyKey?: string) =>
+    api.post('/api/members/bulk/', { members }, {
+      headers: idempotencyKey ? { 'Idempotency-Key': idempotencyKey } : undefined
+    }),
   updateMember: (id: number, memberData: any) => api.put(`/api/members/${id}/`, memberData),
   deleteMember: (id: number) => api.delete(`/api/members/${id}/`),
+  // Delta sync: pass the cursor from the previous response to get only changes and deletions
+  syncMembers: (since?: string, limit?: number) => api.get('/api/members/sync/', { params: { since, limit } }),
+  // Register imports run in the background; poll getMemberImport for progress
+  importMembers: (file: File) => {
+    const formData = new FormData();
+    formData.append('file', file);
+    return api.post('/api/members/imports/', formData, {
+      headers: {
+        'Content-Type': undefined // Let axios set the multipart boundary
+      }
+    });
+  },
+  getMemberImports: () => api.get('/api/members/imports/'),
+  getMemberImport: (id: number) => api.get(`/api/members/imports/${id}/`),
+  downloadImportErrors: (id: number) => api.get(`/api/members/imports/${id}/errors/`, { responseType: 'blob' }),
   // Public search endpoint (no authentication required)
   searchMembers: (searchTerm: string) => {
     const baseURL = (api.defaults.baseURL || window.location.origin).replace(/\/$/, '');
@@ -193,7 +222,10 @@ export const userManagementAPI = {
   // Custom actions use underscores in DRF paths
   resetUserPassword: (id: number) => api.post(`/api/users/${id}/reset_password/`),
   unlockAccount: (id: number) => api.post(`/api/users/${id}/unlock_account/`),
-  getUserActivity: (id: number) => api.get(`/api/users/${id}/activity/`),
+  // Paginated: { next, previous, results }; pass the `cursor` from `next` for older entries
+  getUserActivity: (id: number, params?: any) => api.get(`/api/users/${id}/activity/`, { params }),
+  // Admin audit log; filters: user, action, resource_type, resource_id, since, until
+  getAuditLog: (params?: any) => api.get('/api/users/audit/', { params }),
 };
 
 // Export API
@@ -207,6 +239,9 @@ export const exportAPI = {
     api.post('/api/export/user-activity/', { format, ...options }, { responseType: 'blob' }),
   exportFinancial: (format: 'excel' | 'pdf' = 'excel', options: any = {}) =>
     api.post('/api/export/financial/', { format, ...options }, { responseType: 'blob' }),
+  // Background jobs: POST any export with `async: true`, poll the job, then download the file
+  getExportJob: (id: number) => api.get(`/api/export/${id}/`),
+  downloadExport: (id: number) => api.get(`/api/export/${id}/download/`, { responseType: 'blob' }),
 };
 
 // Auth API
@@ -1,13 +1,17 @@
 import { createSlice, createAsyncThunk, PayloadAction } from '@reduxjs/toolkit';
 import { Member } from '../../types';
-import { membersAPI } from '../../services/api';
+import { cursorFrom, membersAPI } from '../../services/api';
 
 interface MembersState {
   members: Member[];
   currentMember: Member | null;
   loading: boolean;
+  loadingMore: boolean;
   error: string | null;
   totalCount: number;
+  // The list is paged by the server; `nextCursor` loads the page after the last one held
+  nextCursor: string | null;
+  listParams: Record<string, any>;
   filters: {
     search: string;
     country: string;
@@ -21,8 +25,11 @@ const initialState: MembersState = {
   members: [],
   currentMember: null,
   loading: false,
+  loadingMore: false,
   error: null,
   totalCount: 0,
+  nextCursor: null,
+  listParams: {},
   filters: {
     search: '',
     country: '',
@@ -37,7 +44,7 @@ export const fetchMembers = createAsyncThunk(
   'members/fetchMembers',
   async (params: Record<string, any> = {}, { rejectWithValue }) => {
     try {
-      const response = await membersAPI.getMembers(params);
+      const response = await membersAPI.getMembers({ include_total: true, ...params });
       return response.data;
     } catch (error: any) {
       return rejectWithValue(
@@ -47,6 +54,28 @@ export const fetchMembers = createAsyncThunk(
   }
 );
 
+// Append the next page of the list fetched by fetchMembers, with the same filters
+export const fetchMoreMembers = createAsyncThunk(
+  'members/fetchMoreMembers',
+  async (_, { getState, rejectWithValue }) => {
+    const { listParams, nextCursor } = (getState() as { members: MembersState }).members;
+    try {
+      const response = await membersAPI.getMembers({ ...listParams, cursor: nextCursor });
+      return { data: response.data, cursor: nextCursor };
+    } catch (error: any) {
+      return rejectWithValue(
+        error.response?.data?.message || 'Failed to fetch members'
+      );
+    }
+  },
+  {
+    condition: (_, { getState }) => {
+      const { nextCursor, loading, loadingMore } = (getState() as { members: MembersState }).members;
+      return Boolean(nextCursor) && !loading && !loadingMore;
+    },
+  }
+);
+
 export const fetchMember = createAsyncThunk(
   'members/fetchMember',
   async (id: number, { rejectWithValue }) => {
@@ -165,9 +194,11 @@ const membersSlice = createSlice({
   extraReducers: (builder) => {
     builder
       // Fetch Members
-      .addCase(fetchMembers.pending, (state) => {
+      .addCase(fetchMembers.pending, (state, action) => {
         state.loading = true;
         state.error = null;
+        state.listParams = action.meta.arg || {};
+        state.nextCursor = null;
       })
       .addCase(fetchMembers.fulfilled, (state, action) => {
         state.loading = false;
@@ -178,6 +209,7 @@ const membersSlice = createSlice({
         } else if (action.payload.results) {
           state.members = action.payload.results || [];
           state.totalCount = action.payload.total_count || 0;
+          state.nextCursor = cursorFrom(action.payload.next);
         } else {
           state.members = [];
           state.totalCount = 0;
@@ -188,6 +220,27 @@ const membersSlice = createSlice({
         state.error = action.payload as string;
       })
       
+      // Fetch More Members
+      .addCase(fetchMoreMembers.pending, (state) => {
+        state.loadingMore = true;
+        state.error = null;
+      })
+      .addCase(fetchMoreMembers.fulfilled, (state, action) => {
+        state.loadingMore = false;
+        // Ignore a page of a list that has been fetched again since
+        if (action.payload.cursor !== state.nextCursor) {
+          return;
+        }
+        const known = new Set(state.members.map(m => m.id));
+        const results: Member[] = action.payload.data.results || [];
+        state.members.push(...results.filter(m => !known.has(m.id)));
+        state.nextCursor = cursorFrom(action.payload.data.next);
+      })
+      .addCase(fetchMoreMembers.rejected, (state, action) => {
+        state.loadingMore = false;
+        state.error = action.payload as string;
+      })
+      
       // Fetch Member
       .addCase(fetchMember.pending, (state) => {
         state.loading = true;
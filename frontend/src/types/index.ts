@@ -80,6 +80,10 @@ export interface AdminStats {
   saved_stats: Array<{ saved: boolean; count: number }>;
   recent_registrations: number;
   weekly_growth: Array<{ week: string; count: number }>;
+  // Last 7 days, oldest first; dates are YYYY-MM-DD
+  daily_registrations: Array<{ date: string; count: number }>;
+  // Months 1-12 of the current year
+  monthly_registrations: Array<{ month: number; count: number }>;
 }
 
 export interface RegistrantStats {
@@ -89,7 +93,13 @@ export interface RegistrantStats {
   saved_stats: Array<{ saved: boolean; count: number }>;
   recent_registrations: number;
   weekly_performance: Array<{ week: string; count: number }>;
-  recent_activity: Array<{ first_name: string; last_name: string; created_at: string }>;
+  // Last 31 days, oldest first; dates are YYYY-MM-DD
+  daily_registrations: Array<{ date: string; count: number }>;
+  // Months 1-12 of the current year
+  monthly_registrations: Array<{ month: number; count: number }>;
+  // All-time registrations per day of the week, Sunday first
+  weekday_registrations: Array<{ day: string; count: number }>;
+  recent_activity: Array<{ first_name: string; last_name: string; region: string; created_at: string }>;
 }
 
 // API Response types
@@ -4,7 +4,9 @@ from .views import (
     export_analytics,
     export_user_activity,
     export_financial,
-    export_history
+    export_history,
+    export_detail,
+    export_download,
 )
 
 urlpatterns = [
@@ -13,4 +15,6 @@ urlpatterns = [
     path('user-activity/', export_user_activity, name='export-user-activity'),
     path('financial/', export_financial, name='export-financial'),
     path('history/', export_history, name='export-history'),
-]
\ No newline at end of file
+    path('<int:pk>/', export_detail, name='export-detail'),
+    path('<int:pk>/download/', export_download, name='export-download'),
+]
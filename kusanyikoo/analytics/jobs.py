@@ -0,0 +1,94 @@
+"""
+Background export jobs.
+
+An export job is an ExportHistory row in the `pending` state. The worker
+renders it with the same builders the synchronous endpoints use, writes the
+result to the default storage and marks the row completed (or failed). A job
+left `running` by a worker that died is requeued once it has run for longer
+than EXPORT_JOB_TIMEOUT_MINUTES.
+"""
+import re
+import tempfile
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files import File
+from django.utils import timezone
+
+from kusanyikoo import worker
+from .models import ExportHistory
+
+WRITE_CHUNK_SIZE = 64 * 1024
+
+
+def format_size(byte_count):
+    return f"{byte_count / 1024:.1f} KB"
+
+
+def enqueue_export(history):
+    worker.submit(run_export_job, history.pk)
+
+
+def _filename(response, history):
+    match = re.search(r'filename="([^"]+)"', response.get('Content-Disposition', ''))
+    if match:
+        return match.group(1)
+    return f'{history.export_type}_{history.pk}'
+
+
+def _chunks(response):
+    if response.streaming:
+        yield from response.streaming_content
+    else:
+        yield response.content
+
+
+def run_export_job(history_id):
+    """Render export `history_id` to storage; a no-op unless it is still pending."""
+    from .views import EXPORT_BUILDERS
+
+    claimed = ExportHistory.objects.filter(pk=history_id, status='pending')\
+        .update(status='running', started_at=timezone.now())
+    if not claimed:
+        return
+
+    history = ExportHistory.objects.get(pk=history_id)
+    try:
+        response = EXPORT_BUILDERS[history.export_type](history.format, history.filters_applied)
+        with tempfile.TemporaryFile() as output:
+            size = 0
+            for chunk in _chunks(response):
+                output.write(chunk)
+                size += len(chunk)
+            output.seek(0)
+            history.file.save(_filename(response, history), File(output), save=False)
+
+        history.status = 'completed'
+        history.file_size = format_size(size)
+    except Exception as e:
+        history.status = 'failed'
+        history.error = str(e)
+    history.completed_at = timezone.now()
+    history.save(update_fields=['status', 'file', 'file_size', 'error', 'completed_at'])
+
+
+def requeue_stale_exports(timeout_minutes=None):
+    """Return jobs stuck in `running` past the timeout to `pending`; returns how many."""
+    if timeout_minutes is None:
+        timeout_minutes = settings.EXPORT_JOB_TIMEOUT_MINUTES
+    cutoff = timezone.now() - timedelta(minutes=timeout_minutes)
+    return ExportHistory.objects.filter(status='running', started_at__lt=cutoff)\
+        .update(status='pending', started_at=None)
+
+
+def process_pending_exports(limit=None):
+    """Run queued jobs in this process, stale ones included; returns how many were attempted."""
+    requeue_stale_exports()
+    pending = ExportHistory.objects.filter(status='pending').order_by('created_at')\
+        .values_list('pk', flat=True)
+    if limit:
+        pending = pending[:limit]
+    ids = list(pending)
+    for history_id in ids:
+        run_export_job(history_id)
+    return len(ids)
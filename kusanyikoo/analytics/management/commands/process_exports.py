@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from analytics.jobs import process_pending_exports, requeue_stale_exports
+
+
+class Command(BaseCommand):
+    help = 'Run export jobs that are still pending or were left running (e.g. after a restart)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--limit', type=int, default=None, help='Maximum number of jobs to run')
+        parser.add_argument(
+            '--requeue-stale', type=int, default=None, metavar='MINUTES',
+            help='Requeue jobs stuck in "running" for longer than MINUTES '
+                 '(default: EXPORT_JOB_TIMEOUT_MINUTES)'
+        )
+
+    def handle(self, *args, **options):
+        requeued = requeue_stale_exports(options['requeue_stale'])
+        self.stdout.write(f'Requeued {requeued} stale export jobs')
+
+        processed = process_pending_exports(options['limit'])
+        self.stdout.write(self.style.SUCCESS(f'Processed {processed} export jobs'))
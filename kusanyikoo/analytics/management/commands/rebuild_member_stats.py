@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from analytics.rollups import rebuild
+from members.cache import bump_data_version
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the MemberDailyStat rollup from the members table'
+
+    def handle(self, *args, **options):
+        rows = rebuild()
+        bump_data_version()
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt member statistics: {rows} rollup rows'))
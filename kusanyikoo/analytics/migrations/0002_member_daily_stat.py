@@ -0,0 +1,59 @@
+# Generated by Django 4.2.7 on 2026-10-17 00:37
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count
+from django.db.models.functions import TruncDate
+import django.db.models.deletion
+
+
+def backfill_member_daily_stats(apps, schema_editor):
+    Member = apps.get_model('members', 'Member')
+    MemberDailyStat = apps.get_model('analytics', 'MemberDailyStat')
+    rows = Member.objects.filter(is_deleted=False)\
+        .annotate(date=TruncDate('created_at'))\
+        .values('date', 'created_by', 'country', 'region', 'center_area',
+                'gender', 'marital_status', 'saved', 'origin')\
+        .annotate(count=Count('id'))\
+        .order_by()
+    MemberDailyStat.objects.bulk_create(
+        [MemberDailyStat(created_by_id=row.pop('created_by'), **row) for row in rows],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('analytics', '0001_initial'),
+        ('members', '0007_member_search_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MemberDailyStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('country', models.CharField(max_length=100)),
+                ('region', models.CharField(blank=True, max_length=100)),
+                ('center_area', models.CharField(blank=True, max_length=100)),
+                ('gender', models.CharField(max_length=10)),
+                ('marital_status', models.CharField(max_length=20)),
+                ('saved', models.BooleanField(default=False)),
+                ('origin', models.CharField(max_length=20)),
+                ('count', models.IntegerField(default=0)),
+                ('created_by', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='member_daily_stats', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-date'],
+                'indexes': [models.Index(fields=['created_by', 'date'], name='analytics_m_created_c58ad4_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='memberdailystat',
+            constraint=models.UniqueConstraint(fields=('date', 'created_by', 'country', 'region', 'center_area', 'gender', 'marital_status', 'saved', 'origin'), name='unique_member_daily_stat'),
+        ),
+        migrations.RunPython(backfill_member_daily_stats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 4.2.7 on 2026-10-17 00:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0002_member_daily_stat'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='exporthistory',
+            name='completed_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='exporthistory',
+            name='error',
+            field=models.TextField(blank=True),
+        ),
+        migrations.AddField(
+            model_name='exporthistory',
+            name='file',
+            field=models.FileField(blank=True, upload_to='exports/%Y/%m/'),
+        ),
+        migrations.AddField(
+            model_name='exporthistory',
+            name='started_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        # Exports recorded before jobs existed all ran synchronously and finished.
+        migrations.AddField(
+            model_name='exporthistory',
+            name='status',
+            field=models.CharField(choices=[('pending', 'Pending'), ('running', 'Running'), ('completed', 'Completed'), ('failed', 'Failed')], default='completed', max_length=20),
+        ),
+        migrations.AlterField(
+            model_name='exporthistory',
+            name='status',
+            field=models.CharField(choices=[('pending', 'Pending'), ('running', 'Running'), ('completed', 'Completed'), ('failed', 'Failed')], default='pending', max_length=20),
+        ),
+        migrations.AddIndex(
+            model_name='exporthistory',
+            index=models.Index(fields=['status', 'created_at'], name='analytics_e_status_072a37_idx'),
+        ),
+    ]
@@ -17,6 +17,13 @@ class ExportHistory(models.Model):
         ('pdf', 'PDF'),
     ]
     
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('running', 'Running'),
+        ('completed', 'Completed'),
+        ('failed', 'Failed'),
+    ]
+    
     export_type = models.CharField(max_length=20, choices=EXPORT_TYPES)
     format = models.CharField(max_length=10, choices=FORMAT_CHOICES)
     created_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='exports')
@@ -25,12 +32,55 @@ class ExportHistory(models.Model):
     download_count = models.PositiveIntegerField(default=0)
     filters_applied = models.JSONField(default=dict)
     
+    # Background job state; synchronous exports are recorded as completed
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    file = models.FileField(upload_to='exports/%Y/%m/', blank=True)
+    error = models.TextField(blank=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    completed_at = models.DateTimeField(null=True, blank=True)
+    
     class Meta:
         ordering = ['-created_at']
         indexes = [
             models.Index(fields=['created_by', 'created_at']),
             models.Index(fields=['export_type', 'created_at']),
+            models.Index(fields=['status', 'created_at']),
         ]
     
     def __str__(self):
         return f"{self.export_type} - {self.format} - {self.created_by} - {self.created_at}"
+
+
+class MemberDailyStat(models.Model):
+    """
+    Member counts rolled up per registration day and dimension combination.
+
+    Maintained incrementally by analytics.signals as members are created,
+    edited and soft-deleted; rebuild with `manage.py rebuild_member_stats`.
+    """
+    date = models.DateField()
+    created_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='member_daily_stats')
+    country = models.CharField(max_length=100)
+    region = models.CharField(max_length=100, blank=True)
+    center_area = models.CharField(max_length=100, blank=True)
+    gender = models.CharField(max_length=10)
+    marital_status = models.CharField(max_length=20)
+    saved = models.BooleanField(default=False)
+    origin = models.CharField(max_length=20)
+    count = models.IntegerField(default=0)
+    
+    class Meta:
+        ordering = ['-date']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['date', 'created_by', 'country', 'region', 'center_area',
+                        'gender', 'marital_status', 'saved', 'origin'],
+                name='unique_member_daily_stat',
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['created_by', 'date']),
+        ]
+    
+    def __str__(self):
+        return f"{self.date} - {self.created_by_id} - {self.count}"
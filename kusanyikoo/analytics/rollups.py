@@ -0,0 +1,256 @@
+"""
+Maintenance and queries for the MemberDailyStat rollup.
+
+Every dashboard and report reads from the rollup, so their cost depends on
+the number of days and dimension values rather than on the member count.
+"""
+from collections import Counter
+from datetime import datetime, timedelta
+from functools import reduce
+from operator import or_
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Q, Sum
+from django.db.models.functions import ExtractWeekDay, TruncDate, TruncMonth, TruncWeek
+from django.utils import timezone
+
+from members.models import Member
+from .models import MemberDailyStat
+
+DIMENSIONS = ['country', 'region', 'center_area', 'gender', 'marital_status', 'saved', 'origin']
+KEY_FIELDS = ['date', 'created_by_id'] + DIMENSIONS
+
+# Member fields needed to compute a rollup key.
+MEMBER_FIELDS = ['created_at', 'created_by_id', 'is_deleted'] + DIMENSIONS
+
+
+def rollup_key(values):
+    """Return the rollup key for a mapping of member field values."""
+    created_at = values['created_at']
+    if timezone.is_aware(created_at):
+        created_at = timezone.localtime(created_at)
+    return (created_at.date(), values['created_by_id']) + tuple(values[field] for field in DIMENSIONS)
+
+
+def member_values(member):
+    return {field: getattr(member, field) for field in MEMBER_FIELDS}
+
+
+def apply_deltas(deltas):
+    """
+    Add each delta in a {rollup key: delta} mapping to its rollup row.
+
+    Rows that a decrement leaves at zero are deleted, so edits and deletes
+    do not accumulate empty combinations for the queries to group over.
+    """
+    emptied = []
+    for key, delta in deltas.items():
+        if not delta:
+            continue
+        lookup = dict(zip(KEY_FIELDS, key))
+        if delta < 0:
+            emptied.append(Q(**lookup))
+        updated = MemberDailyStat.objects.filter(**lookup).update(count=F('count') + delta)
+        if updated:
+            continue
+        try:
+            with transaction.atomic():
+                MemberDailyStat.objects.create(count=delta, **lookup)
+        except IntegrityError:
+            # Another request created the row first; increment it instead.
+            MemberDailyStat.objects.filter(**lookup).update(count=F('count') + delta)
+    if emptied:
+        MemberDailyStat.objects.filter(reduce(or_, emptied), count__lte=0).delete()
+
+
+def record_member_change(old_values, new_values):
+    """
+    Move a member between rollup rows.
+
+    Either side may be None (creation / hard delete); soft-deleted members
+    are not counted.
+    """
+    deltas = Counter()
+    if old_values is not None and not old_values['is_deleted']:
+        deltas[rollup_key(old_values)] -= 1
+    if new_values is not None and not new_values['is_deleted']:
+        deltas[rollup_key(new_values)] += 1
+    apply_deltas(deltas)
+
+
+def record_members_created(rows):
+    """Count newly inserted members; for bulk paths that bypass signals."""
+    deltas = Counter()
+    for values in rows:
+        if not values.get('is_deleted', False):
+            deltas[rollup_key(values)] += 1
+    apply_deltas(deltas)
+
+
+def member_stats(created_by=None):
+    queryset = MemberDailyStat.objects.all()
+    if created_by is not None:
+        queryset = queryset.filter(created_by=created_by)
+    return queryset
+
+
+def _sorted_counts(counter, field):
+    return [
+        {field: value, 'count': count}
+        for value, count in sorted(counter.items(), key=lambda item: -item[1])
+        if count > 0
+    ]
+
+
+def breakdown(stats, fields):
+    """
+    Member counts per value of each field in `fields`, plus totals.
+
+    The rollup is grouped on the combination of all fields in one query and
+    the per-field totals are folded together in Python.
+    """
+    thirty_days_ago = timezone.localdate() - timedelta(days=30)
+    rows = stats.values(*fields).annotate(
+        total=Sum('count'),
+        recent=Sum('count', filter=Q(date__gte=thirty_days_ago)),
+    ).order_by()
+
+    counters = {field: Counter() for field in fields}
+    total = recent = 0
+    for row in rows:
+        total += row['total']
+        recent += row['recent'] or 0
+        for field in fields:
+            counters[field][row[field]] += row['total']
+
+    result = {field: _sorted_counts(counter, field) for field, counter in counters.items()}
+    result['total'] = total
+    result['recent'] = recent
+    return result
+
+
+def weekly_counts(stats, weeks):
+    """Registrations per calendar week for the last `weeks` weeks, oldest first."""
+    today = timezone.localdate()
+    this_week = today - timedelta(days=today.weekday())
+    week_starts = [this_week - timedelta(weeks=weeks - 1 - i) for i in range(weeks)]
+
+    rows = stats.filter(date__gte=week_starts[0])\
+        .annotate(week=TruncWeek('date'))\
+        .values('week')\
+        .annotate(total=Sum('count'))\
+        .order_by()
+    counts = {_as_date(row['week']): row['total'] for row in rows}
+
+    return [
+        {'week': f'Week {i + 1}', 'count': counts.get(week_start, 0)}
+        for i, week_start in enumerate(week_starts)
+    ]
+
+
+def daily_counts(stats, days):
+    """Registrations per day for the last `days` days, today included, oldest first."""
+    today = timezone.localdate()
+    first_day = today - timedelta(days=days - 1)
+    rows = stats.filter(date__gte=first_day).values('date').annotate(total=Sum('count')).order_by()
+    counts = {row['date']: row['total'] for row in rows}
+
+    days = [first_day + timedelta(days=i) for i in range(days)]
+    return [{'date': day.isoformat(), 'count': counts.get(day, 0)} for day in days]
+
+
+def monthly_counts(stats):
+    """Registrations per calendar month of the current year, January first."""
+    year = timezone.localdate().year
+    rows = stats.filter(date__year=year)\
+        .annotate(month=TruncMonth('date'))\
+        .values('month')\
+        .annotate(total=Sum('count'))\
+        .order_by()
+    counts = {_as_date(row['month']).month: row['total'] for row in rows}
+
+    return [{'month': month, 'count': counts.get(month, 0)} for month in range(1, 13)]
+
+
+WEEKDAYS = ['Sunday', 'Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday']
+
+
+def weekday_counts(stats):
+    """All-time registrations per day of the week, Sunday first."""
+    rows = stats.annotate(weekday=ExtractWeekDay('date'))\
+        .values('weekday')\
+        .annotate(total=Sum('count'))\
+        .order_by()
+    # ExtractWeekDay numbers Sunday as 1
+    counts = {row['weekday']: row['total'] for row in rows}
+
+    return [{'day': day, 'count': counts.get(number, 0)} for number, day in enumerate(WEEKDAYS, 1)]
+
+
+def _as_date(value):
+    return value.date() if isinstance(value, datetime) else value
+
+
+def report_summary():
+    """Figures used by the analytics PDF and Excel reports."""
+    rows = member_stats().values('country', 'region', 'center_area', 'gender', 'marital_status', 'saved')\
+        .annotate(total=Sum('count'))\
+        .order_by()
+
+    gender = Counter()
+    saved = Counter()
+    marital = Counter()
+    countries = Counter()
+    tanzania_regions = Counter()
+    dar_areas = Counter()
+    total = 0
+    for row in rows:
+        count = row['total']
+        total += count
+        gender[row['gender']] += count
+        saved[row['saved']] += count
+        marital[row['marital_status']] += count
+        countries[row['country']] += count
+        if row['country'] == 'Tanzania' and row['region']:
+            tanzania_regions[row['region']] += count
+            if row['region'] == 'Dar es Salaam' and row['center_area']:
+                dar_areas[row['center_area']] += count
+
+    def ranked(counter):
+        return [(value, count) for value, count in counter.most_common() if count > 0]
+
+    return {
+        'total_members': total,
+        'males': gender['male'],
+        'females': gender['female'],
+        'saved': saved[True],
+        'unsaved': saved[False],
+        'marital_stats': ranked(marital),
+        'country_stats': ranked(countries),
+        'tanzania_regions': ranked(tanzania_regions),
+        'dar_areas': ranked(dar_areas),
+    }
+
+
+def rebuild():
+    """
+    Recompute the whole rollup from the member table. Every row is replaced,
+    so combinations with no live members (zero counts) are dropped.
+    """
+    with transaction.atomic():
+        MemberDailyStat.objects.all().delete()
+        rows = Member.objects.filter(is_deleted=False)\
+            .annotate(date=TruncDate('created_at'))\
+            .values('date', 'created_by_id', *DIMENSIONS)\
+            .annotate(count=Count('id'))\
+            .order_by()
+        batch = []
+        created = 0
+        for row in rows.iterator(chunk_size=2000):
+            batch.append(MemberDailyStat(**row))
+            if len(batch) >= 1000:
+                MemberDailyStat.objects.bulk_create(batch)
+                created += len(batch)
+                batch = []
+        MemberDailyStat.objects.bulk_create(batch)
+        return created + len(batch)
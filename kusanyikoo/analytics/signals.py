@@ -0,0 +1,40 @@
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+from members.models import Member
+from members.signals import members_bulk_created
+from .rollups import MEMBER_FIELDS, member_values, record_member_change, record_members_created
+
+
+def _previous_values(instance):
+    loaded = getattr(instance, '_loaded_values', None) or {}
+    if all(field in loaded for field in MEMBER_FIELDS):
+        return {field: loaded[field] for field in MEMBER_FIELDS}
+    return None
+
+
+@receiver(pre_save, sender=Member)
+def remember_rollup_values(sender, instance, raw=False, **kwargs):
+    # Instances not loaded through the ORM (or loaded with deferred fields)
+    # need their stored values read before the UPDATE overwrites them.
+    if raw or instance._state.adding or _previous_values(instance) is not None:
+        return
+    instance._loaded_values = Member.objects.filter(pk=instance.pk).values(*MEMBER_FIELDS).first()
+
+
+@receiver(post_save, sender=Member)
+def update_rollup_on_save(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    new_values = member_values(instance)
+    record_member_change(None if created else _previous_values(instance), new_values)
+    instance._loaded_values = new_values
+
+
+@receiver(post_delete, sender=Member)
+def update_rollup_on_delete(sender, instance, **kwargs):
+    record_member_change(_previous_values(instance) or member_values(instance), None)
+
+
+@receiver(members_bulk_created)
+def update_rollup_on_bulk_create(sender, members, **kwargs):
+    record_members_created(member_values(member) for member in members)
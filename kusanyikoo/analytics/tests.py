@@ -1,3 +1,135 @@
-from django.test import TestCase
+from datetime import date, timedelta
 
-# Create your tests here.
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from members.models import Member
+from users.models import User
+from . import jobs, rollups
+from .models import ExportHistory, MemberDailyStat
+
+
+class RegistrationSeriesTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(username='series-admin', password='x', role='admin')
+        cls.registrant = User.objects.create_user(username='series-registrant', password='x', role='registrant')
+        cls.today = timezone.localdate()
+        for days_ago, count, user in [(0, 2, cls.registrant), (0, 1, cls.admin), (3, 4, cls.registrant), (40, 5, cls.admin)]:
+            MemberDailyStat.objects.create(
+                date=cls.today - timedelta(days=days_ago), created_by=user, country='Tanzania',
+                region='dar_es_salaam', gender='male', marital_status='single', origin='invited', count=count,
+            )
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+
+    def test_daily_counts(self):
+        series = rollups.daily_counts(rollups.member_stats(), 7)
+        self.assertEqual(len(series), 7)
+        self.assertEqual(series[-1], {'date': self.today.isoformat(), 'count': 3})
+        self.assertEqual(series[-4]['count'], 4)
+        self.assertEqual(sum(day['count'] for day in series), 7)
+
+        series = rollups.daily_counts(rollups.member_stats(created_by=self.registrant), 31)
+        self.assertEqual(len(series), 31)
+        self.assertEqual(sum(day['count'] for day in series), 6)
+
+    def test_monthly_counts(self):
+        series = rollups.monthly_counts(rollups.member_stats())
+        self.assertEqual([month['month'] for month in series], list(range(1, 13)))
+        expected = [0] * 12
+        for stat in MemberDailyStat.objects.filter(date__year=self.today.year):
+            expected[stat.date.month - 1] += stat.count
+        self.assertEqual([month['count'] for month in series], expected)
+
+    def test_weekday_counts(self):
+        series = rollups.weekday_counts(rollups.member_stats())
+        self.assertEqual([day['day'] for day in series], rollups.WEEKDAYS)
+        expected = dict.fromkeys(rollups.WEEKDAYS, 0)
+        for stat in MemberDailyStat.objects.all():
+            # date.weekday() numbers Monday as 0
+            expected[rollups.WEEKDAYS[(stat.date.weekday() + 1) % 7]] += stat.count
+        self.assertEqual({day['day']: day['count'] for day in series}, expected)
+
+    def test_stats_endpoints(self):
+        self.client.force_authenticate(self.admin)
+        data = self.client.get('/api/stats/admin/').data
+        self.assertEqual(len(data['daily_registrations']), 7)
+        self.assertEqual(len(data['monthly_registrations']), 12)
+
+        self.client.force_authenticate(self.registrant)
+        data = self.client.get('/api/stats/registrant/').data
+        self.assertEqual(len(data['daily_registrations']), 31)
+        self.assertEqual(sum(day['count'] for day in data['daily_registrations']), 6)
+        self.assertEqual(len(data['monthly_registrations']), 12)
+        self.assertEqual(sum(day['count'] for day in data['weekday_registrations']), 6)
+
+
+class RollupMaintenanceTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.registrant = User.objects.create_user(username='rollup-registrant', password='x', role='registrant')
+
+    def create_member(self, **fields):
+        values = dict(
+            first_name='Rollup', last_name='Test', gender='male', age=30, marital_status='single',
+            country='Tanzania', region='dar_es_salaam', center_area='ilala', zone='A', cell='1',
+            mobile_no='0714000000', origin='invited', residence='Town', attending_date=date(2024, 1, 1),
+            created_by=self.registrant,
+        )
+        values.update(fields)
+        return Member.objects.create(**values)
+
+    def test_create_then_delete_leaves_no_rows(self):
+        member = self.create_member()
+        self.assertEqual(list(MemberDailyStat.objects.values_list('count', flat=True)), [1])
+
+        member.delete()
+        self.assertFalse(MemberDailyStat.objects.exists())
+
+    def test_edit_and_soft_delete_drop_emptied_rows(self):
+        member = self.create_member()
+        member.region = 'arusha'
+        member.save()
+        self.assertEqual(list(MemberDailyStat.objects.values_list('region', 'count')), [('arusha', 1)])
+
+        member.is_deleted = True
+        member.save()
+        self.assertFalse(MemberDailyStat.objects.exists())
+
+    def test_rebuild_drops_zero_rows(self):
+        self.create_member()
+        MemberDailyStat.objects.create(
+            date=timezone.localdate(), created_by=self.registrant, country='Kenya', region='',
+            gender='female', marital_status='single', origin='invited', count=0,
+        )
+        self.assertEqual(rollups.rebuild(), 1)
+        self.assertEqual(list(MemberDailyStat.objects.values_list('country', 'count')), [('Tanzania', 1)])
+
+
+class ExportJobTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(username='export-admin', password='x', role='admin')
+
+    def create_job(self, **fields):
+        return ExportHistory.objects.create(
+            export_type='members', format='csv', created_by=self.admin, file_size='', **fields
+        )
+
+    @override_settings(EXPORT_JOB_TIMEOUT_MINUTES=30)
+    def test_stale_running_jobs_are_requeued_and_run(self):
+        stale = self.create_job(status='running', started_at=timezone.now() - timedelta(minutes=31))
+        running = self.create_job(status='running', started_at=timezone.now() - timedelta(minutes=5))
+
+        self.assertEqual(jobs.process_pending_exports(), 1)
+        stale.refresh_from_db()
+        running.refresh_from_db()
+        self.assertEqual(stale.status, 'completed')
+        self.assertTrue(stale.file)
+        self.assertEqual(running.status, 'running')
+        stale.file.delete()
@@ -2,16 +2,31 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.decorators import api_view, permission_classes
-from django.db.models import Count, Q
+from django.conf import settings
 from django.utils import timezone
-from django.http import HttpResponse
+from django.db.models import F
+from django.http import HttpResponse, FileResponse
+from django.shortcuts import get_object_or_404
 from datetime import timedelta, datetime
 import csv
-import io
 import json
+import os
 from members.models import Member
+from members.cache import get_or_build
+from members.exports import (
+    CountingIterator, copy_csv_response, copy_supported, csv_response, member_rows, format_datetime,
+    sql_datetime, sql_default, sql_yes_no,
+)
+from members import pdf, xlsx
 from users.models import User, AuditLog
+from users.audit_query import AUDIT_ORDERING, FILTERS as AUDIT_FILTERS, filter_entries
+from kusanyikoo.pagination import iter_keyset
 from .models import ExportHistory
+from .jobs import enqueue_export, format_size
+from . import rollups
+
+
+STATS_CACHE_TIMEOUT = 300  # seconds; bounds drift of the rolling 30-day window
 
 
 class AdminStatsView(APIView):
@@ -21,143 +36,99 @@ class AdminStatsView(APIView):
         if request.user.role != 'admin':
             return Response({'error': 'Unauthorized'}, status=403)
         
-        # Get basic stats
-        total_members = Member.objects.filter(is_deleted=False).count()
-        
-        # Get breakdown by country
-        country_stats = Member.objects.filter(is_deleted=False)\
-            .values('country')\
-            .annotate(count=Count('id'))\
-            .order_by('-count')
-        
-        # Get breakdown by region
-        region_stats = Member.objects.filter(is_deleted=False)\
-            .values('region')\
-            .annotate(count=Count('id'))\
-            .order_by('-count')
-        
-        # Get breakdown by gender
-        gender_stats = Member.objects.filter(is_deleted=False)\
-            .values('gender')\
-            .annotate(count=Count('id'))
-        
-        # Get breakdown by marital status
-        marital_stats = Member.objects.filter(is_deleted=False)\
-            .values('marital_status')\
-            .annotate(count=Count('id'))
-        
-        # Get saved vs unsaved
-        saved_stats = Member.objects.filter(is_deleted=False)\
-            .values('saved')\
-            .annotate(count=Count('id'))
-        
-        # Get recent registrations (last 30 days)
-        thirty_days_ago = timezone.now() - timedelta(days=30)
-        recent_registrations = Member.objects.filter(
-            is_deleted=False,
-            created_at__gte=thirty_days_ago
-        ).count()
-        
-        # Get weekly growth data (last 8 weeks)
-        weekly_data = []
-        for i in range(8):
-            week_start = timezone.now() - timedelta(weeks=i+1)
-            week_end = timezone.now() - timedelta(weeks=i)
-            week_count = Member.objects.filter(
-                is_deleted=False,
-                created_at__gte=week_start,
-                created_at__lt=week_end
-            ).count()
-            weekly_data.insert(0, {
-                'week': f'Week {8-i}',
-                'count': week_count
-            })
+        cache_key = f'stats:admin:{timezone.localdate().isoformat()}'
+        return Response(get_or_build(cache_key, self.build_stats, STATS_CACHE_TIMEOUT))
+    
+    def build_stats(self):
+        stats = rollups.member_stats()
+        breakdown = rollups.breakdown(
+            stats, ['country', 'region', 'gender', 'marital_status', 'saved']
+        )
         
-        return Response({
-            'total_members': total_members,
-            'country_stats': list(country_stats),
-            'region_stats': list(region_stats),
-            'gender_stats': list(gender_stats),
-            'marital_stats': list(marital_stats),
-            'saved_stats': list(saved_stats),
-            'recent_registrations': recent_registrations,
-            'weekly_growth': weekly_data,
-        })
+        return {
+            'total_members': breakdown['total'],
+            'country_stats': breakdown['country'],
+            'region_stats': breakdown['region'],
+            'gender_stats': breakdown['gender'],
+            'marital_stats': breakdown['marital_status'],
+            'saved_stats': breakdown['saved'],
+            'recent_registrations': breakdown['recent'],
+            'weekly_growth': rollups.weekly_counts(stats, 8),
+            'daily_registrations': rollups.daily_counts(stats, 7),
+            'monthly_registrations': rollups.monthly_counts(stats),
+        }
 
 
 class RegistrantStatsView(APIView):
     permission_classes = [IsAuthenticated]
     
     def get(self, request):
-        # Get basic stats for current user
-        total_registered = Member.objects.filter(
-            created_by=request.user,
-            is_deleted=False
-        ).count()
-        
-        # Get breakdown by gender
-        gender_stats = Member.objects.filter(
-            created_by=request.user,
-            is_deleted=False
-        ).values('gender').annotate(count=Count('id'))
-        
-        # Get breakdown by region
-        region_stats = Member.objects.filter(
-            created_by=request.user,
-            is_deleted=False
-        ).values('region').annotate(count=Count('id'))
-        
-        # Get saved vs unsaved
-        saved_stats = Member.objects.filter(
-            created_by=request.user,
-            is_deleted=False
-        ).values('saved').annotate(count=Count('id'))
-        
-        # Get recent registrations (last 30 days)
-        thirty_days_ago = timezone.now() - timedelta(days=30)
-        recent_registrations = Member.objects.filter(
-            created_by=request.user,
-            is_deleted=False,
-            created_at__gte=thirty_days_ago
-        ).count()
-        
-        # Get weekly performance (last 4 weeks)
-        weekly_data = []
-        for i in range(4):
-            week_start = timezone.now() - timedelta(weeks=i+1)
-            week_end = timezone.now() - timedelta(weeks=i)
-            week_count = Member.objects.filter(
-                created_by=request.user,
-                is_deleted=False,
-                created_at__gte=week_start,
-                created_at__lt=week_end
-            ).count()
-            weekly_data.insert(0, {
-                'week': f'Week {4-i}',
-                'count': week_count
-            })
+        cache_key = f'stats:registrant:{request.user.id}:{timezone.localdate().isoformat()}'
+        return Response(get_or_build(
+            cache_key, lambda: self.build_stats(request.user), STATS_CACHE_TIMEOUT
+        ))
+    
+    def build_stats(self, user):
+        stats = rollups.member_stats(created_by=user)
+        breakdown = rollups.breakdown(stats, ['gender', 'region', 'saved'])
         
         # Get recent activity (last 5 members)
         recent_members = Member.objects.filter(
-            created_by=request.user,
+            created_by=user,
             is_deleted=False
         ).order_by('-created_at')[:5].values(
-            'first_name', 'last_name', 'created_at'
+            'first_name', 'last_name', 'region', 'created_at'
         )
         
-        return Response({
-            'total_registered': total_registered,
-            'gender_stats': list(gender_stats),
-            'region_stats': list(region_stats),
-            'saved_stats': list(saved_stats),
-            'recent_registrations': recent_registrations,
-            'weekly_performance': weekly_data,
+        return {
+            'total_registered': breakdown['total'],
+            'gender_stats': breakdown['gender'],
+            'region_stats': breakdown['region'],
+            'saved_stats': breakdown['saved'],
+            'recent_registrations': breakdown['recent'],
+            'weekly_performance': rollups.weekly_counts(stats, 4),
+            'daily_registrations': rollups.daily_counts(stats, 31),
+            'monthly_registrations': rollups.monthly_counts(stats),
+            'weekday_registrations': rollups.weekday_counts(stats),
             'recent_activity': list(recent_members),
-        })
+        }
 
 
 # Export Views
 
+def record_export(user, response, export_type, format_type, filters):
+    """
+    Log an export in ExportHistory.
+
+    Streaming responses have no size up front, so the row is created
+    immediately and its file_size filled in once the last chunk is sent.
+    """
+    if not response.streaming:
+        return ExportHistory.objects.create(
+            export_type=export_type,
+            format=format_type,
+            created_by=user,
+            file_size=format_size(len(response.content)),
+            filters_applied=filters,
+            status='completed'
+        )
+    
+    history = ExportHistory.objects.create(
+        export_type=export_type,
+        format=format_type,
+        created_by=user,
+        file_size='',
+        filters_applied=filters,
+        status='completed'
+    )
+    
+    def save_size(byte_count):
+        ExportHistory.objects.filter(pk=history.pk).update(file_size=format_size(byte_count))
+    
+    response.streaming_content = CountingIterator(response.streaming_content, save_size)
+    return history
+
+
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def export_members(request):
@@ -165,6 +136,21 @@ def export_members(request):
     format_type = request.data.get('format', 'csv')
     filters = request.data.get('filters', {})
     
+    if format_type not in ['csv', 'excel', 'pdf']:
+        return Response({'error': 'Unsupported format'}, status=400)
+    
+    if wants_async(request):
+        return queue_export(request.user, 'members', format_type, filters)
+    
+    response = build_members_export(format_type, filters)
+    
+    # Log export activity
+    record_export(request.user, response, 'members', format_type, filters)
+    
+    return response
+
+
+def build_members_export(format_type, filters):
     # Build queryset with filters
     queryset = Member.objects.filter(is_deleted=False)
     
@@ -184,112 +170,92 @@ def export_members(request):
         queryset = queryset.filter(created_at__lte=filters['date_to'])
     
     # Export based on format
-    if format_type == 'csv':
-        response = export_members_csv(queryset)
-    elif format_type == 'excel':
-        response = export_members_excel(queryset)
-    elif format_type == 'pdf':
-        response = export_members_pdf(queryset)
-    else:
-        return Response({'error': 'Unsupported format'}, status=400)
-    
-    # Log export activity
-    file_size = f"{len(response.content) / 1024:.1f} KB"
-    ExportHistory.objects.create(
-        export_type='members',
-        format=format_type,
-        created_by=request.user,
-        file_size=file_size,
-        filters_applied=filters
-    )
-    
-    return response
+    if format_type == 'excel':
+        return export_members_excel(queryset)
+    if format_type == 'pdf':
+        return export_members_pdf(queryset)
+    return export_members_csv(queryset)
+
+
+MEMBER_EXPORT_HEADER = [
+    'First Name', 'Last Name', 'Email', 'Phone', 'Country', 'Region', 
+    'Gender', 'Marital Status', 'Saved', 'Date Registered', 'Registered By'
+]
+
+MEMBER_EXPORT_FIELDS = [
+    'first_name', 'last_name', 'email', 'mobile_no', 'country', 'region',
+    'gender', 'marital_status', 'saved', 'created_at', 'created_by__username'
+]
+
+
+# MEMBER_EXPORT_FIELDS rendered as text in SQL, for COPY on PostgreSQL
+MEMBER_EXPORT_COPY_COLUMNS = [
+    'first_name', 'last_name', 'email', 'mobile_no', 'country', 'region',
+    'gender', 'marital_status', sql_yes_no('saved'), sql_datetime('created_at'),
+    sql_default('created_by__username'),
+]
 
 
 def export_members_csv(queryset):
-    """Export members to CSV format"""
-    response = HttpResponse(content_type='text/csv')
-    response['Content-Disposition'] = f'attachment; filename="members_{datetime.now().strftime("%Y%m%d_%H%M%S")}.csv"'
-    
-    writer = csv.writer(response)
-    writer.writerow([
-        'First Name', 'Last Name', 'Email', 'Phone', 'Country', 'Region', 
-        'Gender', 'Marital Status', 'Saved', 'Date Registered', 'Registered By'
-    ])
-    
-    for member in queryset:
-        writer.writerow([
-            member.first_name,
-            member.last_name,
-            member.email,
-            member.mobile_no,
-            member.country,
-            member.region,
-            member.gender,
-            member.marital_status,
-            'Yes' if member.saved else 'No',
-            member.created_at.strftime('%Y-%m-%d %H:%M:%S'),
-            member.created_by.username if member.created_by else 'N/A'
-        ])
-    
-    return response
+    """Export members to CSV format, streamed row by row"""
+    queryset = queryset.order_by('-created_at', '-id')
+    filename = f'members_{datetime.now().strftime("%Y%m%d_%H%M%S")}.csv'
+    if copy_supported():
+        return copy_csv_response(MEMBER_EXPORT_HEADER, queryset, MEMBER_EXPORT_COPY_COLUMNS, filename)
+    
+    rows = member_rows(queryset, MEMBER_EXPORT_FIELDS, {
+        8: lambda saved: 'Yes' if saved else 'No',
+        9: format_datetime,
+        10: lambda username: username or 'N/A',
+    })
+    return csv_response(MEMBER_EXPORT_HEADER, rows, filename)
 
 
 def export_members_excel(queryset):
-    """Export members to Excel format (placeholder - requires openpyxl)"""
-    # For now, return CSV with Excel MIME type
-    response = HttpResponse(content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet')
-    response['Content-Disposition'] = f'attachment; filename="members_{datetime.now().strftime("%Y%m%d_%H%M%S")}.xlsx"'
-    
-    # This would require openpyxl library for proper Excel export
-    # For now, we'll return a CSV file
-    output = io.StringIO()
-    writer = csv.writer(output)
-    writer.writerow([
-        'First Name', 'Last Name', 'Email', 'Phone', 'Country', 'Region', 
-        'Gender', 'Marital Status', 'Saved', 'Date Registered', 'Registered By'
-    ])
-    
-    for member in queryset:
-        writer.writerow([
-            member.first_name,
-            member.last_name,
-            member.email,
-            member.mobile_no,
-            member.country,
-            member.region,
-            member.gender,
-            member.marital_status,
-            'Yes' if member.saved else 'No',
-            member.created_at.strftime('%Y-%m-%d %H:%M:%S'),
-            member.created_by.username if member.created_by else 'N/A'
-        ])
-    
-    response.write(output.getvalue().encode('utf-8'))
-    return response
+    """Export members to a native XLSX workbook, streamed row by row"""
+    rows = member_rows(queryset.order_by('-created_at', '-id'), MEMBER_EXPORT_FIELDS, {
+        8: lambda saved: 'Yes' if saved else 'No',
+        10: lambda username: username or 'N/A',
+    })
+    sheet = xlsx.Sheet('Members', rows, header=MEMBER_EXPORT_HEADER,
+                       widths=[16, 16, 28, 16, 14, 16, 10, 14, 8, 20, 16])
+    return xlsx.xlsx_response([sheet], f'members_{datetime.now().strftime("%Y%m%d_%H%M%S")}.xlsx')
+
+
+MEMBER_PDF_COLUMNS = [
+    pdf.Column('First Name', 70), pdf.Column('Last Name', 70), pdf.Column('Email', 130),
+    pdf.Column('Phone', 70), pdf.Column('Country', 60), pdf.Column('Region', 70),
+    pdf.Column('Gender', 45), pdf.Column('Marital Status', 55), pdf.Column('Saved', 35),
+    pdf.Column('Date Registered', 85), pdf.Column('Registered By', 80),
+]
+
+
+def _saved_label(saved):
+    return 'Yes' if saved else 'No'
+
+
+def _registered_by(username):
+    return username or 'N/A'
+
+
+def member_pdf_rows(queryset):
+    """Rows for the members PDF; module-level so PDF worker processes can import it"""
+    return member_rows(queryset, MEMBER_EXPORT_FIELDS, {8: _saved_label, 10: _registered_by})
 
 
 def export_members_pdf(queryset):
-    """Export members to PDF format (placeholder - requires reportlab)"""
-    response = HttpResponse(content_type='application/pdf')
-    response['Content-Disposition'] = f'attachment; filename="members_{datetime.now().strftime("%Y%m%d_%H%M%S")}.pdf"'
-    
-    # This would require reportlab library for proper PDF export
-    # For now, we'll return a simple text representation
-    content = "MEMBERS EXPORT REPORT\n"
-    content += "=" * 50 + "\n\n"
-    
-    for member in queryset:
-        content += f"Name: {member.first_name} {member.last_name}\n"
-        content += f"Email: {member.email}\n"
-        content += f"Phone: {member.mobile_no}\n"
-        content += f"Region: {member.region}\n"
-        content += f"Gender: {member.gender}\n"
-        content += f"Registered: {member.created_at.strftime('%Y-%m-%d')}\n"
-        content += "-" * 30 + "\n"
-    
-    response.write(content.encode('utf-8'))
-    return response
+    """Export members to a paged PDF table, streamed page by page"""
+    document = pdf.TableDocument(
+        'Members Export', MEMBER_PDF_COLUMNS,
+        subtitle=f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
+    )
+    queryset = queryset.order_by('-created_at', '-id')
+    workers = getattr(settings, 'EXPORT_PDF_WORKERS', 0)
+    if workers > 1:
+        chunks = pdf.iter_pdf_parallel(document, queryset, member_pdf_rows, workers)
+    else:
+        chunks = pdf.iter_pdf(document, member_pdf_rows(queryset))
+    return pdf.pdf_response(chunks, f'members_{datetime.now().strftime("%Y%m%d_%H%M%S")}.pdf')
 
 
 @api_view(['POST'])
@@ -309,21 +275,15 @@ def export_analytics(request):
         if export_type not in ['overview', 'summary', 'demographics', 'geographical']:
             return Response({'error': f'Unsupported export type: {export_type}'}, status=400)
         
-        if format_type == 'pdf':
-            response = export_analytics_pdf(export_type, date_range)
-        elif format_type == 'excel':
-            response = export_analytics_excel(export_type, date_range)
+        filters = {'type': export_type, 'date_range': date_range}
+        if wants_async(request):
+            return queue_export(request.user, 'analytics', format_type, filters)
+        
+        response = build_analytics_export(format_type, filters)
         
         # Log export activity
         try:
-            file_size = f"{len(response.content) / 1024:.1f} KB"
-            ExportHistory.objects.create(
-                export_type='analytics',
-                format=format_type,
-                created_by=request.user,
-                file_size=file_size,
-                filters_applied={'type': export_type, 'date_range': date_range}
-            )
+            record_export(request.user, response, 'analytics', format_type, filters)
         except Exception as log_error:
             print(f"Failed to log export: {log_error}")
             # Don't fail the export if logging fails
@@ -337,209 +297,124 @@ def export_analytics(request):
         return Response({'error': str(e)}, status=500)
 
 
+def build_analytics_export(format_type, filters):
+    export_type = filters.get('type', 'overview')
+    date_range = filters.get('date_range', {})
+    if format_type == 'excel':
+        return export_analytics_excel(export_type, date_range)
+    return export_analytics_pdf(export_type, date_range)
+
+
 def export_analytics_pdf(export_type, date_range):
-    """Export analytics to PDF"""
-    response = HttpResponse(content_type='application/pdf')
-    response['Content-Disposition'] = f'attachment; filename="analytics_{export_type}_{datetime.now().strftime("%Y%m%d_%H%M%S")}.pdf"'
+    """Export analytics to a PDF report"""
+    summary = rollups.report_summary()
+    rows = []
     
-    # Generate analytics content based on type
-    content = f"ANALYTICS REPORT - {export_type.upper()}\n"
-    content += "=" * 50 + "\n\n"
-    content += f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n"
+    def section(title, pairs):
+        rows.append(pdf.Section(title))
+        rows.extend(pairs)
+        rows.append(())
     
     if export_type in ['summary', 'overview']:
         # Summary Report
-        total_members = Member.objects.filter(is_deleted=False).count()
-        males = Member.objects.filter(is_deleted=False, gender='male').count()
-        females = Member.objects.filter(is_deleted=False, gender='female').count()
-        saved = Member.objects.filter(is_deleted=False, saved=True).count()
-        unsaved = Member.objects.filter(is_deleted=False, saved=False).count()
-        
-        content += f"Total Members Registered: {total_members}\n"
-        content += f"Number of Males: {males}\n"
-        content += f"Number of Females: {females}\n"
-        content += f"Number of Saved Members: {saved}\n"
-        content += f"Number of Unsaved Members: {unsaved}\n\n"
-        
-        # Countries
-        country_stats = Member.objects.filter(is_deleted=False).values('country').annotate(count=Count('id')).order_by('-count')
-        content += "Members by Country:\n"
-        for stat in country_stats:
-            content += f"  {stat['country']}: {stat['count']}\n"
-        content += "\n"
-        
-        # Tanzania Regions
-        tanzania_regions = Member.objects.filter(is_deleted=False, country='Tanzania').exclude(region__isnull=True).exclude(region='').values('region').annotate(count=Count('id')).order_by('-count')
-        if tanzania_regions:
-            content += "Members by Region (Tanzania):\n"
-            for stat in tanzania_regions:
-                content += f"  {stat['region']}: {stat['count']}\n"
-            content += "\n"
-        
-        # Dar es Salaam Areas
-        dar_areas = Member.objects.filter(is_deleted=False, country='Tanzania', region='Dar es Salaam').exclude(center_area__isnull=True).exclude(center_area='').values('center_area').annotate(count=Count('id')).order_by('-count')
-        if dar_areas:
-            content += "Members by Center/Area (Dar es Salaam):\n"
-            for stat in dar_areas:
-                content += f"  {stat['center_area']}: {stat['count']}\n"
+        section('Summary', [
+            ('Total Members Registered', summary['total_members']),
+            ('Number of Males', summary['males']),
+            ('Number of Females', summary['females']),
+            ('Number of Saved Members', summary['saved']),
+            ('Number of Unsaved Members', summary['unsaved']),
+        ])
+        section('Members by Country', summary['country_stats'])
+        if summary['tanzania_regions']:
+            section('Members by Region (Tanzania)', summary['tanzania_regions'])
+        if summary['dar_areas']:
+            section('Members by Center/Area (Dar es Salaam)', summary['dar_areas'])
     
     elif export_type == 'demographics':
         # Demographics Report
-        total_members = Member.objects.filter(is_deleted=False).count()
-        males = Member.objects.filter(is_deleted=False, gender='male').count()
-        females = Member.objects.filter(is_deleted=False, gender='female').count()
-        saved = Member.objects.filter(is_deleted=False, saved=True).count()
-        unsaved = Member.objects.filter(is_deleted=False, saved=False).count()
-        
-        content += "DEMOGRAPHICS REPORT\n"
-        content += "=" * 30 + "\n\n"
-        content += f"Total Members: {total_members}\n\n"
-        content += f"Gender Distribution:\n"
-        content += f"  Males: {males}\n"
-        content += f"  Females: {females}\n\n"
-        content += f"Salvation Status:\n"
-        content += f"  Saved: {saved}\n"
-        content += f"  Unsaved: {unsaved}\n"
-        
-        # Marital status
-        marital_stats = Member.objects.filter(is_deleted=False).values('marital_status').annotate(count=Count('id')).order_by('-count')
-        content += "\nMarital Status Distribution:\n"
-        for stat in marital_stats:
-            content += f"  {stat['marital_status']}: {stat['count']}\n"
+        section('Total', [('Total Members', summary['total_members'])])
+        section('Gender Distribution', [('Males', summary['males']), ('Females', summary['females'])])
+        section('Salvation Status', [('Saved', summary['saved']), ('Unsaved', summary['unsaved'])])
+        section('Marital Status Distribution', summary['marital_stats'])
     
     elif export_type == 'geographical':
         # Geographical Report
-        content += "GEOGRAPHICAL DISTRIBUTION REPORT\n"
-        content += "=" * 35 + "\n\n"
-        
-        # Countries
-        country_stats = Member.objects.filter(is_deleted=False).values('country').annotate(count=Count('id')).order_by('-count')
-        content += "Members by Country:\n"
-        for stat in country_stats:
-            content += f"  {stat['country']}: {stat['count']}\n"
-        content += "\n"
-        
-        # Tanzania Regions
-        tanzania_regions = Member.objects.filter(is_deleted=False, country='Tanzania').exclude(region__isnull=True).exclude(region='').values('region').annotate(count=Count('id')).order_by('-count')
-        content += "Members by Region (Tanzania):\n"
-        for stat in tanzania_regions:
-            content += f"  {stat['region']}: {stat['count']}\n"
-        content += "\n"
-        
-        # Dar es Salaam Areas
-        dar_areas = Member.objects.filter(is_deleted=False, country='Tanzania', region='Dar es Salaam').exclude(center_area__isnull=True).exclude(center_area='').values('center_area').annotate(count=Count('id')).order_by('-count')
-        content += "Members by Center/Area (Dar es Salaam):\n"
-        for stat in dar_areas:
-            content += f"  {stat['center_area']}: {stat['count']}\n"
-    
-    response.write(content.encode('utf-8'))
-    return response
+        section('Members by Country', summary['country_stats'])
+        section('Members by Region (Tanzania)', summary['tanzania_regions'])
+        section('Members by Center/Area (Dar es Salaam)', summary['dar_areas'])
+    
+    document = pdf.TableDocument(
+        f"Analytics Report - {export_type.title()}",
+        [pdf.Column('', 400), pdf.Column('Count', 123, align='right')],
+        subtitle=f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
+        landscape=False,
+        show_header=False,
+    )
+    filename = f'analytics_{export_type}_{datetime.now().strftime("%Y%m%d_%H%M%S")}.pdf'
+    return pdf.pdf_response(pdf.iter_pdf(document, rows), filename)
 
 
 def export_analytics_excel(export_type, date_range):
-    """Export analytics to Excel"""
-    response = HttpResponse(content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet')
-    response['Content-Disposition'] = f'attachment; filename="analytics_{export_type}_{datetime.now().strftime("%Y%m%d_%H%M%S")}.xlsx"'
-    
-    # Generate CSV content based on type
-    output = io.StringIO()
-    writer = csv.writer(output)
+    """Export analytics to a native XLSX workbook"""
+    summary = rollups.report_summary()
+    generated = ['Generated', datetime.now().replace(microsecond=0)]
+    rows = []
     
     if export_type in ['summary', 'overview']:
-        writer.writerow(['Summary Report'])
-        writer.writerow(['Generated', datetime.now().strftime('%Y-%m-%d %H:%M:%S')])
-        writer.writerow([])
-        
-        # Basic stats
-        total_members = Member.objects.filter(is_deleted=False).count()
-        males = Member.objects.filter(is_deleted=False, gender='male').count()
-        females = Member.objects.filter(is_deleted=False, gender='female').count()
-        saved = Member.objects.filter(is_deleted=False, saved=True).count()
-        unsaved = Member.objects.filter(is_deleted=False, saved=False).count()
-        
-        writer.writerow(['Metric', 'Count'])
-        writer.writerow(['Total Members Registered', total_members])
-        writer.writerow(['Number of Males', males])
-        writer.writerow(['Number of Females', females])
-        writer.writerow(['Number of Saved Members', saved])
-        writer.writerow(['Number of Unsaved Members', unsaved])
-        writer.writerow([])
-        
-        # Countries
-        writer.writerow(['Country', 'Member Count'])
-        country_stats = Member.objects.filter(is_deleted=False).values('country').annotate(count=Count('id')).order_by('-count')
-        for stat in country_stats:
-            writer.writerow([stat['country'], stat['count']])
-        writer.writerow([])
-        
-        # Tanzania Regions
-        writer.writerow(['Region (Tanzania)', 'Member Count'])
-        tanzania_regions = Member.objects.filter(is_deleted=False, country='Tanzania').exclude(region__isnull=True).exclude(region='').values('region').annotate(count=Count('id')).order_by('-count')
-        for stat in tanzania_regions:
-            writer.writerow([stat['region'], stat['count']])
-        writer.writerow([])
-        
-        # Dar es Salaam Areas
-        writer.writerow(['Center/Area (Dar es Salaam)', 'Member Count'])
-        dar_areas = Member.objects.filter(is_deleted=False, country='Tanzania', region='Dar es Salaam').exclude(center_area__isnull=True).exclude(center_area='').values('center_area').annotate(count=Count('id')).order_by('-count')
-        for stat in dar_areas:
-            writer.writerow([stat['center_area'], stat['count']])
+        rows.extend([
+            ['Summary Report'],
+            generated,
+            [],
+            ['Metric', 'Count'],
+            ['Total Members Registered', summary['total_members']],
+            ['Number of Males', summary['males']],
+            ['Number of Females', summary['females']],
+            ['Number of Saved Members', summary['saved']],
+            ['Number of Unsaved Members', summary['unsaved']],
+            [],
+            ['Country', 'Member Count'],
+        ])
+        rows.extend(summary['country_stats'])
+        rows.extend([[], ['Region (Tanzania)', 'Member Count']])
+        rows.extend(summary['tanzania_regions'])
+        rows.extend([[], ['Center/Area (Dar es Salaam)', 'Member Count']])
+        rows.extend(summary['dar_areas'])
     
     elif export_type == 'demographics':
-        writer.writerow(['Demographics Report'])
-        writer.writerow(['Generated', datetime.now().strftime('%Y-%m-%d %H:%M:%S')])
-        writer.writerow([])
-        
-        total_members = Member.objects.filter(is_deleted=False).count()
-        males = Member.objects.filter(is_deleted=False, gender='male').count()
-        females = Member.objects.filter(is_deleted=False, gender='female').count()
-        saved = Member.objects.filter(is_deleted=False, saved=True).count()
-        unsaved = Member.objects.filter(is_deleted=False, saved=False).count()
-        
-        writer.writerow(['Total Members', total_members])
-        writer.writerow([])
-        writer.writerow(['Gender Distribution'])
-        writer.writerow(['Males', males])
-        writer.writerow(['Females', females])
-        writer.writerow([])
-        writer.writerow(['Salvation Status'])
-        writer.writerow(['Saved', saved])
-        writer.writerow(['Unsaved', unsaved])
-        writer.writerow([])
-        
-        # Marital status
-        writer.writerow(['Marital Status', 'Count'])
-        marital_stats = Member.objects.filter(is_deleted=False).values('marital_status').annotate(count=Count('id')).order_by('-count')
-        for stat in marital_stats:
-            writer.writerow([stat['marital_status'], stat['count']])
+        rows.extend([
+            ['Demographics Report'],
+            generated,
+            [],
+            ['Total Members', summary['total_members']],
+            [],
+            ['Gender Distribution'],
+            ['Males', summary['males']],
+            ['Females', summary['females']],
+            [],
+            ['Salvation Status'],
+            ['Saved', summary['saved']],
+            ['Unsaved', summary['unsaved']],
+            [],
+            ['Marital Status', 'Count'],
+        ])
+        rows.extend(summary['marital_stats'])
     
     elif export_type == 'geographical':
-        writer.writerow(['Geographical Distribution Report'])
-        writer.writerow(['Generated', datetime.now().strftime('%Y-%m-%d %H:%M:%S')])
-        writer.writerow([])
-        
-        # Countries
-        writer.writerow(['Country', 'Member Count'])
-        country_stats = Member.objects.filter(is_deleted=False).values('country').annotate(count=Count('id')).order_by('-count')
-        for stat in country_stats:
-            writer.writerow([stat['country'], stat['count']])
-        writer.writerow([])
-        
-        # Tanzania Regions
-        writer.writerow(['Region (Tanzania)', 'Member Count'])
-        tanzania_regions = Member.objects.filter(is_deleted=False, country='Tanzania').exclude(region__isnull=True).exclude(region='').values('region').annotate(count=Count('id')).order_by('-count')
-        for stat in tanzania_regions:
-            writer.writerow([stat['region'], stat['count']])
-        writer.writerow([])
-        
-        # Dar es Salaam Areas
-        writer.writerow(['Center/Area (Dar es Salaam)', 'Member Count'])
-        dar_areas = Member.objects.filter(is_deleted=False, country='Tanzania', region='Dar es Salaam').exclude(center_area__isnull=True).exclude(center_area='').values('center_area').annotate(count=Count('id')).order_by('-count')
-        for stat in dar_areas:
-            writer.writerow([stat['center_area'], stat['count']])
-    
-    response.write(output.getvalue().encode('utf-8'))
-    return response
+        rows.extend([
+            ['Geographical Distribution Report'],
+            generated,
+            [],
+            ['Country', 'Member Count'],
+        ])
+        rows.extend(summary['country_stats'])
+        rows.extend([[], ['Region (Tanzania)', 'Member Count']])
+        rows.extend(summary['tanzania_regions'])
+        rows.extend([[], ['Center/Area (Dar es Salaam)', 'Member Count']])
+        rows.extend(summary['dar_areas'])
+    
+    sheet = xlsx.Sheet(export_type.title(), rows, widths=[34, 20])
+    filename = f'analytics_{export_type}_{datetime.now().strftime("%Y%m%d_%H%M%S")}.xlsx'
+    return xlsx.xlsx_response([sheet], filename)
 
 
 @api_view(['POST'])
@@ -550,6 +425,29 @@ def export_user_activity(request):
     date_range = request.data.get('date_range', {})
     user_ids = request.data.get('user_ids', [])
     
+    if format_type not in ['csv', 'excel']:
+        return Response({'error': 'Unsupported format'}, status=400)
+    
+    filters = {'date_range': date_range, 'user_ids': user_ids}
+    # Same filters as the audit log API (users.audit_query)
+    filters.update({name: request.data[name] for name in AUDIT_FILTERS if request.data.get(name)})
+    # Reject bad filter values now rather than in a queued job
+    filter_entries(AuditLog.objects.none(), filters)
+    if wants_async(request):
+        return queue_export(request.user, 'users', format_type, filters)
+    
+    response = build_user_activity_export(format_type, filters)
+    
+    # Log export activity
+    record_export(request.user, response, 'users', format_type, filters)
+    
+    return response
+
+
+def build_user_activity_export(format_type, filters):
+    date_range = filters.get('date_range', {})
+    user_ids = filters.get('user_ids', [])
+    
     # Build queryset
     queryset = AuditLog.objects.all()
     
@@ -562,69 +460,57 @@ def export_user_activity(request):
     if user_ids:
         queryset = queryset.filter(user_id__in=user_ids)
     
-    if format_type == 'csv':
-        response = export_user_activity_csv(queryset)
-    elif format_type == 'excel':
-        response = export_user_activity_excel(queryset)
-    else:
-        return Response({'error': 'Unsupported format'}, status=400)
+    queryset = filter_entries(queryset, filters)
     
-    # Log export activity
-    file_size = f"{len(response.content) / 1024:.1f} KB"
-    ExportHistory.objects.create(
-        export_type='users',
-        format=format_type,
-        created_by=request.user,
-        file_size=file_size,
-        filters_applied={'date_range': date_range, 'user_ids': user_ids}
-    )
-    
-    return response
+    if format_type == 'excel':
+        return export_user_activity_excel(queryset)
+    return export_user_activity_csv(queryset)
+
+
+USER_ACTIVITY_HEADER = ['User', 'Action', 'Resource Type', 'Resource ID', 'Timestamp', 'IP Address']
+
+USER_ACTIVITY_FIELDS = ['user__username', 'action', 'resource_type', 'resource_id', 'timestamp', 'ip_address']
+
+
+def user_activity_rows(queryset, formatters=None):
+    """
+    Iterate audit log rows as lists, newest first, without loading users one
+    by one. Rows are read in keyset-paged chunks like the audit log API, so
+    no single query has to walk a multi-million-row trail.
+    """
+    formatters = {0: lambda username: username or 'N/A', **(formatters or {})}
+    entries = queryset.values('id', *USER_ACTIVITY_FIELDS)
+    for entry in iter_keyset(entries, AUDIT_ORDERING):
+        row = [entry[field] for field in USER_ACTIVITY_FIELDS]
+        for index, formatter in formatters.items():
+            row[index] = formatter(row[index])
+        yield row
+
+
+# USER_ACTIVITY_FIELDS rendered as text in SQL, for COPY on PostgreSQL
+USER_ACTIVITY_COPY_COLUMNS = [
+    sql_default('user__username'), 'action', 'resource_type', 'resource_id',
+    sql_datetime('timestamp'), 'ip_address',
+]
 
 
 def export_user_activity_csv(queryset):
     """Export user activity to CSV"""
-    response = HttpResponse(content_type='text/csv')
-    response['Content-Disposition'] = f'attachment; filename="user_activity_{datetime.now().strftime("%Y%m%d_%H%M%S")}.csv"'
-    
-    writer = csv.writer(response)
-    writer.writerow(['User', 'Action', 'Resource Type', 'Resource ID', 'Timestamp', 'IP Address'])
-    
-    for log in queryset:
-        writer.writerow([
-            log.user.username if log.user else 'N/A',
-            log.action,
-            log.resource_type,
-            log.resource_id,
-            log.timestamp.strftime('%Y-%m-%d %H:%M:%S'),
-            log.ip_address
-        ])
+    filename = f'user_activity_{datetime.now().strftime("%Y%m%d_%H%M%S")}.csv'
+    if copy_supported():
+        queryset = queryset.order_by(*AUDIT_ORDERING)
+        return copy_csv_response(USER_ACTIVITY_HEADER, queryset, USER_ACTIVITY_COPY_COLUMNS, filename)
     
-    return response
+    rows = user_activity_rows(queryset, {4: format_datetime})
+    return csv_response(USER_ACTIVITY_HEADER, rows, filename)
 
 
 def export_user_activity_excel(queryset):
-    """Export user activity to Excel"""
-    response = HttpResponse(content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet')
-    response['Content-Disposition'] = f'attachment; filename="user_activity_{datetime.now().strftime("%Y%m%d_%H%M%S")}.xlsx"'
-    
-    # For now, return CSV format
-    output = io.StringIO()
-    writer = csv.writer(output)
-    writer.writerow(['User', 'Action', 'Resource Type', 'Resource ID', 'Timestamp', 'IP Address'])
-    
-    for log in queryset:
-        writer.writerow([
-            log.user.username if log.user else 'N/A',
-            log.action,
-            log.resource_type,
-            log.resource_id,
-            log.timestamp.strftime('%Y-%m-%d %H:%M:%S'),
-            log.ip_address
-        ])
-    
-    response.write(output.getvalue().encode('utf-8'))
-    return response
+    """Export user activity to a native XLSX workbook"""
+    sheet = xlsx.Sheet('User Activity', user_activity_rows(queryset), header=USER_ACTIVITY_HEADER,
+                       widths=[16, 14, 16, 14, 20, 16])
+    filename = f'user_activity_{datetime.now().strftime("%Y%m%d_%H%M%S")}.xlsx'
+    return xlsx.xlsx_response([sheet], filename)
 
 
 @api_view(['POST'])
@@ -632,8 +518,20 @@ def export_user_activity_excel(queryset):
 def export_financial(request):
     """Export financial data (placeholder)"""
     format_type = request.data.get('format', 'excel')
-    date_range = request.data.get('date_range', {})
+    filters = {'date_range': request.data.get('date_range', {})}
+    
+    if wants_async(request):
+        return queue_export(request.user, 'financial', format_type, filters)
     
+    response = build_financial_export(format_type, filters)
+    
+    # Log export activity
+    record_export(request.user, response, 'financial', format_type, filters)
+    
+    return response
+
+
+def build_financial_export(format_type, filters):
     response = HttpResponse(content_type='text/csv')
     response['Content-Disposition'] = f'attachment; filename="financial_{datetime.now().strftime("%Y%m%d_%H%M%S")}.csv"'
     
@@ -641,38 +539,92 @@ def export_financial(request):
     writer.writerow(['Date', 'Type', 'Amount', 'Member', 'Description'])
     writer.writerow([datetime.now().strftime('%Y-%m-%d'), 'Tithe', '100.00', 'Sample Member', 'Monthly tithe'])
     
-    # Log export activity
-    file_size = f"{len(response.content) / 1024:.1f} KB"
-    ExportHistory.objects.create(
-        export_type='financial',
+    return response
+
+
+EXPORT_BUILDERS = {
+    'members': build_members_export,
+    'analytics': build_analytics_export,
+    'users': build_user_activity_export,
+    'financial': build_financial_export,
+}
+
+
+def wants_async(request):
+    value = request.data.get('async', False)
+    if isinstance(value, str):
+        return value.lower() in ['true', '1', 'yes']
+    return bool(value)
+
+
+def queue_export(user, export_type, format_type, filters):
+    """Record an export job and hand it to the background worker."""
+    history = ExportHistory.objects.create(
+        export_type=export_type,
         format=format_type,
-        created_by=request.user,
-        file_size=file_size,
-        filters_applied={'date_range': date_range}
+        created_by=user,
+        file_size='',
+        filters_applied=filters,
+        status='pending'
     )
-    
-    return response
+    enqueue_export(history)
+    return Response(serialize_export(history), status=202)
+
+
+def serialize_export(export):
+    return {
+        'id': export.id,
+        'export_type': export.export_type,
+        'format': export.format,
+        'status': export.status,
+        'error': export.error,
+        'created_at': export.created_at,
+        'completed_at': export.completed_at,
+        'file_size': export.file_size,
+        'download_count': export.download_count,
+        'download_url': f'/api/export/{export.id}/download/' if export.status == 'completed' and export.file else None,
+        'created_by': {
+            'id': export.created_by.id,
+            'username': export.created_by.username
+        }
+    }
 
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def export_history(request):
     """Get export history"""
-    exports = ExportHistory.objects.filter(created_by=request.user).order_by('-created_at')[:20]
-    
-    export_data = []
-    for export in exports:
-        export_data.append({
-            'id': export.id,
-            'export_type': export.export_type,
-            'format': export.format,
-            'created_at': export.created_at,
-            'file_size': export.file_size,
-            'download_count': export.download_count,
-            'created_by': {
-                'id': export.created_by.id,
-                'username': export.created_by.username
-            }
-        })
-    
-    return Response(export_data)
+    exports = ExportHistory.objects.filter(created_by=request.user)\
+        .select_related('created_by')\
+        .order_by('-created_at')[:20]
+    
+    return Response([serialize_export(export) for export in exports])
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def export_detail(request, pk):
+    """Get the status of an export job"""
+    export = get_object_or_404(ExportHistory, pk=pk, created_by=request.user)
+    return Response(serialize_export(export))
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def export_download(request, pk):
+    """Download the file produced by a completed export job"""
+    export = get_object_or_404(ExportHistory, pk=pk, created_by=request.user)
+    
+    if export.status != 'completed' or not export.file:
+        return Response(
+            {'error': f'Export is not ready (status: {export.status})'},
+            status=409
+        )
+    
+    ExportHistory.objects.filter(pk=export.pk).update(download_count=F('download_count') + 1)
+    
+    return FileResponse(
+        export.file.open('rb'),
+        as_attachment=True,
+        filename=os.path.basename(export.file.name)
+    )
@@ -0,0 +1,31 @@
+"""
+The cache shared by every gunicorn worker.
+
+The default cache is in-process, so anything that must be invalidated
+across workers (cached API users, the member data version, rate-limit
+counters) goes through SHARED_CACHE instead. It is only configured when
+REDIS_URL is set; callers fall back to not caching, or to per-process
+counting, when `shared_cache()` returns None. Deployments must set
+REDIS_URL; `warn_if_not_shared()` logs at startup when it is missing.
+"""
+import logging
+
+from django.conf import settings
+from django.core.cache import caches
+
+logger = logging.getLogger(__name__)
+
+
+def shared_cache():
+    alias = getattr(settings, 'SHARED_CACHE', None)
+    return caches[alias] if alias else None
+
+
+def warn_if_not_shared():
+    """Log a warning when a production process starts without a shared cache."""
+    if shared_cache() is None and not settings.DEBUG:
+        logger.warning(
+            'REDIS_URL is not set: dashboard stats are rebuilt and API users are '
+            'loaded from the database on every request. '
+            'Set REDIS_URL to share a cache between workers.'
+        )
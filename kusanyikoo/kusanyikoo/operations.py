@@ -0,0 +1,29 @@
+"""
+Migration operations shared by the apps.
+"""
+from django.db import migrations
+
+
+class AddIndexConcurrently(migrations.AddIndex):
+    """
+    AddIndex that uses CREATE INDEX CONCURRENTLY on PostgreSQL, so the table
+    keeps taking writes while the index builds. Other databases build the
+    index normally. Migrations using it must set `atomic = False`.
+    """
+    
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor != 'postgresql':
+            return super().database_forwards(app_label, schema_editor, from_state, to_state)
+        model = to_state.apps.get_model(app_label, self.model_name)
+        if self.allow_migrate_model(schema_editor.connection.alias, model):
+            schema_editor.add_index(model, self.index, concurrently=True)
+    
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor != 'postgresql':
+            return super().database_backwards(app_label, schema_editor, from_state, to_state)
+        model = from_state.apps.get_model(app_label, self.model_name)
+        if self.allow_migrate_model(schema_editor.connection.alias, model):
+            schema_editor.remove_index(model, self.index, concurrently=True)
+    
+    def describe(self):
+        return f'Concurrently create index {self.index.name} on {self.model_name}'
@@ -0,0 +1,197 @@
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from collections import OrderedDict
+from functools import reduce
+import operator
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination, Cursor
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+def _reverse_ordering(ordering):
+    return tuple(field[1:] if field.startswith('-') else '-' + field for field in ordering)
+
+
+def keyset_filter(ordering, position):
+    """
+    Build the seek predicate for rows that come after `position` in `ordering`.
+
+    For an ordering of ('-created_at', '-id') this expands to
+    created_at <= X AND (created_at < X OR (created_at = X AND id < Y)),
+    which the database can answer with a single range scan on a
+    (created_at, id) index. The leading bound is redundant but lets an index
+    that only covers the first field (or a filter column plus the first
+    field) bound the scan too.
+    """
+    clauses = []
+    for index, field in enumerate(ordering):
+        name = field.lstrip('-')
+        lookup = 'lt' if field.startswith('-') else 'gt'
+        clause = Q(**{f'{name}__{lookup}': position[index]})
+        for previous_field, value in zip(ordering[:index], position[:index]):
+            clause &= Q(**{previous_field.lstrip('-'): value})
+        clauses.append(clause)
+    first = ordering[0]
+    bound = Q(**{f"{first.lstrip('-')}__{'lte' if first.startswith('-') else 'gte'}": position[0]})
+    return bound & reduce(operator.or_, clauses)
+
+
+def keyset_position(row, ordering):
+    """The values of `ordering`'s fields in a model instance or values() dict."""
+    names = [field.lstrip('-') for field in ordering]
+    if isinstance(row, dict):
+        return [row[name] for name in names]
+    return [getattr(row, name) for name in names]
+
+
+def iter_keyset(queryset, ordering, chunk_size=2000):
+    """
+    Iterate every row of `queryset` in `ordering`, fetching `chunk_size` rows
+    per query and seeking past the last one for the next.
+
+    Unlike .iterator(), no query or server-side cursor stays open while the
+    rows are consumed, and each query is an index range scan however deep
+    into the table it starts. `ordering` must be unique and, for values()
+    querysets, its fields must be among the selected values.
+    """
+    queryset = queryset.order_by(*ordering)
+    position = None
+    while True:
+        page = queryset if position is None else queryset.filter(keyset_filter(ordering, position))
+        rows = list(page[:chunk_size])
+        yield from rows
+        if len(rows) < chunk_size:
+            return
+        position = keyset_position(rows[-1], ordering)
+
+
+class KeysetCursorPagination(CursorPagination):
+    """
+    Cursor pagination that seeks on every field of a unique ordering.
+
+    DRF's CursorPagination only stores the first ordering field in the cursor
+    and falls back to OFFSET for ties. Here the whole ordering tuple is the
+    position, so page N costs the same as page 1. The total row count is only
+    computed when the client asks for it with `?include_total=true`.
+    """
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 200
+    total_count_query_param = 'include_total'
+    template = None
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.page_size = self.get_page_size(request)
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.model = queryset.model
+        self.cursor = self.decode_cursor(request)
+
+        self.total_count = None
+        if self.wants_total_count(request):
+            self.total_count = queryset.count()
+
+        reverse = self.cursor is not None and self.cursor.reverse
+        ordering = _reverse_ordering(self.ordering) if reverse else self.ordering
+        queryset = queryset.order_by(*ordering)
+
+        if self.cursor is not None and self.cursor.position is not None:
+            queryset = queryset.filter(keyset_filter(ordering, self.cursor.position))
+
+        # Fetch one extra row to find out whether another page follows.
+        results = self.fetch_rows(queryset, self.page_size + 1, reverse)
+        has_more = len(results) > self.page_size
+        self.page = results[:self.page_size]
+
+        if reverse:
+            self.page.reverse()
+            self.has_next = True
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = self.cursor is not None
+
+        return self.page
+
+    def fetch_rows(self, queryset, limit, reverse):
+        """The first `limit` rows of the ordered, cursor-filtered queryset."""
+        return list(queryset[:limit])
+
+    def wants_total_count(self, request):
+        value = request.query_params.get(self.total_count_query_param, '')
+        return value.lower() in ['true', '1', 'yes']
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        if self.page:
+            position = self._get_position_from_instance(self.page[-1], self.ordering)
+        else:
+            position = self.cursor.position
+        return self.encode_cursor(Cursor(offset=0, reverse=False, position=position))
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if self.page:
+            position = self._get_position_from_instance(self.page[0], self.ordering)
+        else:
+            position = self.cursor.position
+        return self.encode_cursor(Cursor(offset=0, reverse=True, position=position))
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None
+
+        try:
+            payload = json.loads(urlsafe_b64decode(encoded.encode('ascii')))
+            reverse = bool(payload.get('r', False))
+            position = payload['p']
+            if not isinstance(position, list) or len(position) != len(self.ordering):
+                raise ValueError('Cursor does not match ordering')
+            # Typed values, so a tampered cursor fails here rather than in the query
+            position = [
+                self.model._meta.get_field(field.lstrip('-')).to_python(value)
+                for field, value in zip(self.ordering, position)
+            ]
+            if None in position:
+                raise ValueError('Cursor position is incomplete')
+        except (TypeError, ValueError, KeyError, AttributeError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+        return Cursor(offset=0, reverse=reverse, position=position)
+
+    def encode_cursor(self, cursor):
+        payload = {'p': [str(value) for value in cursor.position]}
+        if cursor.reverse:
+            payload['r'] = 1
+        encoded = urlsafe_b64encode(json.dumps(payload, separators=(',', ':')).encode('ascii'))
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded.decode('ascii'))
+
+    def _get_position_from_instance(self, instance, ordering):
+        position = []
+        for field in ordering:
+            name = field.lstrip('-')
+            value = instance[name] if isinstance(instance, dict) else getattr(instance, name)
+            position.append(str(value))
+        return position
+
+    def get_paginated_response(self, data):
+        payload = OrderedDict([
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data),
+        ])
+        if self.total_count is not None:
+            payload['total_count'] = self.total_count
+        return Response(payload)
+
+    def get_paginated_response_schema(self, schema):
+        response_schema = super().get_paginated_response_schema(schema)
+        response_schema['properties']['total_count'] = {'type': 'integer'}
+        return response_schema
@@ -0,0 +1,97 @@
+"""
+Sliding-window rate counters.
+
+Counts are kept per fixed window of `window` seconds and the current rate
+is estimated from the current window plus the share of the previous one
+that still overlaps the sliding window:
+
+    previous * (1 - elapsed / window) + current
+
+Two cache keys per counted key, no per-hit history. The counters live in
+the shared Redis cache (kusanyikoo.caches), where every gunicorn worker
+sees the same counts and increments are atomic. Without it they fall back
+to the per-process default cache, so each worker counts on its own, as
+DRF's throttles did, and no request pays a database round-trip for them.
+"""
+import time
+
+from django.core.cache import cache as local_cache
+
+from .caches import shared_cache
+
+
+def get_cache():
+    cache = shared_cache()
+    return local_cache if cache is None else cache
+
+
+class SlidingWindow:
+    def __init__(self, name, limit, window):
+        self.name = name
+        self.limit = limit
+        self.window = window
+
+    def _state(self, key, now=None):
+        now = time.time() if now is None else now
+        bucket, elapsed = divmod(now, self.window)
+        current = f'ratelimit:{self.name}:{key}:{int(bucket)}'
+        previous = f'ratelimit:{self.name}:{key}:{int(bucket) - 1}'
+        return current, previous, elapsed / self.window
+
+    def _estimate(self, previous, current, elapsed):
+        return previous * (1 - elapsed) + current
+
+    def _read(self, key):
+        current, previous, elapsed = self._state(key)
+        values = get_cache().get_many([current, previous])
+        return current, values.get(current), values.get(previous, 0), elapsed
+
+    def _increment(self, key, value):
+        """Add one to the window count `key`, just read as `value` (None if unset)."""
+        cache = get_cache()
+        # The previous window is read for two windows, so keep each for two
+        if value is None and cache.add(key, 1, timeout=int(self.window * 2) + 1):
+            return 1
+        try:
+            return cache.incr(key)
+        except ValueError:
+            # Expired since it was read
+            cache.set(key, 1, timeout=int(self.window * 2) + 1)
+            return 1
+
+    def count(self, key):
+        """The number of hits in the last `window` seconds."""
+        _, current, previous, elapsed = self._read(key)
+        return self._estimate(previous, current or 0, elapsed)
+
+    def hit(self, key):
+        """Count a hit and return the number of hits in the last `window` seconds, this one included."""
+        current_key, current, previous, elapsed = self._read(key)
+        return self._estimate(previous, self._increment(current_key, current), elapsed)
+
+    def attempt(self, key):
+        """Count a hit unless the limit has been reached; returns whether it was allowed."""
+        current_key, current, previous, elapsed = self._read(key)
+        if self._estimate(previous, current or 0, elapsed) >= self.limit:
+            return False
+        self._increment(current_key, current)
+        return True
+
+    def exceeded(self, key):
+        return self.count(key) >= self.limit
+
+    def reset(self, key):
+        current, previous, _ = self._state(key)
+        get_cache().delete_many([current, previous])
+
+    def wait(self, key):
+        """Seconds until a hit on `key` would be allowed again."""
+        _, current, previous, elapsed = self._read(key)
+        current = current or 0
+        if self._estimate(previous, current, elapsed) < self.limit:
+            return 0
+        if current < self.limit:
+            # Allowed once enough of the previous window has slid out
+            return max(0, self.window * (1 - (self.limit - current) / previous) - elapsed * self.window)
+        # Allowed once enough of the current window has slid out of the next one
+        return self.window * (1 - elapsed) + self.window * (1 - self.limit / current)
@@ -113,8 +113,11 @@ CORS_ALLOW_HEADERS = [
     'user-agent',
     'x-csrftoken',
     'x-requested-with',
+    'idempotency-key',
 ]
 
+CORS_EXPOSE_HEADERS = ['idempotent-replayed']
+
 CORS_ALLOW_METHODS = [
     'DELETE',
     'GET',
@@ -161,18 +164,24 @@ WSGI_APPLICATION = 'kusanyikoo.wsgi.application'
 # Custom User Model
 AUTH_USER_MODEL = 'users.User'
 
+AUTHENTICATION_BACKENDS = [
+    # LoginView passes the user it has already looked up
+    'users.backends.PreloadedUserBackend',
+    'django.contrib.auth.backends.ModelBackend',
+]
+
 
 # REST Framework Configuration
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'users.authentication.CachedJWTAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated',
     ),
     'DEFAULT_THROTTLE_CLASSES': [
-        'rest_framework.throttling.AnonRateThrottle',
-        'rest_framework.throttling.UserRateThrottle'
+        'kusanyikoo.throttling.AnonRateThrottle',
+        'kusanyikoo.throttling.UserRateThrottle'
     ],
     'DEFAULT_THROTTLE_RATES': {
         'anon': '100/hour',
@@ -189,13 +198,17 @@ SIMPLE_JWT = {
     'REFRESH_TOKEN_LIFETIME': timedelta(days=1),
     'ROTATE_REFRESH_TOKENS': True,
     'BLACKLIST_AFTER_ROTATION': True,
-    'UPDATE_LAST_LOGIN': True,
+    # LoginView records last_login in the same UPDATE as the other login fields
+    'UPDATE_LAST_LOGIN': False,
     'ALGORITHM': 'HS256',
     'SIGNING_KEY': SECRET_KEY,
     'VERIFYING_KEY': None,
     'AUTH_HEADER_TYPES': ('Bearer',),
 }
 
+# Seconds an authenticated user stays cached between requests (see users.authentication)
+AUTH_USER_CACHE_TIMEOUT = int(os.environ.get('AUTH_USER_CACHE_TIMEOUT', '60'))
+
 
 # Password Hashing - Use PBKDF2 first (no extra dependencies needed)
 PASSWORD_HASHERS = [
@@ -275,6 +288,14 @@ STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
+# Uploads larger than this are spooled to a temporary file instead of memory
+FILE_UPLOAD_MAX_MEMORY_SIZE = int(os.environ.get('FILE_UPLOAD_MAX_MEMORY_SIZE', str(1024 * 1024)))
+
+# Member pictures are re-encoded on upload to fit these limits
+PICTURE_MAX_UPLOAD_SIZE = int(os.environ.get('PICTURE_MAX_UPLOAD_SIZE', str(20 * 1024 * 1024)))
+PICTURE_MAX_EDGE = int(os.environ.get('PICTURE_MAX_EDGE', '1280'))
+PICTURE_MAX_BYTES = int(os.environ.get('PICTURE_MAX_BYTES', str(250 * 1024)))
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
@@ -297,6 +318,47 @@ CACHES = {
     }
 }
 
+# Shared by every worker: cached API users, member data versions and the
+# throttle and failed-login counters. Without Redis the first two are not
+# cached at all, since per-process copies go stale, throttles count per
+# process and failed logins are counted on the user row.
+if os.environ.get('REDIS_URL'):
+    CACHES['shared'] = {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': os.environ.get('REDIS_URL'),
+        'KEY_PREFIX': 'kusanyiko',
+    }
+
+SHARED_CACHE = 'shared' if 'shared' in CACHES else None
+
+# Failed logins within LOGIN_FAILURE_WINDOW seconds that lock an account
+LOGIN_MAX_FAILURES = int(os.environ.get('LOGIN_MAX_FAILURES', '5'))
+LOGIN_FAILURE_WINDOW = int(os.environ.get('LOGIN_FAILURE_WINDOW', '1800'))
+LOGIN_LOCKOUT_MINUTES = int(os.environ.get('LOGIN_LOCKOUT_MINUTES', '30'))
+
+# Background worker threads for export jobs and other slow tasks
+BACKGROUND_WORKERS = int(os.environ.get('BACKGROUND_WORKERS', '2'))
+
+# Minutes an export job may stay "running" before process_exports requeues
+# it as lost to a restart
+EXPORT_JOB_TIMEOUT_MINUTES = int(os.environ.get('EXPORT_JOB_TIMEOUT_MINUTES', '30'))
+
+# Processes used to render large member PDFs in page ranges (0 or 1 renders in-process)
+EXPORT_PDF_WORKERS = int(os.environ.get('EXPORT_PDF_WORKERS', '0'))
+
+# Hours an Idempotency-Key response is kept for replay (purge_idempotency_keys)
+IDEMPOTENCY_KEY_TTL_HOURS = int(os.environ.get('IDEMPOTENCY_KEY_TTL_HOURS', '24'))
+
+# Audit log entries are buffered per process and bulk-inserted
+AUDIT_LOG_BUFFERED = os.environ.get('AUDIT_LOG_BUFFERED', 'True').lower() == 'true'
+AUDIT_LOG_BUFFER_SIZE = int(os.environ.get('AUDIT_LOG_BUFFER_SIZE', '50'))
+AUDIT_LOG_FLUSH_INTERVAL = float(os.environ.get('AUDIT_LOG_FLUSH_INTERVAL', '2'))
+
+# Months of audit log kept in the database; older months are moved to
+# gzipped JSON Lines files in AUDIT_LOG_ARCHIVE_DIR by rotate_audit_log
+AUDIT_LOG_RETENTION_MONTHS = int(os.environ.get('AUDIT_LOG_RETENTION_MONTHS', '12'))
+AUDIT_LOG_ARCHIVE_DIR = os.environ.get('AUDIT_LOG_ARCHIVE_DIR', str(BASE_DIR / 'audit_archive'))
+
 # Rate Limiting
 # RATELIMIT_ENABLE = True
 # RATELIMIT_USE_CACHE = 'default'
@@ -0,0 +1,36 @@
+"""
+DRF throttles counted in the shared rate-limit cache.
+
+DRF's own throttles keep a list of request times per client in the default
+cache, which is per process here, so every gunicorn worker allowed the full
+rate. These keep the same rates, scopes and cache keys but count with
+kusanyikoo.ratelimit.SlidingWindow.
+"""
+from rest_framework import throttling
+
+from .ratelimit import SlidingWindow
+
+
+class SlidingWindowThrottleMixin:
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        self.counter = SlidingWindow(self.scope, self.num_requests, self.duration)
+        # Rejected requests are not counted, as with DRF's throttles
+        return self.counter.attempt(self.key)
+
+    def wait(self):
+        return self.counter.wait(self.key)
+
+
+class AnonRateThrottle(SlidingWindowThrottleMixin, throttling.AnonRateThrottle):
+    pass
+
+
+class UserRateThrottle(SlidingWindowThrottleMixin, throttling.UserRateThrottle):
+    pass
@@ -15,12 +15,14 @@ Including another URLconf
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
 from django.contrib import admin
-from django.urls import path, include
+from django.urls import path, re_path, include
 from django.conf import settings
 from django.conf.urls.static import static
 from django.http import JsonResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods
+from members.pictures import PATH_PATTERN as MEMBER_PICTURE_PATH
+from members.views import serve_picture
 
 @csrf_exempt
 @require_http_methods(["GET", "OPTIONS"])
@@ -48,6 +50,8 @@ urlpatterns = [
     path('api/members/', include('members.urls')),
     path('api/stats/', include('analytics.urls')),
     path('api/export/', include('analytics.export_urls')),  # For export functionality
+    # Content-addressed member pictures, served with immutable caching
+    re_path(rf'^{settings.MEDIA_URL.lstrip("/")}(?P<path>{MEMBER_PICTURE_PATH})$', serve_picture, name='member-picture'),
 ]
 
 # Serve media files during development
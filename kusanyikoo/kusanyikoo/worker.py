@@ -0,0 +1,47 @@
+"""
+In-process background worker.
+
+A small thread pool that runs slow work (export jobs and the like) outside
+the request/response cycle so it does not hold a gunicorn worker. Jobs must
+be recorded in the database before they are submitted so that anything lost
+to a restart can be picked up again by a management command.
+"""
+import threading
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import close_old_connections, connections, transaction
+
+_executor = None
+_lock = threading.Lock()
+
+
+def _get_executor():
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=getattr(settings, 'BACKGROUND_WORKERS', 2),
+                thread_name_prefix='kusanyiko-worker',
+            )
+        return _executor
+
+
+def _run(func, args, kwargs):
+    close_old_connections()
+    try:
+        func(*args, **kwargs)
+    except Exception as e:
+        print(f"Background job {func.__name__} failed: {e}")
+        traceback.print_exc()
+    finally:
+        connections.close_all()
+
+
+def submit(func, *args, **kwargs):
+    """Run `func(*args, **kwargs)` on the worker once the current transaction commits."""
+    if getattr(settings, 'BACKGROUND_TASKS_EAGER', False):
+        transaction.on_commit(lambda: func(*args, **kwargs))
+        return
+    transaction.on_commit(lambda: _get_executor().submit(_run, func, args, kwargs))
@@ -1,6 +1,28 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
+
+
+def ensure_search_index(sender, using='default', **kwargs):
+    """Reinstall search triggers that a table rebuild may have dropped."""
+    from django.db import connections
+    from .search import install_search_index
+    install_search_index(connections[using])
+
+
+def ensure_sync_triggers(sender, using='default', **kwargs):
+    """Reinstall the sync_seq triggers that a table rebuild may have dropped."""
+    from django.db import connections
+    from .sync import install_sync_triggers
+    install_sync_triggers(connections[using])
 
 
 class MembersConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'members'
+
+    def ready(self):
+        from kusanyikoo.caches import warn_if_not_shared
+        from . import signals  # noqa: F401
+        warn_if_not_shared()
+        post_migrate.connect(ensure_search_index, sender=self)
+        post_migrate.connect(ensure_sync_triggers, sender=self)
@@ -0,0 +1,78 @@
+"""
+Versioned caching of results computed from the member table.
+
+The version and the cached results live in the shared cache
+(kusanyikoo.caches), so a write handled by one worker invalidates every
+worker's stats. Without a shared cache results are built on every request.
+"""
+import time
+
+from django.db import transaction
+
+from kusanyikoo.caches import shared_cache
+
+DATA_VERSION_KEY = 'members:data_version'
+
+
+def _initial_version():
+    # Seed from the clock so a version lost to eviction or a restart never
+    # collides with one that cached results were stored under.
+    return int(time.time() * 1000)
+
+
+def get_data_version():
+    """Return the current version of the member table's data."""
+    cache = shared_cache()
+    if cache is None:
+        return None
+    version = cache.get(DATA_VERSION_KEY)
+    if version is None:
+        cache.add(DATA_VERSION_KEY, _initial_version(), None)
+        version = cache.get(DATA_VERSION_KEY)
+    return version
+
+
+def _bump():
+    cache = shared_cache()
+    if cache is None:
+        return
+    try:
+        cache.incr(DATA_VERSION_KEY)
+    except ValueError:
+        cache.set(DATA_VERSION_KEY, _initial_version(), None)
+
+
+def bump_data_version():
+    """
+    Invalidate everything cached against the member table. Bumps now and
+    again once the current transaction commits, so stats rebuilt from
+    pre-commit data in between are not kept.
+    """
+    _bump()
+    transaction.on_commit(_bump)
+
+
+def get_or_build(key, build, timeout):
+    """
+    Return the value cached under `key` for the current data version.
+
+    A hit costs a single cache round-trip. On a miss `build()` is called and
+    its result stored against the version read *before* building, so a write
+    that lands mid-build invalidates it instead of being masked.
+    """
+    cache = shared_cache()
+    if cache is None:
+        return build()
+
+    values = cache.get_many([DATA_VERSION_KEY, key])
+    version = values.get(DATA_VERSION_KEY)
+    if version is None:
+        version = get_data_version()
+
+    entry = values.get(key)
+    if entry is not None and entry[0] == version:
+        return entry[1]
+
+    value = build()
+    cache.set(key, (version, value), timeout)
+    return value
@@ -0,0 +1,152 @@
+"""
+Streaming export helpers.
+
+Rows are pulled from the database with `values_list(...).iterator()` and
+written to the client as they are produced, so memory stays flat no matter
+how many members are exported and the header goes out before the query runs.
+
+On PostgreSQL, CSV exports skip Python row handling altogether: the query
+runs as COPY (SELECT ...) TO STDOUT and the CSV that PostgreSQL produces is
+passed through. The SELECT's columns must then already be the final text,
+which the `sql_*` expressions below render the same way as the Python
+formatters of the ORM path.
+"""
+import csv
+
+from django.db import connection
+from django.db.models import Case, CharField, F, Func, Value, When
+from django.db.models.functions import Coalesce
+from django.http import StreamingHttpResponse
+
+CHUNK_SIZE = 2000
+FLUSH_BYTES = 64 * 1024
+
+
+class Echo:
+    """File-like object that hands back whatever csv.writer writes to it."""
+
+    def write(self, value):
+        return value
+
+
+def iter_csv(header, rows):
+    """Yield CSV-encoded bytes for `header` and `rows`, in chunks of ~64 KB."""
+    writer = csv.writer(Echo())
+    yield writer.writerow(header).encode('utf-8')
+
+    buffer = []
+    size = 0
+    for row in rows:
+        line = writer.writerow(row)
+        buffer.append(line)
+        size += len(line)
+        if size >= FLUSH_BYTES:
+            yield ''.join(buffer).encode('utf-8')
+            buffer = []
+            size = 0
+    if buffer:
+        yield ''.join(buffer).encode('utf-8')
+
+
+def copy_supported():
+    return connection.vendor == 'postgresql'
+
+
+def copy_values(queryset, columns):
+    """
+    values_list() of `columns` (field names or expressions) whose SELECT list
+    is in the same order. values_list() itself selects plain fields before
+    expressions and reorders rows in Python, which COPY output never passes
+    through, so every column becomes an annotation here.
+    """
+    names = [f'column_{index}' for index in range(len(columns))]
+    expressions = {
+        name: F(column) if isinstance(column, str) else column
+        for name, column in zip(names, columns)
+    }
+    return queryset.annotate(**expressions).values_list(*names)
+
+
+def iter_copy_csv(header, queryset, columns):
+    """
+    Yield CSV bytes for `header` and `columns` of each row of `queryset`,
+    as written by PostgreSQL's COPY.
+    """
+    yield csv.writer(Echo()).writerow(header).encode('utf-8')
+
+    sql, params = copy_values(queryset, columns).query.sql_with_params()
+    with connection.cursor() as cursor:
+        with cursor.copy(f'COPY ({sql}) TO STDOUT WITH (FORMAT csv)', params) as copy:
+            # COPY hands back one row at a time; send them in ~64 KB chunks
+            buffer = []
+            size = 0
+            for data in copy:
+                buffer.append(bytes(data))
+                size += len(data)
+                if size >= FLUSH_BYTES:
+                    yield b''.join(buffer)
+                    buffer = []
+                    size = 0
+            if buffer:
+                yield b''.join(buffer)
+
+
+def sql_datetime(field, fmt='YYYY-MM-DD HH24:MI:SS'):
+    """`field` formatted like format_datetime(); Django keeps PostgreSQL sessions in UTC."""
+    return Func(F(field), Value(fmt), function='to_char', output_field=CharField())
+
+
+def sql_yes_no(field):
+    return Case(When(**{field: True}, then=Value('Yes')), default=Value('No'), output_field=CharField())
+
+
+def sql_default(field, default='N/A'):
+    return Coalesce(F(field), Value(default), output_field=CharField())
+
+
+class CountingIterator:
+    """Pass chunks through unchanged and report the byte total when exhausted."""
+
+    def __init__(self, chunks, on_complete):
+        self.chunks = chunks
+        self.on_complete = on_complete
+        self.byte_count = 0
+
+    def __iter__(self):
+        for chunk in self.chunks:
+            self.byte_count += len(chunk)
+            yield chunk
+        self.on_complete(self.byte_count)
+
+
+def streaming_response(chunks, content_type, filename):
+    response = StreamingHttpResponse(chunks, content_type=content_type)
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
+
+
+def csv_response(header, rows, filename):
+    return streaming_response(iter_csv(header, rows), 'text/csv', filename)
+
+
+def copy_csv_response(header, queryset, columns, filename):
+    return streaming_response(iter_copy_csv(header, queryset, columns), 'text/csv', filename)
+
+
+def format_datetime(value, fmt='%Y-%m-%d %H:%M:%S'):
+    return value.strftime(fmt) if value else ''
+
+
+def member_rows(queryset, fields, formatters=None):
+    """
+    Iterate `fields` of every member in `queryset` as tuples, in chunks.
+
+    `formatters` maps a column index to a function applied to that value.
+    """
+    formatters = formatters or {}
+    for row in queryset.values_list(*fields).iterator(chunk_size=CHUNK_SIZE):
+        if formatters:
+            row = list(row)
+            for index, formatter in formatters.items():
+                row[index] = formatter(row[index])
+        yield row
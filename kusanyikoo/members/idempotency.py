@@ -0,0 +1,104 @@
+"""
+Idempotency-Key support for member creation.
+
+The first request with a given key claims an IdempotencyKey row and runs in
+the same transaction as the view, so the stored response commits together
+with the members it created (or not at all). A retry with the same key gets
+the stored response back without validation or INSERTs; a concurrent retry
+blocks on the unique index until the first request finishes.
+"""
+import hashlib
+import json
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.response import Response
+
+from .models import IdempotencyKey
+
+HEADER = 'Idempotency-Key'
+MAX_KEY_LENGTH = 255
+
+
+def _sha256(value):
+    return hashlib.sha256(value.encode('utf-8')).hexdigest()
+
+
+def _cutoff(hours=None):
+    if hours is None:
+        hours = getattr(settings, 'IDEMPOTENCY_KEY_TTL_HOURS', 24)
+    return timezone.now() - timedelta(hours=hours)
+
+
+def _fingerprint(request):
+    return _sha256(json.dumps(request.data, sort_keys=True, default=str))
+
+
+def _replay(record, request_hash):
+    if record is None or record.status_code is None:
+        return Response(
+            {'error': f'A request with this {HEADER} is still being processed'},
+            status=status.HTTP_409_CONFLICT
+        )
+    if record.request_hash != request_hash:
+        return Response(
+            {'error': f'This {HEADER} was already used for a different request'},
+            status=status.HTTP_422_UNPROCESSABLE_ENTITY
+        )
+    response = Response(record.response, status=record.status_code)
+    response['Idempotent-Replayed'] = 'true'
+    return response
+
+
+def idempotent(request, scope, handler):
+    """
+    Run `handler()` (which returns a DRF Response) at most once per
+    Idempotency-Key; requests without the header run normally.
+    """
+    key = request.headers.get(HEADER)
+    if not key:
+        return handler()
+    if len(key) > MAX_KEY_LENGTH:
+        return Response(
+            {'error': f'{HEADER} must be at most {MAX_KEY_LENGTH} characters'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    key_hash = _sha256(f'{request.user.pk}:{scope}:{key}')
+    request_hash = _fingerprint(request)
+    cutoff = _cutoff()
+
+    # Retries of completed requests are answered with a single lookup. A key
+    # older than IDEMPOTENCY_KEY_TTL_HOURS has expired, whether or not
+    # purge_idempotency_keys has removed it yet, and may be used again.
+    record = IdempotencyKey.objects.filter(key_hash=key_hash, created_at__gte=cutoff).first()
+    if record is not None:
+        return _replay(record, request_hash)
+
+    with transaction.atomic():
+        IdempotencyKey.objects.filter(key_hash=key_hash, created_at__lt=cutoff).delete()
+        try:
+            with transaction.atomic():
+                record = IdempotencyKey.objects.create(key_hash=key_hash, request_hash=request_hash)
+        except IntegrityError:
+            return _replay(IdempotencyKey.objects.filter(key_hash=key_hash).first(), request_hash)
+
+        response = handler()
+        if response.status_code >= 500:
+            # Let the client retry with the same key.
+            transaction.set_rollback(True)
+            return response
+
+        record.status_code = response.status_code
+        record.response = response.data
+        record.save(update_fields=['status_code', 'response'])
+        return response
+
+
+def purge_expired(hours=None):
+    """Delete keys older than IDEMPOTENCY_KEY_TTL_HOURS; returns how many were removed."""
+    deleted, _ = IdempotencyKey.objects.filter(created_at__lt=_cutoff(hours)).delete()
+    return deleted
@@ -0,0 +1,164 @@
+"""
+Member picture processing.
+
+Uploads are normalized before they reach storage: decoded, turned upright,
+scaled down to PICTURE_MAX_EDGE and re-encoded as a JPEG of at most
+PICTURE_MAX_BYTES, which drops camera metadata along the way.
+
+After an upload commits, the background worker writes WebP and JPEG copies
+of the picture at each of THUMBNAIL_WIDTHS next to the original
+(member_pictures/abc.jpg -> member_pictures/abc_320w.webp) and records their
+names in `Member.picture_derivatives`. EXIF orientation is applied before
+resizing and no metadata is written to the derivatives.
+"""
+import io
+import os
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.utils import timezone
+from PIL import Image, ImageOps
+
+from kusanyikoo import worker
+from . import pictures
+from .models import Member
+
+THUMBNAIL_WIDTHS = (96, 320, 640)
+
+# Qualities tried in turn to bring a normalized picture under the byte
+# budget; below the last one the picture is scaled down instead.
+PICTURE_QUALITIES = (85, 78, 70, 62)
+PICTURE_MIN_EDGE = 320
+
+# (Pillow format, save options) per derivative extension, best format first
+FORMATS = {
+    'webp': ('WEBP', {'quality': 80, 'method': 4}),
+    'jpeg': ('JPEG', {'quality': 82, 'optimize': True, 'progressive': True}),
+}
+
+
+def derivative_name(name, width, extension):
+    root, _ = os.path.splitext(name)
+    return f'{root}_{width}w.{extension}'
+
+
+def _open(fileobj, max_width):
+    image = Image.open(fileobj)
+    # Let the JPEG decoder downscale by a power of two while decoding, which is
+    # far cheaper than decoding a full camera frame. Both edges are bounded
+    # because the orientation is not known until the EXIF data is applied.
+    image.draft('RGB', (max_width, max_width))
+    image = ImageOps.exif_transpose(image)
+    if image.mode != 'RGB':
+        image = image.convert('RGB')
+    return image
+
+
+def _encode(image, image_format, **overrides):
+    options = dict(FORMATS[image_format.lower()][1], **overrides)
+    buffer = io.BytesIO()
+    image.save(buffer, image_format, **options)
+    return buffer.getvalue()
+
+
+def normalize_picture(upload, max_edge=None, max_bytes=None):
+    """
+    Return the uploaded picture as a ContentFile holding an upright JPEG no
+    larger than `max_edge` pixels on its long side and, where the quality
+    floor allows, `max_bytes` bytes. Raises ValueError if `upload` cannot
+    be decoded.
+    """
+    if max_edge is None:
+        max_edge = getattr(settings, 'PICTURE_MAX_EDGE', 1280)
+    if max_bytes is None:
+        max_bytes = getattr(settings, 'PICTURE_MAX_BYTES', 250 * 1024)
+
+    upload.seek(0)
+    try:
+        image = _open(upload, max_edge)
+        image.thumbnail((max_edge, max_edge), Image.LANCZOS)
+    except (OSError, SyntaxError, Image.DecompressionBombError) as e:
+        raise ValueError(f'Could not read the picture: {e}')
+
+    while True:
+        for quality in PICTURE_QUALITIES:
+            content = _encode(image, 'JPEG', quality=quality)
+            if len(content) <= max_bytes:
+                break
+        if len(content) <= max_bytes or max(image.size) <= PICTURE_MIN_EDGE:
+            break
+        image = image.resize((max(1, image.width * 3 // 4), max(1, image.height * 3 // 4)), Image.LANCZOS)
+
+    stem = os.path.splitext(os.path.basename(upload.name or 'picture'))[0]
+    return ContentFile(content, name=f'{stem}.jpg')
+
+
+def render(fileobj, widths=THUMBNAIL_WIDTHS):
+    """
+    Yield (width, extension, bytes) for each derivative of the image in
+    `fileobj`. Widths wider than the image itself are collapsed into one
+    derivative at the image's own width.
+    """
+    image = _open(fileobj, max(widths))
+    targets = sorted({min(width, image.width) for width in widths}, reverse=True)
+    for width in targets:
+        if image.width > width:
+            # Each size is reduced from the previous, larger one
+            height = max(1, round(image.height * width / image.width))
+            image = image.resize((width, height), Image.LANCZOS)
+        for extension, (image_format, _) in FORMATS.items():
+            yield width, extension, _encode(image, image_format)
+
+
+def build_derivatives(member_id):
+    """Write (or reuse) the derivatives of a member's current picture and record them."""
+    member = Member.objects.filter(pk=member_id).only('picture').first()
+    if member is None or not member.picture:
+        return None
+    name = member.picture.name
+
+    # Pictures are content-addressed, so a member sharing this picture may
+    # already have the derivatives recorded.
+    derivatives = Member.objects.filter(picture=name).exclude(picture_derivatives={})\
+        .values_list('picture_derivatives', flat=True).first()
+    if not derivatives:
+        storage = member.picture.storage
+        derivatives = {}
+        with storage.open(name, 'rb') as fileobj:
+            for width, extension, content in render(fileobj):
+                target = derivative_name(name, width, extension)
+                if not storage.exists(target):
+                    target = storage.save(target, ContentFile(content))
+                derivatives.setdefault(extension, {})[str(width)] = target
+
+    # The picture may have been replaced while this one was being resized;
+    # unrecorded files are left to gc_pictures. updated_at moves so delta
+    # sync hands devices the new srcset.
+    updated = Member.objects.filter(pk=member_id, picture=name)\
+        .update(picture_derivatives=derivatives, updated_at=timezone.now())
+    return derivatives if updated else None
+
+
+def picture_replaced(member, previous_name):
+    """
+    Move the picture reference count from `previous_name` to the member's
+    new picture and schedule its derivatives. Call inside the save transaction.
+    """
+    pictures.release(previous_name)
+    if member.picture:
+        pictures.acquire(member.picture.name)
+        worker.submit(build_derivatives, member.pk)
+
+
+def srcset(derivatives, url):
+    """
+    {extension: srcset string} for a member's derivatives; `url` turns a
+    storage name into the URL to list.
+    """
+    return {
+        extension: ', '.join(
+            f'{url(name)} {width}w'
+            for width, name in sorted(names.items(), key=lambda item: int(item[0]))
+        )
+        for extension, names in derivatives.items()
+    }
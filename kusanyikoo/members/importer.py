@@ -0,0 +1,420 @@
+"""
+Streaming member import from CSV and XLSX registers.
+
+Rows are parsed lazily (csv.reader for CSV; iterparse over the worksheet XML
+for XLSX, clearing each row once read), validated with MemberSerializer's
+field rules and written in chunks. Each chunk is inserted together with its
+rejected rows and the import's progress counters in one transaction, so an
+interrupted import resumes from the last committed chunk without duplicating
+members. PostgreSQL loads chunks with COPY; other databases execute one
+prepared INSERT per chunk.
+"""
+import csv
+import io
+import re
+import zipfile
+from datetime import date, datetime, timedelta
+from xml.etree.ElementTree import iterparse
+
+from django.db import DEFAULT_DB_ALIAS, connection, connections, transaction
+from django.db.models import F
+from django.utils import timezone
+from rest_framework import serializers
+
+from .models import Member, MemberImport, MemberImportError
+from .serializers import MemberSerializer
+from .signals import members_bulk_created
+
+CHUNK_SIZE = 2000
+
+# Only the first errors of an import are kept for the report; all are counted.
+MAX_STORED_ERRORS = 5000
+
+IMPORT_FIELDS = [
+    'first_name', 'middle_name', 'last_name', 'gender', 'age', 'marital_status', 'saved',
+    'church_registration_number', 'country', 'region', 'center_area', 'zone', 'cell',
+    'postal_address', 'mobile_no', 'email', 'church_position', 'visitors_count', 'origin',
+    'residence', 'career', 'attending_date',
+]
+
+# Column headings used by our own exports and common spreadsheet variants.
+COLUMN_ALIASES = {
+    'mobile_number': 'mobile_no',
+    'mobile': 'mobile_no',
+    'phone': 'mobile_no',
+    'phone_number': 'mobile_no',
+    'center': 'center_area',
+    'area': 'center_area',
+    'registration_number': 'church_registration_number',
+    'position': 'church_position',
+    'visitors': 'visitors_count',
+    'address': 'postal_address',
+}
+
+CHOICE_FIELDS = ['gender', 'marital_status', 'origin']
+DATE_FIELDS = ['attending_date']
+DATE_INPUT_FORMATS = ['%Y-%m-%d', '%d/%m/%Y', '%d-%m-%Y', '%Y/%m/%d']
+EXCEL_EPOCH = date(1899, 12, 30)
+
+
+class ImportFormatError(ValueError):
+    pass
+
+
+def detect_format(filename):
+    name = filename.lower()
+    if name.endswith('.csv'):
+        return 'csv'
+    if name.endswith('.xlsx'):
+        return 'xlsx'
+    raise ImportFormatError('Only .csv and .xlsx files can be imported')
+
+
+# Readers yield (row_number, [cell values]) starting with the header row.
+
+def read_csv(fileobj):
+    text = io.TextIOWrapper(fileobj, encoding='utf-8-sig', errors='replace', newline='')
+    for number, row in enumerate(csv.reader(text), 1):
+        yield number, row
+
+
+def _local(tag):
+    return tag.rsplit('}', 1)[-1]
+
+
+def _column_index(ref):
+    index = 0
+    for char in ref:
+        if not char.isalpha():
+            break
+        index = index * 26 + ord(char.upper()) - 64
+    return index - 1
+
+
+def _first_sheet_path(archive):
+    try:
+        with archive.open('xl/workbook.xml') as workbook:
+            rel_id = next(
+                element.get('{http://schemas.openxmlformats.org/officeDocument/2006/relationships}id')
+                for _, element in iterparse(workbook) if _local(element.tag) == 'sheet'
+            )
+        with archive.open('xl/_rels/workbook.xml.rels') as rels:
+            for _, element in iterparse(rels):
+                if _local(element.tag) == 'Relationship' and element.get('Id') == rel_id:
+                    target = element.get('Target').lstrip('/')
+                    return target if target.startswith('xl/') else f'xl/{target}'
+    except (KeyError, StopIteration):
+        pass
+    return 'xl/worksheets/sheet1.xml'
+
+
+def _shared_strings(archive):
+    if 'xl/sharedStrings.xml' not in archive.namelist():
+        return []
+    strings = []
+    with archive.open('xl/sharedStrings.xml') as part:
+        for _, element in iterparse(part):
+            if _local(element.tag) == 'si':
+                # Rich text runs are concatenated; phonetic hints (rPh) are skipped.
+                parts = []
+                for child in element:
+                    if _local(child.tag) == 't':
+                        parts.append(child.text or '')
+                    elif _local(child.tag) == 'r':
+                        parts.extend(node.text or '' for node in child if _local(node.tag) == 't')
+                strings.append(''.join(parts))
+                element.clear()
+    return strings
+
+
+def read_xlsx(fileobj):
+    """Stream the rows of the first worksheet; memory is one row plus the shared strings."""
+    try:
+        archive = zipfile.ZipFile(fileobj)
+    except zipfile.BadZipFile:
+        raise ImportFormatError('The file is not a valid .xlsx workbook')
+    with archive:
+        strings = _shared_strings(archive)
+        with archive.open(_first_sheet_path(archive)) as sheet:
+            parent = None
+            number = 0
+            for event, element in iterparse(sheet, events=('start', 'end')):
+                tag = _local(element.tag)
+                if event == 'start':
+                    if tag == 'sheetData':
+                        parent = element
+                    continue
+                if tag != 'row':
+                    continue
+
+                number = int(element.get('r') or number + 1)
+                values = []
+                for cell in element:
+                    if _local(cell.tag) != 'c':
+                        continue
+                    ref = cell.get('r')
+                    index = _column_index(ref) if ref else len(values)
+                    while len(values) < index:
+                        values.append('')
+                    values.append(_cell_value(cell, strings))
+                yield number, values
+
+                if parent is not None:
+                    parent.clear()
+
+
+def _cell_value(cell, strings):
+    kind = cell.get('t', 'n')
+    if kind == 'inlineStr':
+        return ''.join(node.text or '' for node in cell.iter() if _local(node.tag) == 't')
+    value = next((node.text or '' for node in cell if _local(node.tag) == 'v'), '')
+    if kind == 's' and value:
+        return strings[int(value)]
+    if kind == 'b':
+        return 'true' if value == '1' else 'false'
+    return value
+
+
+READERS = {'csv': read_csv, 'xlsx': read_xlsx}
+
+
+# Mapping and normalisation
+
+def _normalise_heading(heading):
+    return re.sub(r'[^a-z0-9]+', '_', str(heading).strip().lower()).strip('_')
+
+
+def map_columns(header):
+    """Return the Member field for each column of `header` (None for ignored columns)."""
+    fields = []
+    for heading in header:
+        name = _normalise_heading(heading)
+        name = COLUMN_ALIASES.get(name, name)
+        fields.append(name if name in IMPORT_FIELDS and name not in fields else None)
+    if 'first_name' not in fields or 'last_name' not in fields:
+        raise ImportFormatError('The header row must contain at least First Name and Last Name columns')
+    return fields
+
+
+def _parse_date(value):
+    try:
+        # Excel stores dates as day serials; CSV exports of them look the same.
+        serial = float(value)
+        if 1 <= serial < 2958466:
+            return (EXCEL_EPOCH + timedelta(days=int(serial))).isoformat()
+    except ValueError:
+        pass
+    text = value.split(' ')[0].split('T')[0]
+    for fmt in DATE_INPUT_FORMATS:
+        try:
+            return datetime.strptime(text, fmt).date().isoformat()
+        except ValueError:
+            continue
+    return value
+
+
+def row_data(fields, values):
+    """Build serializer input from one row; empty cells are left out."""
+    data = {}
+    for field, value in zip(fields, values):
+        if field is None:
+            continue
+        value = str(value).strip()
+        if not value:
+            continue
+        if field in CHOICE_FIELDS:
+            value = value.lower()
+        elif field in DATE_FIELDS:
+            value = _parse_date(value)
+        data[field] = value
+    return data
+
+
+# Validation
+
+class RowValidator:
+    """
+    Applies MemberSerializer's field rules to import rows.
+
+    Registers repeat the same genders, regions, zones and dates on most rows,
+    so each field's result is memoised per distinct value instead of running
+    the full serializer for every row.
+    """
+    CACHE_LIMIT = 10000
+
+    def __init__(self):
+        self.serializer = MemberSerializer()
+        self.fields = {
+            name: field for name, field in self.serializer.fields.items()
+            if name in IMPORT_FIELDS and not field.read_only
+        }
+        self.cache = {name: {} for name in self.fields}
+
+    def _validate_field(self, name, value):
+        cache = self.cache[name]
+        result = cache.get(value)
+        if result is None:
+            try:
+                result = (True, self.fields[name].run_validation(value))
+            except serializers.ValidationError as e:
+                result = (False, [str(message) for message in e.detail])
+            if len(cache) < self.CACHE_LIMIT:
+                cache[value] = result
+        return result
+
+    def validate(self, data):
+        """Return (validated attrs, None) or (None, {field: [messages]})."""
+        attrs = {}
+        errors = {}
+        for name, field in self.fields.items():
+            if name not in data:
+                if field.required:
+                    errors[name] = [str(field.error_messages['required'])]
+                continue
+            valid, result = self._validate_field(name, data[name])
+            if valid:
+                attrs[name] = result
+            else:
+                errors[name] = result
+        if errors:
+            return None, errors
+        try:
+            return self.serializer.validate(attrs), None
+        except serializers.ValidationError as e:
+            return None, _flatten_errors(e.detail)
+
+
+# Writing
+
+def _db_rows(members, fields):
+    """Yield each member as a list of database values for `fields`."""
+    # Resolve the connection proxy once; it is looked up per attribute access.
+    db = connections[DEFAULT_DB_ALIAS]
+    for member in members:
+        yield [field.get_db_prep_save(field.pre_save(member, True), db) for field in fields]
+
+
+def write_members(members):
+    """
+    Insert `members` without reading back primary keys: COPY on PostgreSQL,
+    one prepared INSERT executed for the whole chunk elsewhere.
+    """
+    fields = [field for field in Member._meta.concrete_fields if not field.primary_key]
+    table = connection.ops.quote_name(Member._meta.db_table)
+    columns = ', '.join(connection.ops.quote_name(field.column) for field in fields)
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            with cursor.copy(f'COPY {table} ({columns}) FROM STDIN') as copy:
+                for row in _db_rows(members, fields):
+                    copy.write_row(row)
+        else:
+            placeholders = ', '.join(['%s'] * len(fields))
+            cursor.executemany(f'INSERT INTO {table} ({columns}) VALUES ({placeholders})', list(_db_rows(members, fields)))
+
+
+def _save_chunk(member_import, members, failures, rows_read):
+    stored = max(0, MAX_STORED_ERRORS - member_import.rows_failed)
+    with transaction.atomic():
+        if members:
+            write_members(members)
+            members_bulk_created.send(sender=Member, members=members)
+        if failures and stored:
+            MemberImportError.objects.bulk_create([
+                MemberImportError(member_import=member_import, row_number=number, errors=errors, data=data)
+                for number, errors, data in failures[:stored]
+            ])
+        MemberImport.objects.filter(pk=member_import.pk).update(
+            rows_processed=F('rows_processed') + rows_read,
+            rows_imported=F('rows_imported') + len(members),
+            rows_failed=F('rows_failed') + len(failures),
+        )
+    member_import.rows_processed += rows_read
+    member_import.rows_imported += len(members)
+    member_import.rows_failed += len(failures)
+
+
+def _flatten_errors(detail):
+    if isinstance(detail, dict):
+        return {field: [str(message) for message in messages] if isinstance(messages, list) else [str(messages)]
+                for field, messages in detail.items()}
+    return {'non_field_errors': [str(message) for message in detail]}
+
+
+def import_rows(member_import, rows, chunk_size=CHUNK_SIZE, progress=None):
+    """Validate and write data `rows` ((row_number, values) pairs) for `member_import`."""
+    fields = map_columns(member_import.columns)
+    validator = RowValidator()
+    owner = member_import.created_by
+
+    members = []
+    failures = []
+    rows_read = 0
+    for number, values in rows:
+        rows_read += 1
+        data = row_data(fields, values)
+        if data:
+            validated, errors = validator.validate(data)
+            if errors:
+                failures.append((number, errors, data))
+            else:
+                members.append(Member(**validated, created_by=owner))
+
+        if rows_read >= chunk_size:
+            _save_chunk(member_import, members, failures, rows_read)
+            if progress:
+                progress(member_import)
+            members, failures, rows_read = [], [], 0
+
+    if rows_read:
+        _save_chunk(member_import, members, failures, rows_read)
+        if progress:
+            progress(member_import)
+
+
+def run_import(import_id, resume=False, chunk_size=CHUNK_SIZE, progress=None):
+    """
+    Run import `import_id`. Pending imports are claimed; with `resume=True`
+    a failed or interrupted one continues after its last committed chunk.
+    """
+    states = ['pending', 'running', 'failed'] if resume else ['pending']
+    claimed = MemberImport.objects.filter(pk=import_id, status__in=states)\
+        .update(status='running', started_at=timezone.now(), error='')
+    if not claimed:
+        return None
+
+    member_import = MemberImport.objects.select_related('created_by').get(pk=import_id)
+    try:
+        with member_import.file.open('rb') as fileobj:
+            rows = READERS[member_import.format](fileobj)
+            _, header = next(rows, (0, []))
+            if not member_import.columns:
+                member_import.columns = [str(value) for value in header]
+                member_import.save(update_fields=['columns'])
+
+            # Skip the rows committed by an earlier run.
+            for _ in range(member_import.rows_processed):
+                if next(rows, None) is None:
+                    break
+            import_rows(member_import, rows, chunk_size, progress)
+
+        member_import.status = 'completed'
+    except Exception as e:
+        member_import.status = 'failed'
+        member_import.error = str(e)
+    member_import.completed_at = timezone.now()
+    member_import.save(update_fields=['status', 'error', 'completed_at'])
+    return member_import
+
+
+def error_rows(member_import):
+    """Rows of the error report: row number, messages and the submitted values."""
+    fields = [field for field in map_columns(member_import.columns) if field]
+    for error in member_import.row_errors.order_by('row_number').iterator(chunk_size=CHUNK_SIZE):
+        messages = '; '.join(
+            f"{field}: {' '.join(field_messages)}" for field, field_messages in error.errors.items()
+        )
+        yield [error.row_number, messages] + [error.data.get(field, '') for field in fields]
+
+
+def error_report_header(member_import):
+    return ['Row', 'Errors'] + [field for field in map_columns(member_import.columns) if field]
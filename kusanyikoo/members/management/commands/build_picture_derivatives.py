@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+
+from members.images import build_derivatives
+from members.models import Member
+
+
+class Command(BaseCommand):
+    help = 'Write resized WebP/JPEG copies of member pictures that do not have them yet'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--all', action='store_true', help='Rebuild the copies of every picture')
+
+    def handle(self, *args, **options):
+        queryset = Member.objects.exclude(picture='').exclude(picture__isnull=True)
+        if not options['all']:
+            queryset = queryset.filter(picture_derivatives={})
+
+        built = failed = 0
+        for member_id in queryset.values_list('id', flat=True).iterator():
+            try:
+                if build_derivatives(member_id) is not None:
+                    built += 1
+            except Exception as e:
+                failed += 1
+                self.stderr.write(f'Member {member_id}: {e}')
+        self.stdout.write(self.style.SUCCESS(f'Built picture derivatives for {built} members ({failed} failed)'))
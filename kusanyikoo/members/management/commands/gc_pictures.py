@@ -0,0 +1,30 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from members import pictures
+
+
+class Command(BaseCommand):
+    help = 'Delete member picture files that no member references any more'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--grace-hours', type=float, default=pictures.GC_GRACE.total_seconds() / 3600,
+            help='Leave files younger than this alone'
+        )
+        parser.add_argument('--recount', action='store_true', help='Recompute reference counts first')
+        parser.add_argument('--dry-run', action='store_true', help='Report what would be deleted')
+
+    def handle(self, *args, **options):
+        if options['recount']:
+            fixed = pictures.recount()
+            self.stdout.write(f'Corrected {fixed} reference counts')
+
+        released, deleted = pictures.collect_garbage(
+            grace=timedelta(hours=options['grace_hours']), dry_run=options['dry_run']
+        )
+        verb = 'Would delete' if options['dry_run'] else 'Deleted'
+        self.stdout.write(self.style.SUCCESS(
+            f'{verb} {deleted} files; {released} stored pictures no longer referenced'
+        ))
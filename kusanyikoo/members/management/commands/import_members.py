@@ -0,0 +1,64 @@
+import os
+
+from django.contrib.auth import get_user_model
+from django.core.files import File
+from django.core.management.base import BaseCommand, CommandError
+
+from members import importer
+from members.models import MemberImport
+
+
+class Command(BaseCommand):
+    help = 'Import members from a CSV or XLSX register, or resume an interrupted import'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', nargs='?', help='CSV or XLSX file to import')
+        parser.add_argument('--user', help='Username the imported members are registered under')
+        parser.add_argument('--resume', type=int, metavar='IMPORT_ID', help='Continue an interrupted or failed import')
+        parser.add_argument('--chunk-size', type=int, default=importer.CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        if options['resume']:
+            import_id = options['resume']
+            if not MemberImport.objects.filter(pk=import_id).exists():
+                raise CommandError(f'Import {import_id} does not exist')
+        else:
+            import_id = self.create_import(options['path'], options['user'])
+
+        member_import = importer.run_import(
+            import_id, resume=bool(options['resume']), chunk_size=options['chunk_size'], progress=self.report
+        )
+        if member_import is None:
+            raise CommandError(f'Import {import_id} is already completed')
+
+        if member_import.status == 'failed':
+            raise CommandError(f'Import {import_id} failed: {member_import.error} (resume with --resume {import_id})')
+        self.stdout.write(self.style.SUCCESS(
+            f'Import {import_id} completed: {member_import.rows_imported} imported, '
+            f'{member_import.rows_failed} rejected'
+        ))
+
+    def create_import(self, path, username):
+        if not path or not username:
+            raise CommandError('Give a file and --user, or --resume IMPORT_ID')
+        try:
+            user = get_user_model().objects.get(username=username)
+        except get_user_model().DoesNotExist:
+            raise CommandError(f'User {username} does not exist')
+        try:
+            file_format = importer.detect_format(path)
+        except importer.ImportFormatError as e:
+            raise CommandError(str(e))
+
+        with open(path, 'rb') as source:
+            member_import = MemberImport(created_by=user, format=file_format)
+            member_import.file.save(os.path.basename(path), File(source), save=False)
+            member_import.save()
+        self.stdout.write(f'Created import {member_import.pk}')
+        return member_import.pk
+
+    def report(self, member_import):
+        self.stdout.write(
+            f'  {member_import.rows_processed} rows read, {member_import.rows_imported} imported, '
+            f'{member_import.rows_failed} rejected'
+        )
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from members.idempotency import purge_expired
+
+
+class Command(BaseCommand):
+    help = 'Delete stored Idempotency-Key responses older than IDEMPOTENCY_KEY_TTL_HOURS'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--hours', type=int, default=None, help='Override the retention period')
+
+    def handle(self, *args, **options):
+        deleted = purge_expired(options['hours'])
+        self.stdout.write(self.style.SUCCESS(f'Deleted {deleted} idempotency keys'))
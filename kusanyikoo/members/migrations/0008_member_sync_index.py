@@ -0,0 +1,17 @@
+# Generated by Django 4.2.7 on 2026-10-17 00:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('members', '0007_member_search_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='member',
+            index=models.Index(fields=['created_by', 'updated_at', 'id'], name='member_sync_idx'),
+        ),
+    ]
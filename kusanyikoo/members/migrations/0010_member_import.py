@@ -0,0 +1,59 @@
+# Generated by Django 4.2.7 on 2026-10-17 00:51
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('members', '0009_idempotency_key'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MemberImport',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('file', models.FileField(upload_to='imports/%Y/%m/')),
+                ('format', models.CharField(choices=[('csv', 'CSV'), ('xlsx', 'Excel')], max_length=10)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('running', 'Running'), ('completed', 'Completed'), ('failed', 'Failed')], default='pending', max_length=20)),
+                ('columns', models.JSONField(blank=True, default=list)),
+                ('rows_processed', models.PositiveIntegerField(default=0)),
+                ('rows_imported', models.PositiveIntegerField(default=0)),
+                ('rows_failed', models.PositiveIntegerField(default=0)),
+                ('error', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('completed_at', models.DateTimeField(blank=True, null=True)),
+                ('created_by', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='member_imports', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='MemberImportError',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('row_number', models.PositiveIntegerField()),
+                ('errors', models.JSONField(default=dict)),
+                ('data', models.JSONField(default=dict)),
+                ('member_import', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='row_errors', to='members.memberimport')),
+            ],
+            options={
+                'ordering': ['row_number'],
+                'indexes': [models.Index(fields=['member_import', 'row_number'], name='members_mem_member__d72d9c_idx')],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='memberimport',
+            index=models.Index(fields=['created_by', 'created_at'], name='members_mem_created_a75c32_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='memberimport',
+            index=models.Index(fields=['status', 'created_at'], name='members_mem_status_f84295_idx'),
+        ),
+    ]
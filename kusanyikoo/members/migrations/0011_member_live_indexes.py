@@ -0,0 +1,37 @@
+# Generated by Django 4.2.7 on 2026-10-17 01:02
+
+from django.db import migrations, models
+
+from kusanyikoo.operations import AddIndexConcurrently
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    atomic = False
+
+    dependencies = [
+        ('members', '0010_member_import'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='member',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['-created_at', '-id'], name='member_live_recent_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='member',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['created_by', '-created_at', '-id'], name='member_live_owner_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='member',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['country', '-created_at', '-id'], name='member_live_country_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='member',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['region', '-created_at', '-id'], name='member_live_region_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='member',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['center_area', '-created_at', '-id'], name='member_live_center_idx'),
+        ),
+    ]
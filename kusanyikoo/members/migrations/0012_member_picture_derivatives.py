@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-17 01:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('members', '0011_member_live_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='member',
+            name='picture_derivatives',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
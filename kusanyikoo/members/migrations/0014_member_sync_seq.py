@@ -0,0 +1,40 @@
+# Generated by Django 4.2.7 on 2026-10-17 01:27
+
+from django.db import migrations, models
+
+
+def install_sync_triggers(apps, schema_editor):
+    from members.sync import install_sync_triggers
+    install_sync_triggers(schema_editor.connection)
+    # Number the existing rows; the triggers fill sync_seq in
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute('UPDATE members_member SET sync_seq = NULL')
+
+
+def uninstall_sync_triggers(apps, schema_editor):
+    from members.sync import uninstall_sync_triggers
+    uninstall_sync_triggers(schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('members', '0013_stored_picture'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='member',
+            name='sync_seq',
+            field=models.BigIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.RunPython(install_sync_triggers, uninstall_sync_triggers),
+        migrations.RemoveIndex(
+            model_name='member',
+            name='member_sync_idx',
+        ),
+        migrations.AddIndex(
+            model_name='member',
+            index=models.Index(fields=['created_by', 'sync_seq', 'id'], name='member_sync_seq_idx'),
+        ),
+    ]
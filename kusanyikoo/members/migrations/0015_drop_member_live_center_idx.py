@@ -0,0 +1,17 @@
+# Generated by Django 4.2.7 on 2026-10-17 01:47
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('members', '0014_member_sync_seq'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='member',
+            name='member_live_center_idx',
+        ),
+    ]
@@ -1,4 +1,5 @@
-from django.db import models
+from django.db import models, transaction
+from django.core.serializers.json import DjangoJSONEncoder
 from django.conf import settings
 from django.utils import timezone
 
@@ -44,15 +45,173 @@ class Member(models.Model):
     career = models.CharField(max_length=100, blank=True)
     attending_date = models.DateField()
     picture = models.ImageField(upload_to='member_pictures/', blank=True, null=True)
+    # {extension: {width: storage name}} of the resized copies, see members.images
+    picture_derivatives = models.JSONField(default=dict, blank=True, editable=False)
     
     # Audit fields
     created_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     is_deleted = models.BooleanField(default=False)
+    # Set by a database trigger on every write, in commit order (see members.sync)
+    sync_seq = models.BigIntegerField(null=True, blank=True, editable=False)
     
     def __str__(self):
         return f"{self.first_name} {self.last_name}"
     
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored values so post_save receivers can see what changed
+        instance._loaded_values = dict(zip(field_names, values))
+        if 'picture' in instance._loaded_values:
+            instance._stored_picture = instance._loaded_values['picture'] or ''
+        return instance
+    
+    def _picture_changed(self):
+        if self._state.adding:
+            return bool(self.picture)
+        stored = getattr(self, '_stored_picture', None)
+        return stored is not None and stored != (self.picture.name or '')
+    
+    def save(self, *args, **kwargs):
+        # Keep the row and the statistics rollup updated by post_save in one transaction
+        with transaction.atomic(using=kwargs.get('using')):
+            if self.picture and not self.picture._committed:
+                # A new upload is stored under its content hash, so an
+                # unchanged picture resolves to the name already saved
+                from .pictures import store
+                store(self.picture)
+            
+            previous_picture = getattr(self, '_stored_picture', None)
+            picture_changed = self._picture_changed()
+            if picture_changed:
+                self.picture_derivatives = {}
+                if kwargs.get('update_fields') is not None:
+                    kwargs['update_fields'] = {*kwargs['update_fields'], 'picture_derivatives'}
+            
+            super().save(*args, **kwargs)
+            if picture_changed:
+                from .images import picture_replaced
+                picture_replaced(self, previous_picture)
+        self._stored_picture = self.picture.name or ''
+    
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # Delta sync: a registrant's members in (sync_seq, id) order
+            models.Index(fields=['created_by', 'sync_seq', 'id'], name='member_sync_seq_idx'),
+            # Lists, exports and recent activity only read live members, newest
+            # first; partial indexes leave soft-deleted rows out.
+            models.Index(
+                fields=['-created_at', '-id'], condition=models.Q(is_deleted=False),
+                name='member_live_recent_idx'
+            ),
+            models.Index(
+                fields=['created_by', '-created_at', '-id'], condition=models.Q(is_deleted=False),
+                name='member_live_owner_idx'
+            ),
+            models.Index(
+                fields=['country', '-created_at', '-id'], condition=models.Q(is_deleted=False),
+                name='member_live_country_idx'
+            ),
+            models.Index(
+                fields=['region', '-created_at', '-id'], condition=models.Q(is_deleted=False),
+                name='member_live_region_idx'
+            ),
+        ]
+
+
+class IdempotencyKey(models.Model):
+    """
+    Stored outcome of a request sent with an Idempotency-Key header.
+    
+    `key_hash` is a SHA-256 of the user, endpoint and client key, so the
+    table holds fixed-size values only; `request_hash` fingerprints the
+    payload so a key reused for a different request is rejected.
+    """
+    key_hash = models.CharField(max_length=64, unique=True)
+    request_hash = models.CharField(max_length=64)
+    status_code = models.PositiveSmallIntegerField(null=True)
+    response = models.JSONField(null=True, encoder=DjangoJSONEncoder)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+    
+    def __str__(self):
+        return self.key_hash
+
+
+class StoredPicture(models.Model):
+    """
+    A content-addressed picture file and the number of members using it.
+    
+    Files whose count has been zero for a while are removed by the
+    gc_pictures command; see members.pictures.
+    """
+    name = models.CharField(max_length=100, unique=True)
+    size = models.PositiveIntegerField(default=0)
+    ref_count = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        indexes = [
+            models.Index(fields=['ref_count', 'updated_at']),
+        ]
+    
+    def __str__(self):
+        return self.name
+
+
+class MemberImport(models.Model):
+    """A spreadsheet of members being loaded in chunks; progress survives restarts."""
+    FORMAT_CHOICES = [
+        ('csv', 'CSV'),
+        ('xlsx', 'Excel'),
+    ]
+    
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('running', 'Running'),
+        ('completed', 'Completed'),
+        ('failed', 'Failed'),
+    ]
+    
+    created_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='member_imports')
+    file = models.FileField(upload_to='imports/%Y/%m/')
+    format = models.CharField(max_length=10, choices=FORMAT_CHOICES)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    columns = models.JSONField(default=list, blank=True)
+    
+    # Data rows read so far; a resumed import skips this many rows
+    rows_processed = models.PositiveIntegerField(default=0)
+    rows_imported = models.PositiveIntegerField(default=0)
+    rows_failed = models.PositiveIntegerField(default=0)
+    error = models.TextField(blank=True)
+    
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    completed_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['created_by', 'created_at']),
+            models.Index(fields=['status', 'created_at']),
+        ]
+    
+    def __str__(self):
+        return f"Import {self.pk} ({self.status})"
+
+
+class MemberImportError(models.Model):
+    """A rejected row of a MemberImport, kept for the error report."""
+    member_import = models.ForeignKey(MemberImport, on_delete=models.CASCADE, related_name='row_errors')
+    row_number = models.PositiveIntegerField()
+    errors = models.JSONField(default=dict)
+    data = models.JSONField(default=dict)
+    
+    class Meta:
+        ordering = ['row_number']
+        indexes = [
+            models.Index(fields=['member_import', 'row_number']),
+        ]
@@ -0,0 +1,6 @@
+from kusanyikoo.pagination import KeysetCursorPagination
+
+
+class MemberCursorPagination(KeysetCursorPagination):
+    """Newest registrations first; `id` breaks ties between equal timestamps."""
+    ordering = ('-created_at', '-id')
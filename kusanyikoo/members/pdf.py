@@ -0,0 +1,341 @@
+"""
+Streaming PDF table reports.
+
+Documents are laid out as fixed-size tables using the standard Helvetica
+fonts, so no font embedding or measuring library is needed. Rows are
+consumed one page at a time: as soon as a page is full its content stream is
+compressed and written out, and only the object offsets are kept until the
+cross-reference table is written at the end. Memory is bounded by one page
+rather than by the number of rows.
+
+Large querysets can also be rendered by a process pool (see `iter_pdf_parallel`):
+each worker renders a keyset range of rows and the parent stitches the page
+objects together in order.
+"""
+import multiprocessing
+import pickle
+import zlib
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+import django
+
+from kusanyikoo.pagination import keyset_filter
+from .exports import streaming_response
+
+CONTENT_TYPE = 'application/pdf'
+
+A4 = (595, 842)
+MARGIN = 36
+TITLE_SIZE = 14
+SUBTITLE_SIZE = 8
+FONT_SIZE = 8
+ROW_HEIGHT = 13
+CELL_PADDING = 3
+FOOTER_HEIGHT = 20
+
+# Object numbers fixed by the writer; page objects are numbered from FIRST_PAGE_OBJECT.
+CATALOG_OBJECT = 1
+PAGES_OBJECT = 2
+FONT_OBJECT = 3
+BOLD_FONT_OBJECT = 4
+FIRST_PAGE_OBJECT = 5
+
+# Helvetica advance widths (1/1000 em) for WinAnsi characters 32-126.
+_HELVETICA_WIDTHS = [
+    278, 278, 355, 556, 556, 889, 667, 191, 333, 333, 389, 584, 278, 333, 278, 278,
+    556, 556, 556, 556, 556, 556, 556, 556, 556, 556, 278, 278, 584, 584, 584, 556,
+    1015, 667, 667, 722, 722, 667, 611, 778, 722, 278, 500, 667, 556, 833, 722, 778,
+    667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611, 278, 278, 278, 469, 556,
+    333, 556, 556, 500, 556, 556, 278, 556, 556, 222, 222, 500, 222, 833, 556, 556,
+    556, 556, 333, 500, 278, 556, 500, 722, 500, 500, 500, 334, 260, 334, 584,
+]
+_DEFAULT_WIDTH = 556
+_CHAR_WIDTHS = {chr(code): width for code, width in enumerate(_HELVETICA_WIDTHS, 32)}
+
+
+def text_width(text, size):
+    """Width of `text` in points when set in Helvetica at `size`."""
+    get = _CHAR_WIDTHS.get
+    return sum(get(char, _DEFAULT_WIDTH) for char in text) * size / 1000
+
+
+def fit_text(text, width, size):
+    """Truncate `text` with an ellipsis so it fits in `width` points."""
+    if text_width(text, size) <= width:
+        return text
+    ellipsis = '...'
+    available = width - text_width(ellipsis, size)
+    total = 0
+    for index, char in enumerate(text):
+        total += text_width(char, size)
+        if total > available:
+            return text[:index] + ellipsis
+    return text
+
+
+def _pdf_string(text):
+    encoded = text.encode('cp1252', errors='replace')
+    encoded = encoded.replace(b'\\', b'\\\\').replace(b'(', b'\\(').replace(b')', b'\\)')
+    return b'(' + encoded.replace(b'\r', b' ').replace(b'\n', b' ') + b')'
+
+
+class Column:
+    def __init__(self, title, width, align='left'):
+        self.title = title
+        self.width = width
+        self.align = align
+
+
+class Section:
+    """A row printed in bold across the full table width (report headings)."""
+
+    def __init__(self, text):
+        self.text = text
+
+
+class TableDocument:
+    """
+    Page layout for a table report: a title block, a header row repeated on
+    every page and a fixed number of equally tall body rows per page.
+    """
+
+    def __init__(self, title, columns, subtitle=None, landscape=True, show_header=True):
+        self.title = title
+        self.subtitle = subtitle
+        self.columns = columns
+        self.show_header = show_header
+        self.width, self.height = (A4[1], A4[0]) if landscape else A4
+
+        self.table_top = self.height - MARGIN - TITLE_SIZE - (SUBTITLE_SIZE + 6 if subtitle else 0) - 10
+        body_top = self.table_top - (ROW_HEIGHT if show_header else 0)
+        self.rows_per_page = int((body_top - MARGIN - FOOTER_HEIGHT) // ROW_HEIGHT)
+
+    def format_value(self, value):
+        if value is None:
+            return ''
+        if isinstance(value, datetime):
+            return value.strftime('%Y-%m-%d %H:%M')
+        return str(value)
+
+    def _text(self, font, size, x, y, text):
+        return b'BT /%s %d Tf 1 0 0 1 %.2f %.2f Tm %s Tj ET\n' % (
+            font.encode('ascii'), size, x, y, _pdf_string(text)
+        )
+
+    def _cell(self, font, column, x, y, value):
+        inner = column.width - 2 * CELL_PADDING
+        text = fit_text(self.format_value(value), inner, FONT_SIZE)
+        if not text:
+            return b''
+        if column.align == 'right':
+            x += column.width - CELL_PADDING - text_width(text, FONT_SIZE)
+        else:
+            x += CELL_PADDING
+        return self._text(font, FONT_SIZE, x, y, text)
+
+    def render_page(self, rows, page_number):
+        """Return the uncompressed content stream for one page of `rows`."""
+        left = MARGIN
+        right = left + sum(column.width for column in self.columns)
+        parts = [self._text('F2', TITLE_SIZE, left, self.height - MARGIN - TITLE_SIZE, self.title)]
+        if self.subtitle:
+            y = self.height - MARGIN - TITLE_SIZE - SUBTITLE_SIZE - 6
+            parts.append(self._text('F1', SUBTITLE_SIZE, left, y, self.subtitle))
+
+        y = self.table_top
+        if self.show_header:
+            parts.append(b'0.9 g %.2f %.2f %.2f %d re f 0 g\n' % (left, y - ROW_HEIGHT, right - left, ROW_HEIGHT))
+            x = left
+            for column in self.columns:
+                parts.append(self._cell('F2', column, x, y - ROW_HEIGHT + 4, column.title))
+                x += column.width
+            y -= ROW_HEIGHT
+
+        for row in rows:
+            baseline = y - ROW_HEIGHT + 4
+            if isinstance(row, Section):
+                parts.append(self._text('F2', FONT_SIZE + 1, left + CELL_PADDING, baseline,
+                                        fit_text(row.text, right - left, FONT_SIZE + 1)))
+            elif row:
+                x = left
+                for column, value in zip(self.columns, row):
+                    parts.append(self._cell('F1', column, x, baseline, value))
+                    x += column.width
+                parts.append(b'0.85 G 0.3 w %.2f %.2f m %.2f %.2f l S 0 G\n' % (
+                    left, y - ROW_HEIGHT, right, y - ROW_HEIGHT
+                ))
+            y -= ROW_HEIGHT
+
+        parts.append(self._text('F1', SUBTITLE_SIZE, right - 40, MARGIN, f'Page {page_number}'))
+        return b''.join(parts)
+
+    def render_pages(self, rows, first_page_number=1):
+        """Yield the compressed content stream of each page, in order."""
+        page = []
+        number = first_page_number
+        for row in rows:
+            page.append(row)
+            if len(page) == self.rows_per_page:
+                yield zlib.compress(self.render_page(page, number))
+                page = []
+                number += 1
+        if page or number == first_page_number:
+            yield zlib.compress(self.render_page(page, number))
+
+
+class PdfWriter:
+    """Serialises PDF objects to bytes while tracking their byte offsets."""
+
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        self.offsets = {}
+        self.position = 0
+        self.page_objects = []
+        self.next_object = FIRST_PAGE_OBJECT
+
+    def _emit(self, data):
+        self.position += len(data)
+        return data
+
+    def _object(self, number, body):
+        self.offsets[number] = self.position
+        return self._emit(b'%d 0 obj\n' % number + body + b'\nendobj\n')
+
+    def start(self):
+        data = self._emit(b'%PDF-1.4\n%\xe2\xe3\xcf\xd3\n')
+        data += self._object(CATALOG_OBJECT, b'<< /Type /Catalog /Pages %d 0 R >>' % PAGES_OBJECT)
+        for number, font in ((FONT_OBJECT, b'Helvetica'), (BOLD_FONT_OBJECT, b'Helvetica-Bold')):
+            data += self._object(
+                number, b'<< /Type /Font /Subtype /Type1 /BaseFont /%s /Encoding /WinAnsiEncoding >>' % font
+            )
+        return data
+
+    def page(self, compressed_content):
+        content_number = self.next_object
+        page_number = content_number + 1
+        self.next_object += 2
+        self.page_objects.append(page_number)
+
+        data = self._object(
+            content_number,
+            b'<< /Length %d /Filter /FlateDecode >>\nstream\n' % len(compressed_content)
+            + compressed_content + b'\nendstream'
+        )
+        data += self._object(page_number, (
+            b'<< /Type /Page /Parent %d 0 R /MediaBox [0 0 %d %d] '
+            b'/Resources << /Font << /F1 %d 0 R /F2 %d 0 R >> >> /Contents %d 0 R >>'
+        ) % (PAGES_OBJECT, self.width, self.height, FONT_OBJECT, BOLD_FONT_OBJECT, content_number))
+        return data
+
+    def finish(self):
+        kids = b' '.join(b'%d 0 R' % number for number in self.page_objects)
+        data = self._object(
+            PAGES_OBJECT, b'<< /Type /Pages /Kids [%s] /Count %d >>' % (kids, len(self.page_objects))
+        )
+        xref_offset = self.position
+        size = self.next_object
+        lines = [b'xref\n0 %d\n' % size, b'0000000000 65535 f \n']
+        lines += [b'%010d 00000 n \n' % self.offsets[number] for number in range(1, size)]
+        lines.append(b'trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n' % (
+            size, CATALOG_OBJECT, xref_offset
+        ))
+        return data + b''.join(lines)
+
+
+def iter_pdf(document, rows):
+    """Yield the bytes of a PDF rendering `rows` with `document`, page by page."""
+    writer = PdfWriter(document.width, document.height)
+    yield writer.start()
+    for content in document.render_pages(rows):
+        yield writer.page(content)
+    yield writer.finish()
+
+
+def _setup_worker():
+    # Spawned workers start from a fresh interpreter
+    django.setup()
+
+
+def _render_range(document, model, query, row_source, ordering, after, through, first_page_number):
+    """Process pool task: render the rows of a pickled query after `after` up to and including `through`."""
+    queryset = model._default_manager.all()
+    queryset.query = pickle.loads(query)
+    if after is not None:
+        queryset = queryset.filter(keyset_filter(ordering, after))
+    if through is not None:
+        queryset = queryset.exclude(keyset_filter(ordering, through))
+    return list(document.render_pages(row_source(queryset), first_page_number))
+
+
+def _boundaries(queryset, ordering, rows_per_task):
+    """
+    The keyset position of the last row of each full range of
+    `rows_per_task` rows that has rows after it.
+    """
+    fields = [field.lstrip('-') for field in ordering]
+    boundaries = []
+    while True:
+        window = queryset
+        if boundaries:
+            window = window.filter(keyset_filter(ordering, boundaries[-1]))
+        rows = list(window.values_list(*fields)[rows_per_task - 1:rows_per_task + 1])
+        if len(rows) < 2:
+            return boundaries
+        boundaries.append(rows[0])
+
+
+def iter_pdf_parallel(document, queryset, row_source, workers, ordering=('-created_at', '-id'), pages_per_task=25):
+    """
+    Render `queryset` across a pool of `workers` processes.
+
+    `row_source` must be a module-level function (it is pickled by reference)
+    that turns a queryset into row sequences, and `ordering` must end in a
+    unique field. The parent splits the queryset into keyset ranges of
+    `pages_per_task` pages up front, so every row falls in exactly one range
+    even if members are written while the workers run; a range that changed
+    meanwhile may end on a short page. Each worker renders one range at a
+    time and the parent writes the finished pages in order, keeping at most
+    two ranges per worker in flight so memory stays bounded.
+
+    Workers are spawned rather than forked, so they share nothing (database
+    sockets, gunicorn's state) with the process serving the request.
+    """
+    queryset = queryset.order_by(*ordering)
+    boundaries = _boundaries(queryset, ordering, document.rows_per_page * pages_per_task)
+    if not boundaries:
+        yield from iter_pdf(document, row_source(queryset))
+        return
+    ranges = list(zip([None, *boundaries], [*boundaries, None]))
+    query = pickle.dumps(queryset.query)
+
+    writer = PdfWriter(document.width, document.height)
+    yield writer.start()
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context, initializer=_setup_worker) as executor:
+        pending = deque()
+        tasks = iter(enumerate(ranges))
+        for _ in range(workers * 2):
+            _submit_next(executor, pending, tasks, document, queryset.model, query, row_source, ordering, pages_per_task)
+        while pending:
+            pages = pending.popleft().result()
+            _submit_next(executor, pending, tasks, document, queryset.model, query, row_source, ordering, pages_per_task)
+            for content in pages:
+                yield writer.page(content)
+    yield writer.finish()
+
+
+def _submit_next(executor, pending, tasks, document, model, query, row_source, ordering, pages_per_task):
+    task = next(tasks, None)
+    if task is None:
+        return
+    index, (after, through) = task
+    pending.append(executor.submit(
+        _render_range, document, model, query, row_source, ordering, after, through, index * pages_per_task + 1
+    ))
+
+
+def pdf_response(chunks, filename):
+    return streaming_response(chunks, CONTENT_TYPE, filename)
@@ -0,0 +1,195 @@
+"""
+Content-addressed storage for member pictures.
+
+A picture is stored once under the SHA-256 of its bytes,
+member_pictures/3f/3fa9...e1.jpg, however many members use it, and saving a
+picture that is already stored writes nothing. StoredPicture counts the
+members referencing each file; `collect_garbage` removes files nobody
+references, along with their resized copies and files left behind by uploads
+that never committed. Since a name always refers to the same bytes, pictures
+are served with the hash as ETag and cached as immutable.
+"""
+import hashlib
+import os
+import re
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Count, F
+from django.utils import timezone
+
+from .models import Member, StoredPicture
+
+PICTURE_DIR = 'member_pictures'
+
+# A stored picture or one of its derivatives (abc..._320w.webp)
+PATH_PATTERN = rf'{PICTURE_DIR}/[0-9a-f]{{2}}/[0-9a-f]{{64}}(?:_\d+w)?\.(?:jpg|jpeg|png|webp)'
+
+_CONTENT = re.compile(r'/([0-9a-f]{64})(_\d+w)?\.[a-z]+$')
+
+# Files younger than this are left alone: they may belong to an upload or
+# a derivative build whose transaction has not committed yet.
+GC_GRACE = timedelta(hours=1)
+
+
+def content_name(digest, extension):
+    return f'{PICTURE_DIR}/{digest[:2]}/{digest}{extension}'
+
+
+def store(picture):
+    """
+    Point the uncommitted FieldFile `picture` at the stored copy of its
+    content, writing the file first if no member has used it yet. Call
+    inside the transaction that saves the member.
+    """
+    hasher = hashlib.sha256()
+    for chunk in picture.file.chunks():
+        hasher.update(chunk)
+    extension = os.path.splitext(picture.name or '')[1].lower() or '.jpg'
+    name = content_name(hasher.hexdigest(), extension)
+
+    # Touching the row locks it until this upload commits, which keeps
+    # collect_garbage from releasing a picture that is being reused; a
+    # collection already holding the lock finishes first.
+    if not StoredPicture.objects.filter(name=name).update(updated_at=timezone.now()):
+        StoredPicture.objects.get_or_create(name=name, defaults={'size': picture.file.size})
+
+    # Checked after the lock, so a file collected just before is written again
+    storage = picture.storage
+    if not storage.exists(name):
+        saved = storage.save(name, picture.file)
+        if saved != name:
+            # Another request stored the same picture in the meantime
+            storage.delete(saved)
+
+    picture.name = name
+    picture._committed = True
+    return name
+
+
+def acquire(name):
+    if name:
+        StoredPicture.objects.filter(name=name)\
+            .update(ref_count=F('ref_count') + 1, updated_at=timezone.now())
+
+
+def release(name):
+    if name:
+        StoredPicture.objects.filter(name=name, ref_count__gt=0)\
+            .update(ref_count=F('ref_count') - 1, updated_at=timezone.now())
+
+
+def recount():
+    """Reset every reference count from the member table; returns how many were wrong."""
+    counts = dict(
+        Member.objects.exclude(picture='').exclude(picture__isnull=True)
+        .values_list('picture').annotate(count=Count('id')).order_by()
+    )
+    fixed = 0
+    for stored in StoredPicture.objects.only('name', 'ref_count').iterator():
+        count = counts.get(stored.name, 0)
+        if stored.ref_count != count:
+            StoredPicture.objects.filter(pk=stored.pk).update(ref_count=count, updated_at=timezone.now())
+            fixed += 1
+    return fixed
+
+
+def _walk(storage, directory):
+    directories, files = storage.listdir(directory)
+    for name in files:
+        yield f'{directory}/{name}'
+    for child in directories:
+        yield from _walk(storage, f'{directory}/{child}')
+
+
+def _files_of(storage, name):
+    """The stored picture `name` and its derivatives."""
+    directory, base = name.rsplit('/', 1)
+    stem = os.path.splitext(base)[0]
+    try:
+        files = storage.listdir(directory)[1]
+    except FileNotFoundError:
+        return []
+    return [f'{directory}/{file}' for file in files if file == base or file.startswith(f'{stem}_')]
+
+
+def _referenced_names():
+    names = set(StoredPicture.objects.values_list('name', flat=True))
+    rows = Member.objects.exclude(picture='').exclude(picture__isnull=True)\
+        .values_list('picture', 'picture_derivatives')
+    for picture, derivatives in rows.iterator(chunk_size=2000):
+        names.add(picture)
+        for variants in (derivatives or {}).values():
+            names.update(variants.values())
+    return names
+
+
+def _delete_unused(storage, name, cutoff, dry_run):
+    """
+    Delete the files of stored picture `name` if no member uses it, holding
+    its StoredPicture row lock so a concurrent store() of the same content
+    waits (a row is inserted to lock if there is none). Returns
+    (released a counted picture, files deleted).
+    """
+    with transaction.atomic():
+        stored, created = StoredPicture.objects.select_for_update()\
+            .get_or_create(name=name, defaults={'size': 0})
+        in_use = not created and (stored.ref_count > 0 or stored.updated_at >= cutoff)
+        if in_use or Member.objects.filter(picture=name).exists():
+            # Counts that drifted are left for recount() to repair
+            transaction.set_rollback(created)
+            return False, 0
+        paths = _files_of(storage, name)
+        if dry_run:
+            transaction.set_rollback(True)
+        else:
+            for path in paths:
+                storage.delete(path)
+            stored.delete()
+        return not created, len(paths)
+
+
+def collect_garbage(grace=GC_GRACE, dry_run=False):
+    """
+    Delete stored pictures no member has referenced for `grace`, with their
+    resized copies, then files under member_pictures/ older than `grace`
+    that nothing refers to (abandoned uploads and stray derivatives). Each
+    picture is re-checked under its row lock before its files go.
+    Returns (stored pictures released, files deleted).
+    """
+    storage = Member._meta.get_field('picture').storage
+    cutoff = timezone.now() - grace
+    candidates = set(
+        StoredPicture.objects.filter(ref_count=0, updated_at__lt=cutoff).values_list('name', flat=True)
+    )
+
+    referenced = _referenced_names() - candidates
+    try:
+        paths = list(_walk(storage, PICTURE_DIR))
+    except FileNotFoundError:
+        paths = []
+    # Unreferenced files are grouped by the picture they belong to; a
+    # picture with any referenced or recent file is left alone.
+    orphans, kept = {}, set()
+    for path in paths:
+        match = _CONTENT.search(path)
+        if match is None:
+            continue
+        digest = match.group(1)
+        if path in referenced or storage.get_modified_time(path) >= cutoff:
+            kept.add(digest)
+        elif not match.group(2):
+            orphans[digest] = path
+        else:
+            orphans.setdefault(digest, None)
+    for digest, path in orphans.items():
+        if digest not in kept:
+            # Uploads are normalized to JPEG, so a lone derivative's picture is a .jpg
+            candidates.add(path or content_name(digest, '.jpg'))
+
+    released = deleted = 0
+    for name in sorted(candidates):
+        was_stored, count = _delete_unused(storage, name, cutoff, dry_run)
+        released += was_stored
+        deleted += count
+    return released, deleted
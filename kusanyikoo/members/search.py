@@ -0,0 +1,182 @@
+"""
+Indexed member search.
+
+PostgreSQL gets a pg_trgm GIN index over a lower-cased document built from
+the searchable columns, so substring and fuzzy matches are answered from the
+index instead of five ILIKE scans. SQLite gets an FTS5 shadow table with the
+trigram tokenizer, kept in sync with members_member through triggers. Any
+other backend (or SQLite without FTS5) falls back to the old icontains query.
+"""
+from django.db import connections
+from django.db.models import BooleanField, Q
+from django.db.models.expressions import RawSQL
+
+SEARCH_FIELDS = ['first_name', 'middle_name', 'last_name', 'mobile_no', 'email']
+
+MEMBER_TABLE = 'members_member'
+FTS_TABLE = 'members_member_search'
+TRGM_INDEX = 'members_member_search_trgm'
+
+# Trigram indexes cannot answer patterns shorter than one trigram.
+MIN_INDEXED_TERM_LENGTH = 3
+
+
+def _document_sql(table=None):
+    prefix = f'"{table}".' if table else ''
+    columns = " || ' ' || ".join(f'{prefix}"{field}"' for field in SEARCH_FIELDS)
+    return f'lower({columns})'
+
+
+_installed = {}
+
+
+def _sqlite_has_fts(connection):
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = %s", [FTS_TABLE]
+        )
+        return cursor.fetchone() is not None
+
+
+def search_index_available(using='default'):
+    """Return True when the backend-specific search index can be queried."""
+    if using not in _installed:
+        connection = connections[using]
+        if connection.vendor == 'postgresql':
+            _installed[using] = True
+        elif connection.vendor == 'sqlite':
+            _installed[using] = _sqlite_has_fts(connection)
+        else:
+            _installed[using] = False
+    return _installed[using]
+
+
+def install_search_index(connection):
+    """Create the search index for `connection` if it does not exist yet."""
+    _installed.pop(connection.alias, None)
+    if connection.vendor == 'postgresql':
+        _install_postgresql(connection)
+    elif connection.vendor == 'sqlite':
+        _install_sqlite(connection)
+
+
+def uninstall_search_index(connection):
+    _installed.pop(connection.alias, None)
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            cursor.execute(f'DROP INDEX IF EXISTS {TRGM_INDEX}')
+        elif connection.vendor == 'sqlite':
+            for suffix in ('ai', 'ad', 'au'):
+                cursor.execute(f'DROP TRIGGER IF EXISTS {FTS_TABLE}_{suffix}')
+            cursor.execute(f'DROP TABLE IF EXISTS {FTS_TABLE}')
+
+
+def _install_postgresql(connection):
+    with connection.cursor() as cursor:
+        cursor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+        cursor.execute(
+            f'CREATE INDEX IF NOT EXISTS {TRGM_INDEX} ON {MEMBER_TABLE} '
+            f'USING gin (({_document_sql()}) gin_trgm_ops)'
+        )
+
+
+def _install_sqlite(connection):
+    columns = ', '.join(SEARCH_FIELDS)
+    new_values = ', '.join(f'new.{field}' for field in SEARCH_FIELDS)
+    old_values = ', '.join(f'old.{field}' for field in SEARCH_FIELDS)
+    delete_old = (
+        f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {columns}) "
+        f"VALUES ('delete', old.id, {old_values});"
+    )
+    insert_new = f"INSERT INTO {FTS_TABLE}(rowid, {columns}) VALUES (new.id, {new_values});"
+
+    with connection.cursor() as cursor:
+        try:
+            cursor.execute(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+                f"{columns}, content='{MEMBER_TABLE}', content_rowid='id', tokenize='trigram')"
+            )
+        except Exception as e:
+            # SQLite built without FTS5 or older than 3.34: keep the icontains fallback.
+            print(f"Member search index unavailable: {e}")
+            return
+
+        # Rebuilding members_member (e.g. a migration that remakes the table)
+        # drops its triggers, so recreate them and resync when any is missing.
+        cursor.execute(
+            "SELECT COUNT(*) FROM sqlite_master WHERE type = 'trigger' AND name IN (%s, %s, %s)",
+            [f'{FTS_TABLE}_ai', f'{FTS_TABLE}_ad', f'{FTS_TABLE}_au'],
+        )
+        if cursor.fetchone()[0] == 3:
+            return
+
+        cursor.execute(
+            f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON {MEMBER_TABLE} "
+            f"BEGIN {insert_new} END"
+        )
+        cursor.execute(
+            f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON {MEMBER_TABLE} "
+            f"BEGIN {delete_old} END"
+        )
+        cursor.execute(
+            f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF {columns} ON {MEMBER_TABLE} "
+            f"BEGIN {delete_old} {insert_new} END"
+        )
+        cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+
+
+def _escape_like(term):
+    return term.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+
+def _fallback_filter(queryset, term):
+    query = Q()
+    for field in SEARCH_FIELDS:
+        query |= Q(**{f'{field}__icontains': term})
+    return queryset.filter(query)
+
+
+def search_members(queryset, term, ranked=False):
+    """
+    Restrict a Member queryset to rows matching `term`.
+
+    With `ranked=True` the result is ordered by relevance, best match first;
+    otherwise the queryset keeps whatever ordering the caller applies.
+    """
+    term = term.strip()
+    if not term:
+        return queryset
+
+    using = queryset.db
+    vendor = connections[using].vendor
+    if len(term) < MIN_INDEXED_TERM_LENGTH or not search_index_available(using):
+        return _fallback_filter(queryset, term)
+
+    table = queryset.model._meta.db_table
+    if vendor == 'postgresql':
+        document = _document_sql(table)
+        matches = RawSQL(
+            f'({document} LIKE %s OR %s <%% {document})',
+            (f'%{_escape_like(term.lower())}%', term.lower()),
+            output_field=BooleanField(),
+        )
+        queryset = queryset.filter(Q(matches))
+        if ranked:
+            queryset = queryset.annotate(
+                search_rank=RawSQL(f'word_similarity(%s, {document})', (term.lower(),))
+            ).order_by('-search_rank', '-created_at')
+        return queryset
+
+    # FTS5 phrase query: quoting makes the trigram tokenizer do substring matching.
+    match = '"' + term.replace('"', '""') + '"'
+    queryset = queryset.filter(
+        id__in=RawSQL(f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s', (match,))
+    )
+    if ranked:
+        queryset = queryset.annotate(
+            search_rank=RawSQL(
+                f'SELECT rank FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s AND rowid = "{table}"."id"',
+                (match,),
+            )
+        ).order_by('search_rank', '-created_at')
+    return queryset
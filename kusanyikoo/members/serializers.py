@@ -1,5 +1,6 @@
 from rest_framework import serializers
-from .models import Member
+from .models import Member, MemberImport
+from .images import normalize_picture, srcset
 from django.conf import settings
 
 
@@ -11,25 +12,56 @@ class MemberSerializer(serializers.ModelSerializer):
         fields = '__all__'
         read_only_fields = ['created_by', 'created_at', 'updated_at', 'is_deleted']
     
+    def validate_picture(self, value):
+        """Store a downscaled, re-encoded copy instead of the camera original"""
+        if not value:
+            return value
+        max_size = getattr(settings, 'PICTURE_MAX_UPLOAD_SIZE', 20 * 1024 * 1024)
+        if value.size > max_size:
+            raise serializers.ValidationError(f'Pictures must be smaller than {max_size // (1024 * 1024)} MB.')
+        try:
+            return normalize_picture(value)
+        except ValueError as e:
+            raise serializers.ValidationError(str(e))
+    
     def to_representation(self, instance):
         """Customize the output representation to return full picture URL"""
         data = super().to_representation(instance)
         
-        if instance.picture:
-            request = self.context.get('request')
+        request = self.context.get('request')
+        
+        def media_url(name):
             if request:
-                full_url = request.build_absolute_uri(instance.picture.url)
-                data['picture'] = full_url
-            else:
-                # Fallback for when request context is not available
-                fallback_url = f"{settings.MEDIA_URL}{instance.picture}"
-                data['picture'] = fallback_url
+                return request.build_absolute_uri(instance.picture.storage.url(name))
+            # Fallback for when request context is not available
+            return f"{settings.MEDIA_URL}{name}"
+        
+        if instance.picture:
+            data['picture'] = media_url(instance.picture.name)
         else:
             data['picture'] = None
         
+        # Resized copies for <img srcset>, {"webp": "... 96w, ... 320w", "jpeg": ...};
+        # null until the background worker has produced them
+        derivatives = data.pop('picture_derivatives', None)
+        data.pop('sync_seq', None)
+        data['picture_srcset'] = srcset(derivatives, media_url) if instance.picture and derivatives else None
+        
         return data
     
     def create(self, validated_data):
         validated_data['created_by'] = self.context['request'].user
         member = super().create(validated_data)
         return member
+
+
+class MemberImportSerializer(serializers.ModelSerializer):
+    created_by = serializers.StringRelatedField(read_only=True)
+    
+    class Meta:
+        model = MemberImport
+        fields = [
+            'id', 'format', 'status', 'columns', 'rows_processed', 'rows_imported',
+            'rows_failed', 'error', 'created_by', 'created_at', 'started_at', 'completed_at'
+        ]
+        read_only_fields = fields
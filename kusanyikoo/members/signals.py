@@ -0,0 +1,25 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import Signal, receiver
+from .models import Member
+from .cache import bump_data_version
+from . import pictures
+
+# Sent with `members` (saved instances) after a bulk insert, which skips post_save.
+members_bulk_created = Signal()
+
+
+@receiver(post_save, sender=Member)
+def member_saved(sender, instance, **kwargs):
+    bump_data_version()
+
+
+@receiver(post_delete, sender=Member)
+def member_deleted(sender, instance, **kwargs):
+    bump_data_version()
+    if instance.picture:
+        pictures.release(instance.picture.name)
+
+
+@receiver(members_bulk_created)
+def members_created_in_bulk(sender, members, **kwargs):
+    bump_data_version()
@@ -0,0 +1,152 @@
+"""
+Delta sync for registrant devices.
+
+A device keeps the opaque cursor returned by the last sync and sends it back
+as `?since=`; the response holds the members changed since, in
+(sync_seq, id) order, with soft-deleted rows reduced to tombstones. The scan
+is answered by the (created_by, sync_seq, id) index.
+
+`updated_at` is set before a row commits, so a cursor on it skips rows whose
+transaction commits after a later one has been synced. `sync_seq` is set by
+a database trigger on every insert and update instead:
+
+* PostgreSQL stores the writing transaction's id. A sync starts by taking
+  the xmin of the current snapshot: every transaction below it has finished,
+  so every row a device has not seen yet carries a sync_seq at or above it.
+  The next sync re-reads from that watermark; rows sent twice are simply
+  applied again on the device.
+* SQLite has one writer at a time and the trigger numbers rows from the
+  committed maximum, so sync_seq already follows commit order and the
+  watermark is the visible maximum plus one.
+"""
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+
+from django.db import connections
+
+from kusanyikoo.pagination import keyset_filter
+from .models import Member
+
+SYNC_ORDERING = ('sync_seq', 'id')
+DEFAULT_LIMIT = 500
+MAX_LIMIT = 1000
+
+MEMBER_TABLE = 'members_member'
+TRIGGER = 'members_member_sync_seq'
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def install_sync_triggers(connection):
+    """Create the triggers that maintain members_member.sync_seq if they do not exist yet."""
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            cursor.execute(
+                f'CREATE OR REPLACE FUNCTION {TRIGGER}() RETURNS trigger AS $$ '
+                f'BEGIN NEW.sync_seq := txid_current(); RETURN NEW; END $$ LANGUAGE plpgsql'
+            )
+            cursor.execute(f'DROP TRIGGER IF EXISTS {TRIGGER} ON {MEMBER_TABLE}')
+            cursor.execute(
+                f'CREATE TRIGGER {TRIGGER} BEFORE INSERT OR UPDATE ON {MEMBER_TABLE} '
+                f'FOR EACH ROW EXECUTE PROCEDURE {TRIGGER}()'
+            )
+        elif connection.vendor == 'sqlite':
+            # Answers the max() below from the index
+            cursor.execute(f'CREATE INDEX IF NOT EXISTS {TRIGGER}_idx ON {MEMBER_TABLE} (sync_seq)')
+            renumber = (
+                f'UPDATE {MEMBER_TABLE} SET sync_seq = '
+                f'(SELECT coalesce(max(sync_seq), 0) + 1 FROM {MEMBER_TABLE}) WHERE id = new.id;'
+            )
+            for event, suffix in (('INSERT', 'ai'), ('UPDATE', 'au')):
+                cursor.execute(
+                    f'CREATE TRIGGER IF NOT EXISTS {TRIGGER}_{suffix} AFTER {event} ON {MEMBER_TABLE} '
+                    f'BEGIN {renumber} END'
+                )
+
+
+def uninstall_sync_triggers(connection):
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            cursor.execute(f'DROP TRIGGER IF EXISTS {TRIGGER} ON {MEMBER_TABLE}')
+            cursor.execute(f'DROP FUNCTION IF EXISTS {TRIGGER}()')
+        elif connection.vendor == 'sqlite':
+            for suffix in ('ai', 'au'):
+                cursor.execute(f'DROP TRIGGER IF EXISTS {TRIGGER}_{suffix}')
+            cursor.execute(f'DROP INDEX IF EXISTS {TRIGGER}_idx')
+
+
+def current_watermark(using='default'):
+    """A sync_seq that every member change not yet visible will be at or above."""
+    connection = connections[using]
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            cursor.execute('SELECT txid_snapshot_xmin(txid_current_snapshot())')
+        else:
+            cursor.execute(f'SELECT coalesce(max(sync_seq), 0) + 1 FROM {MEMBER_TABLE}')
+        return cursor.fetchone()[0]
+
+
+def encode_cursor(watermark, next_watermark=None, position=None):
+    payload = {'w': watermark}
+    if next_watermark is not None:
+        payload['n'] = next_watermark
+        payload['p'] = position
+    return urlsafe_b64encode(json.dumps(payload, separators=(',', ':')).encode('ascii')).decode('ascii')
+
+
+def decode_cursor(value):
+    """
+    Return (watermark, next watermark, position). Cursors issued before
+    sync_seq existed decode to a full resync, deleted members included.
+    """
+    try:
+        payload = json.loads(urlsafe_b64decode(value.encode('ascii')))
+        if 'u' in payload:
+            return 0, None, None
+        watermark = payload['w']
+        watermark = None if watermark is None else int(watermark)
+        if 'n' not in payload:
+            return watermark, None, None
+        position = [int(item) for item in payload['p']]
+        if len(position) != len(SYNC_ORDERING):
+            raise ValueError(position)
+        return watermark, int(payload['n']), position
+    except (TypeError, ValueError, KeyError, AttributeError):
+        raise InvalidCursor(value)
+
+
+def changes(user, since=None, limit=DEFAULT_LIMIT):
+    """
+    Return (members, deleted_ids, cursor, has_more) for `user`'s members
+    changed after the `since` cursor.
+
+    A first sync (no cursor) skips members that are already deleted, since
+    the device has never seen them. While `has_more` is true the cursor
+    carries the watermark taken when this round of pages began; the last
+    page's cursor starts the next round from it.
+    """
+    watermark, next_watermark, position = decode_cursor(since) if since else (None, None, None)
+    if next_watermark is None:
+        next_watermark = current_watermark()
+
+    queryset = Member.objects.filter(created_by=user)
+    if watermark is None:
+        queryset = queryset.filter(is_deleted=False)
+    else:
+        queryset = queryset.filter(sync_seq__gte=watermark)
+    if position is not None:
+        queryset = queryset.filter(keyset_filter(SYNC_ORDERING, position))
+
+    rows = list(queryset.select_related('created_by').order_by(*SYNC_ORDERING)[:limit + 1])
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    members = [member for member in rows if not member.is_deleted]
+    deleted = [member.id for member in rows if member.is_deleted]
+    if has_more:
+        cursor = encode_cursor(watermark, next_watermark, [rows[-1].sync_seq, rows[-1].id])
+    else:
+        cursor = encode_cursor(next_watermark)
+    return members, deleted, cursor, has_more
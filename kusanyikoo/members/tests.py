@@ -1,3 +1,180 @@
+import json
+import re
+from base64 import urlsafe_b64encode
+from datetime import date
+
+from django.core.cache import cache
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from users.models import User
+from .models import Member
+
+
+class MemberIndexUsageTests(TestCase):
+    """The hot member query shapes must be answered from an index, not a table scan."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(username='index-admin', password='x', role='admin')
+        cls.registrant = User.objects.create_user(username='index-registrant', password='x', role='registrant')
+        Member.objects.bulk_create([
+            Member(
+                first_name=f'Member{i}', last_name='Test', gender='male' if i % 2 else 'female',
+                age=30, marital_status='single', country='Tanzania', region='dar_es_salaam',
+                center_area='ilala', zone='A', cell='1', mobile_no=f'0712{i:06d}', origin='invited',
+                residence='Town', attending_date=date(2024, 1, 1), is_deleted=i % 10 == 0,
+                created_by=cls.registrant if i % 3 else cls.admin,
+            )
+            for i in range(200)
+        ])
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+
+    def explain(self, sql):
+        with connection.cursor() as cursor:
+            if connection.vendor == 'postgresql':
+                # The test tables are tiny; make the planner show whether an index applies
+                cursor.execute('SET LOCAL enable_seqscan = off')
+                cursor.execute(f'EXPLAIN {sql}')
+                return [row[0] for row in cursor.fetchall()]
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+            return [row[-1] for row in cursor.fetchall()]
+
+    def assertMemberQueriesUseIndexes(self, user, request, index=None):
+        self.client.force_authenticate(user)
+        with CaptureQueriesContext(connection) as queries:
+            response = request()
+            self.assertLess(response.status_code, 300)
+            if response.streaming:
+                b''.join(response.streaming_content)
+
+        member_queries = [
+            query['sql'] for query in queries.captured_queries
+            if query['sql'].startswith('SELECT') and re.search(r'FROM "members_member"', query['sql'])
+        ]
+        self.assertTrue(member_queries)
+        table_scan = re.compile(r'Seq Scan on members_member|^SCAN members_member$')
+        plans = []
+        for sql in member_queries:
+            plan = self.explain(sql)
+            self.assertFalse([line for line in plan if table_scan.search(line)], f'{sql}\n{plan}')
+            plans.extend(plan)
+        if index:
+            self.assertTrue([line for line in plans if index in line], f'{index} not used\n{plans}')
+
+    def test_member_list(self):
+        self.assertMemberQueriesUseIndexes(self.admin, lambda: self.client.get('/api/members/'))
+        self.assertMemberQueriesUseIndexes(
+            self.admin, lambda: self.client.get('/api/members/', {'created_by': self.registrant.pk})
+        )
+        self.assertMemberQueriesUseIndexes(self.registrant, lambda: self.client.get('/api/members/'))
+
+    def test_member_list_filters(self):
+        self.assertMemberQueriesUseIndexes(
+            self.admin, lambda: self.client.get('/api/members/', {'country': 'Tanzania'}),
+            index='member_live_country_idx',
+        )
+        self.assertMemberQueriesUseIndexes(
+            self.admin, lambda: self.client.get('/api/members/', {'region': 'dar_es_salaam', 'include_total': 'true'}),
+            index='member_live_region_idx',
+        )
+        response = self.client.get('/api/members/', {'region': 'dar_es_salaam', 'include_total': 'true'})
+        self.assertEqual(response.data['total_count'], 180)
+
+    def test_registrant_stats(self):
+        self.assertMemberQueriesUseIndexes(self.registrant, lambda: self.client.get('/api/stats/registrant/'))
+
+    def test_exports(self):
+        self.assertMemberQueriesUseIndexes(self.admin, lambda: self.client.get('/api/members/export/'))
+        self.assertMemberQueriesUseIndexes(self.registrant, lambda: self.client.get('/api/members/export/'))
+        self.assertMemberQueriesUseIndexes(self.admin, lambda: self.client.post('/api/export/members/', {
+            'format': 'csv',
+            'filters': {'region': 'dar_es_salaam', 'date_from': '2020-01-01T00:00:00Z', 'date_to': '2100-01-01T00:00:00Z'},
+        }, format='json'))
+
+
+class MemberListPaginationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(username='page-admin', password='x', role='admin')
+        Member.objects.bulk_create([
+            Member(
+                first_name=f'Member{i}', last_name='Test', gender='male', age=30, marital_status='single',
+                country='Tanzania', region='dar_es_salaam', center_area='ilala', zone='A', cell='1',
+                mobile_no=f'0713{i:06d}', origin='invited', residence='Town',
+                attending_date=date(2024, 1, 1), created_by=cls.admin,
+            )
+            for i in range(7)
+        ])
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def get(self, url, params=None):
+        response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_next_and_previous(self):
+        expected = list(Member.objects.order_by('-created_at', '-id').values_list('id', flat=True))
+        pages = []
+        page = self.get('/api/members/', {'page_size': 3})
+        self.assertIsNone(page['previous'])
+        while True:
+            pages.append([member['id'] for member in page['results']])
+            if not page['next']:
+                break
+            page = self.get(page['next'])
+        self.assertEqual([len(ids) for ids in pages], [3, 3, 1])
+        self.assertEqual([pk for ids in pages for pk in ids], expected)
+
+        previous = self.get(page['previous'])
+        self.assertEqual([member['id'] for member in previous['results']], pages[1])
+
+    def test_include_total(self):
+        self.assertNotIn('total_count', self.get('/api/members/', {'page_size': 3}))
+        self.assertEqual(self.get('/api/members/', {'page_size': 3, 'include_total': 'true'})['total_count'], 7)
+
+    def test_invalid_cursor(self):
+        for position in (['garbage', '1'], ['2024-01-01T00:00:00+00:00', 'x'], ['2024-01-01T00:00:00+00:00'], 'p'):
+            cursor = urlsafe_b64encode(json.dumps({'p': position}).encode()).decode()
+            response = self.client.get('/api/members/', {'cursor': cursor})
+            self.assertEqual(response.status_code, 404, position)
+        self.assertEqual(self.client.get('/api/members/', {'cursor': 'not-a-cursor'}).status_code, 404)
+
+
+class MemberBulkCreateTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.registrant = User.objects.create_user(username='bulk-registrant', password='x', role='registrant')
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.registrant)
+
+    def item(self, i, **fields):
+        item = dict(
+            first_name=f'Bulk{i}', last_name='Test', gender='male', age=30, marital_status='single',
+            country='Tanzania', region='dar_es_salaam', center_area='ilala', zone='A', cell='1',
+            mobile_no=f'0715{i:06d}', origin='invited', residence='Town', attending_date='2024-01-01',
+        )
+        item.update(fields)
+        return item
 
-# Create your tests here.
+    def test_pictures_are_rejected(self):
+        response = self.client.post('/api/members/bulk/', {
+            'members': [self.item(0), self.item(1, picture='data:image/jpeg;base64,AAAA')],
+        }, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual([entry['index'] for entry in response.data['created']], [0])
+        self.assertEqual([error['index'] for error in response.data['errors']], [1])
+        self.assertIn('picture', response.data['errors'][0]['errors'])
+        self.assertEqual(Member.objects.filter(created_by=self.registrant).count(), 1)
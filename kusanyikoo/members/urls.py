@@ -1,9 +1,17 @@
 from django.urls import path
-from .views import MemberListCreateView, MemberDetailView, export_members, public_member_search
+from .views import (
+    MemberListCreateView, MemberDetailView, export_members, public_member_search, sync_members,
+    bulk_create_members, member_imports, member_import_detail, member_import_errors,
+)
 
 urlpatterns = [
     path('', MemberListCreateView.as_view(), name='member-list-create'),
     path('search/', public_member_search, name='public-member-search'),
     path('export/', export_members, name='member-export'),
+    path('bulk/', bulk_create_members, name='member-bulk-create'),
+    path('sync/', sync_members, name='member-sync'),
+    path('imports/', member_imports, name='member-imports'),
+    path('imports/<int:pk>/', member_import_detail, name='member-import-detail'),
+    path('imports/<int:pk>/errors/', member_import_errors, name='member-import-errors'),
     path('<int:pk>/', MemberDetailView.as_view(), name='member-detail'),
 ]
@@ -2,17 +2,31 @@ from rest_framework import generics, status
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework.decorators import api_view, permission_classes
+import mimetypes
+import os
+from django.db import transaction
+from django.http import FileResponse, Http404
 from django.shortcuts import get_object_or_404
-from django.db.models import Q
-from django.http import HttpResponse
-import csv
-from .models import Member
-from .serializers import MemberSerializer
+from django.utils.dateparse import parse_datetime
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import condition, require_safe
+from kusanyikoo import worker
+from .models import Member, MemberImport
+from .serializers import MemberSerializer, MemberImportSerializer
+from .signals import members_bulk_created
+from .pagination import MemberCursorPagination
+from .search import search_members
+from . import importer, sync
+from .idempotency import idempotent
+from .exports import (
+    copy_csv_response, copy_supported, csv_response, member_rows, format_datetime, sql_datetime, sql_yes_no,
+)
 
 
 class MemberListCreateView(generics.ListCreateAPIView):
     serializer_class = MemberSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = MemberCursorPagination
     
     def get_queryset(self):
         user = self.request.user
@@ -34,37 +48,47 @@ class MemberListCreateView(generics.ListCreateAPIView):
         # Apply additional filters from query parameters
         search = self.request.query_params.get('search')
         if search:
-            queryset = queryset.filter(
-                Q(first_name__icontains=search) |
-                Q(last_name__icontains=search) |
-                Q(middle_name__icontains=search) |
-                Q(mobile_no__icontains=search) |
-                Q(email__icontains=search)
-            )
+            queryset = search_members(queryset, search)
         
         gender = self.request.query_params.get('gender')
         if gender:
             queryset = queryset.filter(gender=gender)
         
+        # Exact matches: the values come from the same fixed lists the forms
+        # store, and member_live_region_idx / member_live_country_idx serve them
         region = self.request.query_params.get('region')
         if region:
-            queryset = queryset.filter(region__icontains=region)
+            queryset = queryset.filter(region=region)
         
         country = self.request.query_params.get('country')
         if country:
-            queryset = queryset.filter(country__icontains=country)
+            queryset = queryset.filter(country=country)
         
         saved = self.request.query_params.get('saved')
         if saved is not None:
             saved_bool = saved.lower() in ['true', '1', 'yes']
             queryset = queryset.filter(saved=saved_bool)
         
-        return queryset.order_by('-created_at')
+        # Registered at or after an ISO 8601 timestamp, for counts such as "this month"
+        created_after = self.request.query_params.get('created_after')
+        if created_after:
+            try:
+                created_after = parse_datetime(created_after)
+            except ValueError:
+                created_after = None
+            if created_after is not None:
+                queryset = queryset.filter(created_at__gte=created_after)
+        
+        return queryset.order_by('-created_at', '-id')
     
     def perform_create(self, serializer):
         serializer.save(created_by=self.request.user)
     
     def create(self, request, *args, **kwargs):
+        # A retry carrying the same Idempotency-Key gets the first response back
+        return idempotent(request, 'members:create', lambda: self.create_once(request, *args, **kwargs))
+    
+    def create_once(self, request, *args, **kwargs):
         try:
             result = super().create(request, *args, **kwargs)
             return result
@@ -76,27 +100,6 @@ class MemberListCreateView(generics.ListCreateAPIView):
                 {'error': f'Failed to create member: {str(e)}'},
                 status=status.HTTP_400_BAD_REQUEST
             )
-    
-    def list(self, request, *args, **kwargs):
-        """Override list to add total count to response"""
-        queryset = self.filter_queryset(self.get_queryset())
-        
-        # Get total count before pagination
-        total_count = queryset.count()
-        
-        page = self.paginate_queryset(queryset)
-        if page is not None:
-            serializer = self.get_serializer(page, many=True)
-            return self.get_paginated_response({
-                'results': serializer.data,
-                'total_count': total_count
-            })
-
-        serializer = self.get_serializer(queryset, many=True)
-        return Response({
-            'results': serializer.data,
-            'total_count': total_count
-        })
 
 
 class MemberDetailView(generics.RetrieveUpdateDestroyAPIView):
@@ -121,6 +124,138 @@ class MemberDetailView(generics.RetrieveUpdateDestroyAPIView):
         instance.save()
 
 
+BULK_CREATE_LIMIT = 500
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def bulk_create_members(request):
+    """
+    Register many members in one request.
+    
+    Every item is validated; the valid ones are inserted together with a
+    single bulk_create and the rest are reported by their index, so a device
+    can retry only the entries that failed. Items with a picture are
+    rejected: upload it to the created member. Send an Idempotency-Key header
+    so that retrying a request that timed out does not register twice.
+    """
+    return idempotent(request, 'members:bulk', lambda: _bulk_create_members(request))
+
+
+def _bulk_create_members(request):
+    items = request.data.get('members') if isinstance(request.data, dict) else request.data
+    if not isinstance(items, list) or not items:
+        return Response({'error': 'Expected a non-empty list of members'}, status=status.HTTP_400_BAD_REQUEST)
+    if len(items) > BULK_CREATE_LIMIT:
+        return Response(
+            {'error': f'At most {BULK_CREATE_LIMIT} members can be created per request'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    members = []
+    indexes = []
+    errors = []
+    for index, item in enumerate(items):
+        if isinstance(item, dict) and item.get('picture'):
+            # bulk_create skips Member.save(), which stores, counts and resizes pictures
+            errors.append({'index': index, 'errors': {
+                'picture': ['Pictures cannot be bulk uploaded; add them to the member afterwards.']
+            }})
+            continue
+        serializer = MemberSerializer(data=item, context={'request': request})
+        if serializer.is_valid():
+            members.append(Member(**serializer.validated_data, created_by=request.user))
+            indexes.append(index)
+        else:
+            errors.append({'index': index, 'errors': serializer.errors})
+    
+    if members:
+        with transaction.atomic():
+            Member.objects.bulk_create(members, batch_size=100)
+            # bulk_create skips post_save; keep the cache and rollup in the same transaction
+            members_bulk_created.send(sender=Member, members=members)
+    
+    data = MemberSerializer(members, many=True, context={'request': request}).data
+    return Response({
+        'created': [{'index': index, 'member': member} for index, member in zip(indexes, data)],
+        'errors': errors,
+    }, status=status.HTTP_201_CREATED if members else status.HTTP_400_BAD_REQUEST)
+
+
+@api_view(['GET', 'POST'])
+@permission_classes([IsAuthenticated])
+def member_imports(request):
+    """
+    List the current user's imports, or upload a CSV/XLSX register to import.
+    
+    Uploads are processed in the background; poll the import for progress.
+    """
+    if request.method == 'GET':
+        imports = MemberImport.objects.filter(created_by=request.user).select_related('created_by')[:50]
+        return Response(MemberImportSerializer(imports, many=True).data)
+    
+    upload = request.FILES.get('file')
+    if upload is None:
+        return Response({'error': 'Upload a CSV or XLSX file as "file"'}, status=status.HTTP_400_BAD_REQUEST)
+    try:
+        file_format = importer.detect_format(upload.name)
+    except importer.ImportFormatError as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    
+    member_import = MemberImport.objects.create(created_by=request.user, file=upload, format=file_format)
+    worker.submit(importer.run_import, member_import.pk)
+    return Response(MemberImportSerializer(member_import).data, status=status.HTTP_202_ACCEPTED)
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def member_import_detail(request, pk):
+    """Progress of an import"""
+    member_import = get_object_or_404(MemberImport.objects.select_related('created_by'), pk=pk, created_by=request.user)
+    return Response(MemberImportSerializer(member_import).data)
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def member_import_errors(request, pk):
+    """CSV report of the rows an import rejected"""
+    member_import = get_object_or_404(MemberImport, pk=pk, created_by=request.user)
+    try:
+        header = importer.error_report_header(member_import)
+    except importer.ImportFormatError as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    return csv_response(header, importer.error_rows(member_import), f'import_{member_import.pk}_errors.csv')
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def sync_members(request):
+    """
+    Members of the current user changed since the `since` cursor.
+    
+    Clients repeat the call with the returned cursor while `has_more` is true
+    and keep the last cursor for their next sync.
+    """
+    try:
+        limit = min(int(request.query_params.get('limit', sync.DEFAULT_LIMIT)), sync.MAX_LIMIT)
+    except (TypeError, ValueError):
+        limit = sync.DEFAULT_LIMIT
+    
+    try:
+        members, deleted, cursor, has_more = sync.changes(
+            request.user, request.query_params.get('since'), max(limit, 1)
+        )
+    except sync.InvalidCursor:
+        return Response({'error': 'Invalid sync cursor'}, status=status.HTTP_400_BAD_REQUEST)
+    
+    return Response({
+        'members': MemberSerializer(members, many=True, context={'request': request}).data,
+        'deleted': deleted,
+        'cursor': cursor,
+        'has_more': has_more,
+    })
+
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def export_members(request):
@@ -133,51 +268,40 @@ def export_members(request):
     else:
         queryset = Member.objects.filter(created_by=user, is_deleted=False)
     
-    # Create HTTP response with CSV content type
-    response = HttpResponse(content_type='text/csv')
-    response['Content-Disposition'] = f'attachment; filename="members_export.csv"'
-    
-    writer = csv.writer(response)
-    
-    # Write header row
-    writer.writerow([
+    header = [
         'First Name', 'Middle Name', 'Last Name', 'Gender', 'Age', 
         'Marital Status', 'Saved', 'Church Registration Number',
         'Country', 'Region', 'Center/Area', 'Zone', 'Cell',
         'Mobile Number', 'Email', 'Postal Address',
         'Church Position', 'Visitors Count', 'Origin', 
         'Residence', 'Career', 'Attending Date', 'Created Date'
-    ])
-    
-    # Write data rows
-    for member in queryset:
-        writer.writerow([
-            member.first_name,
-            member.middle_name or '',
-            member.last_name,
-            member.gender,
-            member.age,
-            member.marital_status,
-            'Yes' if member.saved else 'No',
-            member.church_registration_number,
-            member.country,
-            member.region,
-            member.center_area,
-            member.zone,
-            member.cell,
-            member.mobile_no,
-            member.email or '',
-            member.postal_address or '',
-            member.church_position or '',
-            member.visitors_count,
-            member.origin,
-            member.residence,
-            member.career or '',
-            member.attending_date.strftime('%Y-%m-%d') if member.attending_date else '',
-            member.created_at.strftime('%Y-%m-%d %H:%M:%S'),
-        ])
-    
-    return response
+    ]
+    fields = [
+        'first_name', 'middle_name', 'last_name', 'gender', 'age',
+        'marital_status', 'saved', 'church_registration_number',
+        'country', 'region', 'center_area', 'zone', 'cell',
+        'mobile_no', 'email', 'postal_address',
+        'church_position', 'visitors_count', 'origin',
+        'residence', 'career', 'attending_date', 'created_at',
+    ]
+    queryset = queryset.order_by('-created_at', '-id')
+    
+    # On PostgreSQL the database writes the CSV itself
+    if copy_supported():
+        columns = list(fields)
+        columns[6] = sql_yes_no('saved')
+        columns[21] = sql_datetime('attending_date', 'YYYY-MM-DD')
+        columns[22] = sql_datetime('created_at')
+        return copy_csv_response(header, queryset, columns, 'members_export.csv')
+    
+    rows = member_rows(queryset, fields, {
+        6: lambda saved: 'Yes' if saved else 'No',
+        21: lambda value: format_datetime(value, '%Y-%m-%d'),
+        22: format_datetime,
+    })
+    
+    # Stream rows to the client as they are read
+    return csv_response(header, rows, 'members_export.csv')
 
 
 @api_view(['GET'])
@@ -191,18 +315,34 @@ def public_member_search(request):
     if not search_term:
         return Response([], status=status.HTTP_200_OK)
     
-    # Search members with basic information only
+    # Search members with basic information only, best matches first
     queryset = Member.objects.filter(is_deleted=False)
-    queryset = queryset.filter(
-        Q(first_name__icontains=search_term) |
-        Q(last_name__icontains=search_term) |
-        Q(middle_name__icontains=search_term) |
-        Q(mobile_no__icontains=search_term) |
-        Q(email__icontains=search_term)
-    )
+    queryset = search_members(queryset, search_term, ranked=True)
     
     # Limit results for performance
     queryset = queryset[:50]
     
     serializer = MemberSerializer(queryset, many=True, context={'request': request})
     return Response(serializer.data, status=status.HTTP_200_OK)
+
+
+def _picture_etag(request, path):
+    # Picture names are content hashes, so the name is a strong validator
+    return os.path.splitext(os.path.basename(path))[0]
+
+
+@cache_control(public=True, max_age=365 * 24 * 60 * 60, immutable=True)
+@require_safe
+@condition(etag_func=_picture_etag)
+def serve_picture(request, path):
+    """
+    Serve a content-addressed member picture. The bytes behind a URL never
+    change, so browsers and proxies may cache it indefinitely.
+    """
+    storage = Member._meta.get_field('picture').storage
+    try:
+        fileobj = storage.open(path, 'rb')
+    except FileNotFoundError:
+        raise Http404('Picture not found')
+    content_type = mimetypes.guess_type(path)[0] or 'application/octet-stream'
+    return FileResponse(fileobj, content_type=content_type)
@@ -0,0 +1,50 @@
+"""
+User-Agent strings for the audit log.
+
+Each distinct string is stored once in UserAgent under its SHA-256 and audit
+log entries keep only the small integer id. Ids are resolved through an
+in-process LRU, so logging from a known browser costs no query at all.
+"""
+import hashlib
+from functools import lru_cache
+
+from django.db import IntegrityError, connection, transaction
+
+from .models import UserAgent
+
+CACHE_SIZE = 1024
+
+
+def digest(value):
+    return hashlib.sha256(value.encode('utf-8')).hexdigest()
+
+
+def _lookup(key):
+    return UserAgent.objects.values_list('id', flat=True).get(digest=key)
+
+
+# Misses raise DoesNotExist, which lru_cache does not remember
+_cached_lookup = lru_cache(maxsize=CACHE_SIZE)(_lookup)
+
+
+def resolve(value):
+    """The UserAgent id for `value`, storing the string if it is new; None for an empty one."""
+    if not value:
+        return None
+    key = digest(value)
+    # A row created inside a transaction that may still roll back must not be cached
+    lookup = _lookup if connection.in_atomic_block else _cached_lookup
+    try:
+        return lookup(key)
+    except UserAgent.DoesNotExist:
+        pass
+    try:
+        with transaction.atomic():
+            return UserAgent.objects.create(digest=key, value=value).id
+    except IntegrityError:
+        # Stored by another process in the meantime
+        return _lookup(key)
+
+
+def clear_cache():
+    _cached_lookup.cache_clear()
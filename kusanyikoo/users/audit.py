@@ -0,0 +1,112 @@
+"""
+Buffered audit log writer.
+
+Audit entries are queued in memory per process and written with a single
+bulk_create once AUDIT_LOG_BUFFER_SIZE entries are waiting or
+AUDIT_LOG_FLUSH_INTERVAL seconds have passed, whichever comes first, so
+requests no longer pay for an INSERT each. The buffer is flushed at
+interpreter shutdown. Security-critical actions (see SYNC_ACTIONS) and
+callers that pass sync=True are still written immediately.
+"""
+import atexit
+import os
+import threading
+
+from django.conf import settings
+from django.db import IntegrityError, close_old_connections, transaction
+
+from .models import AuditLog
+
+# Actions that must be on disk before the request returns. Successful logins
+# are kept too: after a compromise they show who got in, and a worker killed
+# before its buffer flushes would lose them.
+SYNC_ACTIONS = {'login', 'failed_login', 'password_reset', 'delete'}
+
+
+class AuditBuffer:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.entries = []
+        self.pid = os.getpid()
+        self.wakeup = threading.Event()
+        self.thread = None
+
+    @property
+    def max_size(self):
+        return getattr(settings, 'AUDIT_LOG_BUFFER_SIZE', 50)
+
+    @property
+    def interval(self):
+        return getattr(settings, 'AUDIT_LOG_FLUSH_INTERVAL', 2.0)
+
+    def add(self, entry):
+        with self.lock:
+            if self.pid != os.getpid():
+                # Forked after entries were queued: they belong to the parent.
+                self.entries = []
+                self.pid = os.getpid()
+                self.thread = None
+            self.entries.append(entry)
+            full = len(self.entries) >= self.max_size
+            self._ensure_thread()
+        if full:
+            self.wakeup.set()
+
+    def _ensure_thread(self):
+        if self.thread is None or not self.thread.is_alive():
+            self.thread = threading.Thread(target=self._run, name='audit-log-flusher', daemon=True)
+            self.thread.start()
+
+    def _run(self):
+        while True:
+            self.wakeup.wait(self.interval)
+            self.wakeup.clear()
+            close_old_connections()
+            self.flush()
+
+    def flush(self):
+        """Write every queued entry; returns the number written."""
+        with self.lock:
+            entries, self.entries = self.entries, []
+        if not entries:
+            return 0
+        try:
+            AuditLog.objects.bulk_create(entries)
+            return len(entries)
+        except Exception as e:
+            print(f"Audit log bulk write failed, retrying entries one by one: {e}")
+            return sum(write_entry(entry) for entry in entries)
+
+
+def write_entry(entry):
+    """Insert a single entry, dropping a user that no longer exists rather than the entry."""
+    for attempt in range(2):
+        try:
+            with transaction.atomic():
+                entry.save(force_insert=True)
+            return 1
+        except IntegrityError as e:
+            if attempt or entry.user_id is None:
+                print(f"Failed to write audit log entry: {e}")
+                return 0
+            entry.details = {**entry.details, 'deleted_user_id': entry.user_id}
+            entry.user_id = None
+        except Exception as e:
+            print(f"Failed to write audit log entry: {e}")
+            return 0
+    return 0
+
+
+buffer = AuditBuffer()
+atexit.register(buffer.flush)
+
+
+def record(entry, sync=False):
+    if sync or entry.action in SYNC_ACTIONS or not getattr(settings, 'AUDIT_LOG_BUFFERED', True):
+        entry.save(force_insert=True)
+    else:
+        buffer.add(entry)
+
+
+def flush():
+    return buffer.flush()
@@ -0,0 +1,89 @@
+"""
+Audit log queries shared by the audit API and the activity exports.
+
+Entries are read newest first in (timestamp, id) order and paged by seeking
+on that pair (see kusanyikoo.pagination), so a user, action or resource_type
+filter is answered by the matching (column, timestamp) index however deep
+the page. Pages are read in time windows (`newest_entries`) so that only the
+audit log partitions a page falls in are scanned.
+"""
+from datetime import datetime, time, timedelta
+
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from rest_framework.exceptions import ValidationError
+
+AUDIT_ORDERING = ('-timestamp', '-id')
+
+FILTERS = ['user', 'action', 'resource_type', 'resource_id', 'since', 'until']
+
+
+def _parse_time(value, name, end_of_day=False):
+    try:
+        parsed = parse_datetime(value)
+        if parsed is None:
+            day = parse_date(value)
+            if day is None:
+                raise ValueError(value)
+            parsed = datetime.combine(day, time.max if end_of_day else time.min)
+    except ValueError:
+        raise ValidationError({name: 'Use an ISO 8601 date or date-time.'})
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed
+
+
+def filter_entries(queryset, params):
+    """
+    Narrow an AuditLog queryset by the FILTERS present in `params` (query
+    params or a dict). `since`/`until` take dates or date-times; a bare
+    `until` date includes that whole day.
+    """
+    user = params.get('user')
+    if user:
+        try:
+            queryset = queryset.filter(user_id=int(user))
+        except (TypeError, ValueError):
+            raise ValidationError({'user': 'Must be a user id.'})
+
+    for field in ['action', 'resource_type', 'resource_id']:
+        value = params.get(field)
+        if value:
+            queryset = queryset.filter(**{field: value})
+
+    since = params.get('since')
+    if since:
+        queryset = queryset.filter(timestamp__gte=_parse_time(since, 'since'))
+    until = params.get('until')
+    if until:
+        queryset = queryset.filter(timestamp__lte=_parse_time(until, 'until', end_of_day=True))
+    return queryset
+
+
+# Width of the first time window read for a page of entries; each further
+# window reaches back twice as far as the one before.
+WINDOW = timedelta(days=31)
+
+
+def newest_entries(queryset, limit, floor, before=None):
+    """
+    The first `limit` entries of `queryset`, which must be ordered newest
+    first, read one time window at a time going back from `before` (or
+    now). On a partitioned audit log each window only touches the months
+    it spans, so a page of recent activity never opens old partitions.
+    Past `floor` (the start of the retention period) everything left is
+    read in one last query.
+    """
+    start = (before or timezone.now()) - WINDOW
+    span = WINDOW
+    upper = None
+    rows = []
+    while len(rows) < limit:
+        window = queryset if upper is None else queryset.filter(timestamp__lt=upper)
+        if start <= floor:
+            rows.extend(window[:limit - len(rows)])
+            break
+        rows.extend(window.filter(timestamp__gte=start)[:limit - len(rows)])
+        span *= 2
+        upper, start = start, start - span
+    return rows
@@ -0,0 +1,112 @@
+"""
+JWT authentication with a cached user lookup.
+
+simplejwt's JWTAuthentication loads the user by primary key on every
+request. Here the user is cached for AUTH_USER_CACHE_TIMEOUT seconds, stored
+together with the user's cache version. `invalidate_user` bumps that version
+(User.save/delete call it), so a changed user is reloaded on the next request
+even if a stale copy is still in the cache.
+
+Users are cached in the shared cache (kusanyikoo.caches) so that a
+suspension seen by one worker reaches all of them. A per-process fallback
+would keep serving a suspended user from the other workers' copies, so
+without a shared cache the user is loaded from the database on every
+request and startup logs a warning (see kusanyikoo.caches).
+"""
+import time
+
+from django.conf import settings
+from django.db import transaction
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+from kusanyikoo.caches import shared_cache
+
+
+def _user_key(user_id):
+    return f'auth:user:{user_id}'
+
+
+def _version_key(user_id):
+    return f'auth:user:{user_id}:version'
+
+
+def _initial_version():
+    # Clock-seeded for the same reason as members.cache: a version lost to
+    # eviction must not collide with the one a cached user was stored under.
+    return int(time.time() * 1000)
+
+
+def invalidate_user(user_id):
+    """Make the next request by `user_id` reload the user from the database."""
+    cache = shared_cache()
+    if cache is None:
+        return
+    key = _version_key(user_id)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, _initial_version(), None)
+
+
+def invalidate_user_on_commit(user_id):
+    # Invalidate now and again once the change is visible to other requests,
+    # so a request that reloads the user mid-transaction cannot cache old data.
+    invalidate_user(user_id)
+    transaction.on_commit(lambda: invalidate_user(user_id))
+
+
+def get_cached_user(user_model, user_id):
+    """Return the user with primary key `user_id`, or None if there is none."""
+    cache = shared_cache()
+    if cache is None:
+        return user_model.objects.filter(**{api_settings.USER_ID_FIELD: user_id}).first()
+
+    key = _user_key(user_id)
+    version_key = _version_key(user_id)
+    values = cache.get_many([version_key, key])
+
+    version = values.get(version_key)
+    if version is None:
+        cache.add(version_key, _initial_version(), None)
+        version = cache.get(version_key)
+
+    entry = values.get(key)
+    if entry is not None and entry[0] == version:
+        return entry[1]
+
+    try:
+        user = user_model.objects.get(**{api_settings.USER_ID_FIELD: user_id})
+    except user_model.DoesNotExist:
+        return None
+    cache.set(key, (version, user), getattr(settings, 'AUTH_USER_CACHE_TIMEOUT', 60))
+    return user
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """JWTAuthentication that resolves the user through the cache and rejects suspended users."""
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        user = get_cached_user(self.user_model, user_id)
+        if user is None:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+
+        if not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        if getattr(user, 'status', None) == 'suspended':
+            raise AuthenticationFailed(_("User is suspended"), code="user_suspended")
+
+        if getattr(api_settings, 'CHECK_REVOKE_TOKEN', False):
+            if validated_token.get(api_settings.REVOKE_TOKEN_CLAIM) != get_md5_hash_password(user.password):
+                raise AuthenticationFailed(_("The user's password has been changed."), code="password_changed")
+
+        return user
@@ -0,0 +1,16 @@
+from django.contrib.auth.backends import ModelBackend
+
+
+class PreloadedUserBackend(ModelBackend):
+    """
+    Authenticate a user the caller has already loaded, e.g.
+    authenticate(request, user=user, password=password), without looking
+    it up again. Calls with a username fall through to ModelBackend.
+    """
+    
+    def authenticate(self, request, user=None, password=None, **kwargs):
+        if user is None or password is None:
+            return None
+        if user.check_password(password) and self.user_can_authenticate(user):
+            return user
+        return None
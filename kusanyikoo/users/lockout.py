@@ -0,0 +1,49 @@
+"""
+Login lockout.
+
+With a shared cache (kusanyikoo.caches), failed logins are counted per
+account in it rather than on the user row, so a burst of bad passwords
+against one account no longer queues up writes on that row; the row is
+written once, when LOGIN_MAX_FAILURES failures within LOGIN_FAILURE_WINDOW
+seconds lock the account. Per-process counts would let each worker allow
+its own LOGIN_MAX_FAILURES, so without a shared cache failures are counted
+on the row with an atomic increment instead.
+"""
+from django.conf import settings
+from django.db.models import F
+
+from kusanyikoo.caches import shared_cache
+from kusanyikoo.ratelimit import SlidingWindow
+from .models import User
+
+
+def _failures():
+    return SlidingWindow(
+        'login-failures',
+        getattr(settings, 'LOGIN_MAX_FAILURES', 5),
+        getattr(settings, 'LOGIN_FAILURE_WINDOW', 30 * 60),
+    )
+
+
+def _count_on_row(user):
+    User.objects.filter(pk=user.pk).update(failed_login_attempts=F('failed_login_attempts') + 1)
+    return User.objects.values_list('failed_login_attempts', flat=True).get(pk=user.pk)
+
+
+def record_failure(user):
+    """Count a failed login for `user`, locking the account at the limit; returns the failure count."""
+    failures = _failures()
+    shared = shared_cache() is not None
+    attempts = int(failures.hit(user.pk)) if shared else _count_on_row(user)
+    if attempts >= failures.limit and not user.is_locked():
+        # The lock now does the blocking; start afresh once it expires
+        user.failed_login_attempts = attempts if shared else 0
+        user.lock_account(getattr(settings, 'LOGIN_LOCKOUT_MINUTES', 30))
+        if shared:
+            failures.reset(user.pk)
+    return attempts
+
+
+def clear_failures(user):
+    if shared_cache() is not None:
+        _failures().reset(user.pk)
@@ -0,0 +1,26 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from users import partitions
+
+
+class Command(BaseCommand):
+    help = (
+        'Create upcoming audit log partitions and move months older than the '
+        'retention period into compressed archives; run monthly'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--months', type=int, default=settings.AUDIT_LOG_RETENTION_MONTHS,
+            help='Months of entries to keep in the database'
+        )
+        parser.add_argument('--archive-dir', default=settings.AUDIT_LOG_ARCHIVE_DIR)
+        parser.add_argument('--dry-run', action='store_true', help='Report what would be archived')
+
+    def handle(self, *args, **options):
+        rotated = partitions.rotate(options['months'], options['archive_dir'], dry_run=options['dry_run'])
+        verb = 'Would archive' if options['dry_run'] else 'Archived'
+        for month, path, count in rotated:
+            self.stdout.write(f'{verb} {count} entries from {month:%Y-%m}' + (f' to {path}' if count else ''))
+        self.stdout.write(self.style.SUCCESS(f'{verb} {len(rotated)} months of audit log'))
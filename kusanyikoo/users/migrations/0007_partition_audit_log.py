@@ -0,0 +1,26 @@
+from django.db import migrations
+
+
+def partition_audit_log(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    from users.partitions import partition_table
+    partition_table(schema_editor.connection, apps.get_model('users', 'AuditLog'))
+
+
+def unpartition_audit_log(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    from users.partitions import unpartition_table
+    unpartition_table(schema_editor.connection, apps.get_model('users', 'AuditLog'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0006_audit_log_event_timestamp'),
+    ]
+
+    operations = [
+        migrations.RunPython(partition_audit_log, unpartition_audit_log),
+    ]
@@ -0,0 +1,55 @@
+# Generated by Django 4.2.7 on 2026-10-17 01:14
+
+import hashlib
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+import django.db.models.deletion
+
+
+def move_user_agents(apps, schema_editor):
+    AuditLog = apps.get_model('users', 'AuditLog')
+    UserAgent = apps.get_model('users', 'UserAgent')
+    values = AuditLog.objects.exclude(user_agent='').values_list('user_agent', flat=True).order_by().distinct()
+    UserAgent.objects.bulk_create([
+        UserAgent(digest=hashlib.sha256(value.encode('utf-8')).hexdigest(), value=value)
+        for value in values.iterator()
+    ], batch_size=500)
+    AuditLog.objects.exclude(user_agent='').update(
+        agent=Subquery(UserAgent.objects.filter(value=OuterRef('user_agent')).values('id')[:1])
+    )
+
+
+def restore_user_agents(apps, schema_editor):
+    AuditLog = apps.get_model('users', 'AuditLog')
+    AuditLog.objects.filter(agent__isnull=False).update(
+        user_agent=Subquery(AuditLog.objects.filter(pk=OuterRef('pk')).values('agent__value')[:1])
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0007_partition_audit_log'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserAgent',
+            fields=[
+                ('id', models.AutoField(primary_key=True, serialize=False)),
+                ('digest', models.CharField(max_length=64, unique=True)),
+                ('value', models.TextField()),
+            ],
+        ),
+        migrations.AddField(
+            model_name='auditlog',
+            name='agent',
+            field=models.ForeignKey(blank=True, db_index=False, null=True, on_delete=django.db.models.deletion.PROTECT, to='users.useragent'),
+        ),
+        migrations.RunPython(move_user_agents, restore_user_agents),
+        migrations.RemoveField(
+            model_name='auditlog',
+            name='user_agent',
+        ),
+    ]
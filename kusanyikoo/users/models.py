@@ -72,6 +72,19 @@ class User(AbstractUser):
     def __str__(self):
         return self.username
     
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        # Status, role and lock changes must reach cached API authentication
+        from .authentication import invalidate_user_on_commit
+        invalidate_user_on_commit(self.pk)
+    
+    def delete(self, *args, **kwargs):
+        user_id = self.pk
+        result = super().delete(*args, **kwargs)
+        from .authentication import invalidate_user_on_commit
+        invalidate_user_on_commit(user_id)
+        return result
+    
     def members_registered_count(self):
         """Return count of members registered by this user"""
         return self.member_set.filter(is_deleted=False).count()
@@ -85,13 +98,23 @@ class User(AbstractUser):
     def lock_account(self, duration_minutes=30):
         """Lock account for specified duration"""
         self.account_locked_until = timezone.now() + timezone.timedelta(minutes=duration_minutes)
-        self.save()
+        self.save(update_fields=['account_locked_until', 'failed_login_attempts'])
     
     def unlock_account(self):
         """Unlock account and reset failed login attempts"""
         self.account_locked_until = None
         self.failed_login_attempts = 0
-        self.save()
+        self.save(update_fields=['account_locked_until', 'failed_login_attempts'])
+
+
+class UserAgent(models.Model):
+    """A distinct User-Agent string, stored once and referenced by audit log entries"""
+    id = models.AutoField(primary_key=True)
+    digest = models.CharField(max_length=64, unique=True)  # SHA-256 of value
+    value = models.TextField()
+    
+    def __str__(self):
+        return self.value
 
 
 class AuditLog(models.Model):
@@ -112,8 +135,10 @@ class AuditLog(models.Model):
     resource_id = models.CharField(max_length=100, blank=True)
     details = models.JSONField(default=dict, blank=True)
     ip_address = models.GenericIPAddressField()
-    user_agent = models.TextField(blank=True)
-    timestamp = models.DateTimeField(auto_now_add=True)
+    # Entries are never looked up by user agent, so the reference has no index
+    agent = models.ForeignKey(UserAgent, on_delete=models.PROTECT, null=True, blank=True, db_index=False)
+    # Set when the event happens, not when the buffered entry is written
+    timestamp = models.DateTimeField(default=timezone.now, editable=False)
     
     class Meta:
         ordering = ['-timestamp']
@@ -0,0 +1,23 @@
+from kusanyikoo.pagination import KeysetCursorPagination
+from .audit_query import newest_entries
+from .partitions import retention_cutoff
+
+
+class UserCursorPagination(KeysetCursorPagination):
+    """Newest accounts first; `id` breaks ties between equal join dates."""
+    ordering = ('-date_joined', '-id')
+
+
+class AuditLogCursorPagination(KeysetCursorPagination):
+    """Newest entries first; `id` orders entries logged in the same instant."""
+    ordering = ('-timestamp', '-id')
+    max_page_size = 500
+
+    def fetch_rows(self, queryset, limit, reverse):
+        if reverse:
+            # Seeking towards newer entries already bounds the timestamp from below
+            return super().fetch_rows(queryset, limit, reverse)
+        before = None
+        if self.cursor is not None and self.cursor.position is not None:
+            before = self.cursor.position[0]
+        return newest_entries(queryset, limit, retention_cutoff(), before=before)
@@ -0,0 +1,278 @@
+"""
+Monthly partitions and retention for the audit log.
+
+On PostgreSQL users_auditlog is range-partitioned by `timestamp`, one
+partition per calendar month (UTC) named users_auditlog_pYYYY_MM, plus a
+default partition that catches anything outside them. A query bounded by
+timestamp only reads the months it covers, and retiring a month is a
+DETACH + DROP instead of a mass DELETE.
+
+Other databases keep a single table; there a month is retired by deleting
+its rows.
+
+`rotate` keeps PARTITIONS_AHEAD months of empty partitions ready and moves
+months older than the retention period into gzipped JSON Lines archives
+(auditlog-YYYY-MM.jsonl.gz, one entry per line) before dropping them.
+"""
+import gzip
+import json
+import os
+from datetime import datetime, timezone as dt_timezone
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connection, transaction
+from django.db.models import TextField, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from kusanyikoo.pagination import iter_keyset
+from .models import AuditLog
+
+TABLE = 'users_auditlog'
+DEFAULT_PARTITION = f'{TABLE}_default'
+PARTITIONS_AHEAD = 3
+
+ARCHIVE_FIELDS = [
+    'id', 'user_id', 'action', 'resource_type', 'resource_id',
+    'details', 'ip_address', 'timestamp',
+]
+
+
+def month_start(moment):
+    moment = moment.astimezone(dt_timezone.utc)
+    return datetime(moment.year, moment.month, 1, tzinfo=dt_timezone.utc)
+
+
+def add_months(month, count):
+    index = month.year * 12 + month.month - 1 + count
+    return datetime(index // 12, index % 12 + 1, 1, tzinfo=dt_timezone.utc)
+
+
+def partition_name(month):
+    return f'{TABLE}_p{month.year:04d}_{month.month:02d}'
+
+
+def retention_cutoff(months=None):
+    """Start of the oldest month kept in the live table."""
+    if months is None:
+        months = settings.AUDIT_LOG_RETENTION_MONTHS
+    return add_months(month_start(timezone.now()), -months)
+
+
+def is_partitioned(conn=None):
+    conn = conn or connection
+    if conn.vendor != 'postgresql':
+        return False
+    with conn.cursor() as cursor:
+        cursor.execute(
+            'SELECT 1 FROM pg_partitioned_table p JOIN pg_class c ON c.oid = p.partrelid '
+            'WHERE c.relname = %s AND pg_table_is_visible(c.oid)', [TABLE]
+        )
+        return cursor.fetchone() is not None
+
+
+def partition_months(conn=None):
+    """The months that have a partition, oldest first."""
+    conn = conn or connection
+    with conn.cursor() as cursor:
+        cursor.execute(
+            'SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid '
+            'WHERE i.inhparent = %s::regclass', [TABLE]
+        )
+        names = [row[0] for row in cursor.fetchall()]
+    prefix = f'{TABLE}_p'
+    return sorted(
+        datetime(int(name[len(prefix):len(prefix) + 4]), int(name[-2:]), 1, tzinfo=dt_timezone.utc)
+        for name in names if name.startswith(prefix)
+    )
+
+
+def create_partition(month, conn=None):
+    """
+    Create the partition for `month`, moving any of its rows that landed in
+    the default partition in the meantime (PostgreSQL refuses to attach a
+    range the default partition already holds rows for).
+    """
+    conn = conn or connection
+    start, end = month, add_months(month, 1)
+    with transaction.atomic(using=conn.alias), conn.cursor() as cursor:
+        cursor.execute(
+            f'CREATE TEMPORARY TABLE audit_partition_rows AS '
+            f'SELECT * FROM {DEFAULT_PARTITION} WHERE timestamp >= %s AND timestamp < %s', [start, end]
+        )
+        cursor.execute(
+            f'DELETE FROM {DEFAULT_PARTITION} WHERE timestamp >= %s AND timestamp < %s', [start, end]
+        )
+        cursor.execute(
+            f'CREATE TABLE {partition_name(month)} PARTITION OF {TABLE} '
+            f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+        )
+        cursor.execute(f'INSERT INTO {TABLE} SELECT * FROM audit_partition_rows')
+        cursor.execute('DROP TABLE audit_partition_rows')
+
+
+def ensure_partitions(ahead=PARTITIONS_AHEAD, conn=None):
+    """Create any missing partitions from the current month to `ahead` months on."""
+    conn = conn or connection
+    existing = set(partition_months(conn))
+    current = month_start(timezone.now())
+    created = []
+    for offset in range(ahead + 1):
+        month = add_months(current, offset)
+        if month not in existing:
+            create_partition(month, conn)
+            created.append(month)
+    return created
+
+
+def _indexes(model):
+    return [(index.name, [model._meta.get_field(name).column for name in index.fields])
+            for index in model._meta.indexes]
+
+
+def _add_foreign_keys(cursor, model):
+    """Recreate the model's foreign keys (user, agent) on the rebuilt table."""
+    for field in model._meta.concrete_fields:
+        if not field.is_relation or not field.db_constraint:
+            continue
+        cursor.execute(
+            f'ALTER TABLE {TABLE} ADD CONSTRAINT {TABLE}_{field.column}_fk FOREIGN KEY ({field.column}) '
+            f'REFERENCES {field.related_model._meta.db_table} ({field.target_field.column}) '
+            f'DEFERRABLE INITIALLY DEFERRED'
+        )
+
+
+def partition_table(conn, model=AuditLog):
+    """
+    Rebuild users_auditlog as a partitioned table holding the same rows.
+    PostgreSQL only. Unique constraints on a partitioned table must include
+    the partition key, so the primary key becomes (id, timestamp); ids
+    still come from a single sequence and stay unique.
+    """
+    with conn.cursor() as cursor:
+        cursor.execute(f'ALTER TABLE {TABLE} RENAME TO {TABLE}_unpartitioned')
+        cursor.execute(
+            f'CREATE TABLE {TABLE} (LIKE {TABLE}_unpartitioned) '
+            f'PARTITION BY RANGE (timestamp)'
+        )
+        cursor.execute(f'CREATE TABLE {DEFAULT_PARTITION} PARTITION OF {TABLE} DEFAULT')
+
+        cursor.execute(f'SELECT min(timestamp) FROM {TABLE}_unpartitioned')
+        oldest = cursor.fetchone()[0] or timezone.now()
+        month, last = month_start(oldest), add_months(month_start(timezone.now()), PARTITIONS_AHEAD)
+        while month <= last:
+            start, end = month, add_months(month, 1)
+            cursor.execute(
+                f'CREATE TABLE {partition_name(month)} PARTITION OF {TABLE} '
+                f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+            )
+            month = end
+
+        cursor.execute(f'INSERT INTO {TABLE} SELECT * FROM {TABLE}_unpartitioned')
+        cursor.execute(f'DROP TABLE {TABLE}_unpartitioned')
+        cursor.execute(f'ALTER TABLE {TABLE} ADD PRIMARY KEY (id, timestamp)')
+
+        cursor.execute(f'CREATE SEQUENCE {TABLE}_id_seq OWNED BY {TABLE}.id')
+        cursor.execute(f"SELECT setval('{TABLE}_id_seq', coalesce(max(id), 0) + 1, false) FROM {TABLE}")
+        cursor.execute(f"ALTER TABLE {TABLE} ALTER COLUMN id SET DEFAULT nextval('{TABLE}_id_seq')")
+        _add_foreign_keys(cursor, model)
+        for name, columns in _indexes(model):
+            cursor.execute(f'CREATE INDEX {name} ON {TABLE} ({", ".join(columns)})')
+
+
+def unpartition_table(conn, model=AuditLog):
+    """Turn the partitioned users_auditlog back into a plain table."""
+    with conn.cursor() as cursor:
+        cursor.execute(f'ALTER TABLE {TABLE} RENAME TO {TABLE}_partitioned')
+        cursor.execute(f'CREATE TABLE {TABLE} (LIKE {TABLE}_partitioned INCLUDING DEFAULTS)')
+        cursor.execute(f'INSERT INTO {TABLE} SELECT * FROM {TABLE}_partitioned')
+        cursor.execute(f'ALTER SEQUENCE {TABLE}_id_seq OWNED BY {TABLE}.id')
+        cursor.execute(f'DROP TABLE {TABLE}_partitioned')
+        cursor.execute(f'ALTER TABLE {TABLE} ADD PRIMARY KEY (id)')
+        _add_foreign_keys(cursor, model)
+        for name, columns in _indexes(model):
+            cursor.execute(f'CREATE INDEX {name} ON {TABLE} ({", ".join(columns)})')
+
+
+def archive_path(month, directory=None):
+    directory = directory or settings.AUDIT_LOG_ARCHIVE_DIR
+    return os.path.join(directory, f'auditlog-{month.year:04d}-{month.month:02d}.jsonl.gz')
+
+
+def archive_month(month, directory=None, append=False):
+    """
+    Write the entries logged in `month` to its archive, oldest first, and
+    return (path, entries written), or (None, 0) for a month without
+    entries. With `append` the entries are added to
+    an existing archive as another gzip member instead of replacing it.
+    """
+    path = archive_path(month, directory)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    rows = AuditLog.objects.filter(timestamp__gte=month, timestamp__lt=add_months(month, 1))\
+        .values(*ARCHIVE_FIELDS, user_agent=Coalesce('agent__value', Value(''), output_field=TextField()))
+
+    partial = f'{path}.partial'
+    count = 0
+    with gzip.open(partial, 'wt', encoding='utf-8') as archive:
+        for row in iter_keyset(rows, ('timestamp', 'id')):
+            archive.write(json.dumps(row, cls=DjangoJSONEncoder, separators=(',', ':')))
+            archive.write('\n')
+            count += 1
+    if not count:
+        os.remove(partial)
+        return None, 0
+    if append and os.path.exists(path):
+        # Concatenated gzip members read back as one stream
+        with open(path, 'ab') as target, open(partial, 'rb') as source:
+            target.write(source.read())
+        os.remove(partial)
+    else:
+        os.replace(partial, path)
+    return path, count
+
+
+def drop_month(month, partitioned, conn=None):
+    conn = conn or connection
+    if partitioned:
+        name = partition_name(month)
+        with conn.cursor() as cursor:
+            cursor.execute(f'ALTER TABLE {TABLE} DETACH PARTITION {name}')
+            cursor.execute(f'DROP TABLE {name}')
+    else:
+        AuditLog.objects.filter(timestamp__gte=month, timestamp__lt=add_months(month, 1)).delete()
+
+
+def expired_months(cutoff, partitioned):
+    if partitioned:
+        return [month for month in partition_months() if month < cutoff]
+    oldest = AuditLog.objects.filter(timestamp__lt=cutoff).order_by('timestamp')\
+        .values_list('timestamp', flat=True).first()
+    if oldest is None:
+        return []
+    months, month = [], month_start(oldest)
+    while month < cutoff:
+        months.append(month)
+        month = add_months(month, 1)
+    return months
+
+
+def rotate(retention_months=None, directory=None, dry_run=False):
+    """
+    Prepare upcoming partitions and archive then drop every month older
+    than `retention_months`. Returns [(month, archive path, entries)].
+    """
+    partitioned = is_partitioned()
+    if partitioned and not dry_run:
+        ensure_partitions()
+
+    rotated = []
+    for month in expired_months(retention_cutoff(retention_months), partitioned):
+        if dry_run:
+            count = AuditLog.objects.filter(timestamp__gte=month, timestamp__lt=add_months(month, 1)).count()
+            rotated.append((month, archive_path(month, directory), count))
+            continue
+        path, count = archive_month(month, directory, append=not partitioned)
+        drop_month(month, partitioned)
+        rotated.append((month, path, count))
+    return rotated
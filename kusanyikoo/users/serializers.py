@@ -1,7 +1,7 @@
 from rest_framework import serializers
 from django.contrib.auth import authenticate
 from django.contrib.auth.password_validation import validate_password
-from .models import User
+from .models import User, AuditLog
 
 
 class UserSerializer(serializers.ModelSerializer):
@@ -17,6 +17,10 @@ class UserSerializer(serializers.ModelSerializer):
         read_only_fields = ['date_joined', 'last_login', 'members_registered']
     
     def get_members_registered(self, obj):
+        # Listing querysets annotate the count; fall back to a query otherwise
+        annotated = getattr(obj, 'members_registered', None)
+        if annotated is not None:
+            return annotated
         return obj.members_registered_count()
 
 
@@ -115,3 +119,16 @@ class UserCreateSerializer(serializers.ModelSerializer):
     def create(self, validated_data):
         user = User.objects.create_user(**validated_data)
         return user
+
+
+class AuditLogSerializer(serializers.ModelSerializer):
+    username = serializers.CharField(source='user.username', read_only=True, default=None)
+    user_agent = serializers.CharField(source='agent.value', read_only=True, default='')
+    
+    class Meta:
+        model = AuditLog
+        fields = [
+            'id', 'user', 'username', 'action', 'resource_type', 'resource_id',
+            'details', 'ip_address', 'user_agent', 'timestamp'
+        ]
+        read_only_fields = fields
@@ -1,3 +1,67 @@
-from django.test import TestCase
+import re
 
-# Create your tests here.
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from kusanyikoo.caches import shared_cache
+from .authentication import invalidate_user
+from .models import AuditLog, User
+
+SHARED_LOCMEM = {
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'test-default'},
+    'shared': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'test-shared'},
+}
+
+
+@override_settings(CACHES=SHARED_LOCMEM, SHARED_CACHE='shared')
+class CachedJWTAuthenticationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='cached-user', password='x', role='registrant')
+
+    def setUp(self):
+        shared_cache().clear()
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(self.user)}')
+
+    def get_profile(self):
+        """Fetch the profile; return the response and the number of user table queries."""
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/auth/profile/')
+        self.assertEqual(response.status_code, 200)
+        user_queries = [
+            query for query in queries.captured_queries
+            if re.search(r'FROM "users_user"', query['sql'])
+        ]
+        return response, len(user_queries)
+
+    def test_second_request_makes_no_user_query(self):
+        self.assertEqual(self.get_profile()[1], 1)
+        self.assertEqual(self.get_profile()[1], 0)
+
+    def test_saving_the_user_invalidates_the_cached_user(self):
+        self.get_profile()
+        self.user.first_name = 'Renamed'
+        self.user.save()
+
+        response, user_queries = self.get_profile()
+        self.assertEqual(user_queries, 1)
+        self.assertEqual(response.data['first_name'], 'Renamed')
+
+    def test_bumping_the_version_invalidates_the_cached_user(self):
+        self.get_profile()
+        User.objects.filter(pk=self.user.pk).update(status='suspended')
+        invalidate_user(self.user.pk)
+        self.assertEqual(self.client.get('/api/auth/profile/').status_code, 401)
+
+
+@override_settings(AUDIT_LOG_BUFFERED=True)
+class AuditLogWriteTests(TestCase):
+    def test_login_is_written_immediately(self):
+        User.objects.create_user(username='audited-user', password='secret-pass', role='registrant')
+        response = APIClient().post('/api/auth/login/', {'username': 'audited-user', 'password': 'secret-pass'})
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(AuditLog.objects.filter(user__username='audited-user', action='login').exists())
@@ -1,5 +1,6 @@
 from django.utils import timezone
 from .models import AuditLog
+from . import agents, audit
 
 
 def get_client_ip(request):
@@ -12,17 +13,23 @@ def get_client_ip(request):
     return ip
 
 
-def log_audit(user, action, resource_type, resource_id='', details=None, ip_address='', user_agent=''):
-    """Create audit log entry"""
+def log_audit(user, action, resource_type, resource_id='', details=None, ip_address='', user_agent='', sync=False):
+    """
+    Queue an audit log entry.
+
+    Entries are buffered and bulk-inserted in the background (see users.audit);
+    security-critical actions and sync=True write immediately.
+    """
     if details is None:
         details = {}
     
-    AuditLog.objects.create(
-        user=user,
+    audit.record(AuditLog(
+        user_id=user.pk if user is not None else None,
         action=action,
         resource_type=resource_type,
         resource_id=resource_id,
         details=details,
         ip_address=ip_address,
-        user_agent=user_agent
-    )
\ No newline at end of file
+        agent_id=agents.resolve(user_agent),
+        timestamp=timezone.now()
+    ), sync=sync)
\ No newline at end of file
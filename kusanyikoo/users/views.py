@@ -12,9 +12,14 @@ from django.conf import settings
 from django.utils.crypto import get_random_string
 from django.db.models import Q, Count
 import uuid
-from .serializers import SignupSerializer, LoginSerializer, UserSerializer, UserCreateSerializer, ForgotPasswordSerializer, ResetPasswordSerializer
+from .serializers import SignupSerializer, LoginSerializer, UserSerializer, UserCreateSerializer, ForgotPasswordSerializer, ResetPasswordSerializer, AuditLogSerializer
 from .models import User, AuditLog
 from .utils import get_client_ip, log_audit
+from .pagination import UserCursorPagination, AuditLogCursorPagination
+from .audit_query import filter_entries
+from . import lockout
+from members.cache import bump_data_version
+from analytics.models import MemberDailyStat
 
 
 class SignupView(generics.CreateAPIView):
@@ -90,13 +95,15 @@ class LoginView(APIView):
                         'error': 'Account is temporarily locked due to multiple failed login attempts.'
                     }, status=status.HTTP_423_LOCKED)
                 
-                authenticated_user = authenticate(username=user.username, password=password)
+                authenticated_user = authenticate(request, user=user, password=password)
                 
                 if authenticated_user:
-                    # Reset failed login attempts on successful login
+                    # Reset failed login attempts on successful login, in one UPDATE
+                    lockout.clear_failures(user)
                     user.failed_login_attempts = 0
                     user.last_login_ip = get_client_ip(request)
-                    user.save()
+                    user.last_login = timezone.now()
+                    user.save(update_fields=['failed_login_attempts', 'last_login_ip', 'last_login'])
                     
                     refresh = RefreshToken.for_user(authenticated_user)
                     
@@ -120,18 +127,15 @@ class LoginView(APIView):
                         'user': UserSerializer(authenticated_user).data
                     })
                 else:
-                    # Increment failed login attempts
-                    user.failed_login_attempts += 1
-                    if user.failed_login_attempts >= 5:
-                        user.lock_account(30)  # Lock for 30 minutes
-                    user.save()
+                    # Counted in the shared cache; the row is only written if this locks the account
+                    attempts = lockout.record_failure(user)
                     
                     log_audit(
                         user=user,
                         action='failed_login',
                         resource_type='user',
                         resource_id=str(user.id),
-                        details={'reason': 'invalid_credentials', 'username': username, 'attempts': user.failed_login_attempts},
+                        details={'reason': 'invalid_credentials', 'username': username, 'attempts': attempts},
                         ip_address=get_client_ip(request),
                         user_agent=request.META.get('HTTP_USER_AGENT', '')
                     )
@@ -271,6 +275,7 @@ class UserManagementViewSet(ModelViewSet):
     queryset = User.objects.all()
     serializer_class = UserSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = UserCursorPagination
     
     def get_serializer_class(self):
         if self.action == 'create':
@@ -300,7 +305,10 @@ class UserManagementViewSet(ModelViewSet):
         if status_filter and status_filter != 'all':
             queryset = queryset.filter(status=status_filter)
             
-        return queryset.select_related().prefetch_related('member_set')
+        # Count registered members in the same query instead of once per user
+        return queryset.annotate(
+            members_registered=Count('member', filter=Q(member__is_deleted=False))
+        )
     
     def create(self, request, *args, **kwargs):
         response = super().create(request, *args, **kwargs)
@@ -345,7 +353,10 @@ class UserManagementViewSet(ModelViewSet):
             
             # Soft-delete members if they exist
             if member_count > 0:
-                user_to_delete.member_set.filter(is_deleted=False).update(is_deleted=True)
+                # Touch updated_at so synced devices receive the tombstones
+                user_to_delete.member_set.filter(is_deleted=False).update(is_deleted=True, updated_at=timezone.now())
+                MemberDailyStat.objects.filter(created_by=user_to_delete).delete()
+                bump_data_version()
             
             # Log the deletion before it happens
             try:
@@ -441,26 +452,26 @@ class UserManagementViewSet(ModelViewSet):
             'is_superuser': user.is_superuser
         })
     
+    def paginate_audit_log(self, request, queryset):
+        paginator = AuditLogCursorPagination()
+        page = paginator.paginate_queryset(filter_entries(queryset, request.query_params), request, view=self)
+        return paginator.get_paginated_response(AuditLogSerializer(page, many=True).data)
+    
     @action(detail=True, methods=['get'])
     def activity(self, request, pk=None):
-        """Get user activity log"""
+        """Get user activity log, newest first, a page at a time"""
         user = self.get_object()
-        activities = AuditLog.objects.filter(user=user).order_by('-timestamp')[:50]
-        
-        activity_data = []
-        for activity in activities:
-            activity_data.append({
-                'id': activity.id,
-                'action': activity.action,
-                'timestamp': activity.timestamp,
-                'ip_address': activity.ip_address,
-                'user_agent': activity.user_agent,
-                'details': activity.details,
-                'resource_type': activity.resource_type,
-                'resource_id': activity.resource_id
-            })
-        
-        return Response(activity_data)
+        return self.paginate_audit_log(request, AuditLog.objects.filter(user=user).select_related('user', 'agent'))
+    
+    @action(detail=False, methods=['get'])
+    def audit(self, request):
+        """
+        Browse the audit log (admins only). Filters: user, action,
+        resource_type, resource_id, since, until; follow `next` for more.
+        """
+        if request.user.role != 'admin':
+            return Response({'error': 'Unauthorized'}, status=status.HTTP_403_FORBIDDEN)
+        return self.paginate_audit_log(request, AuditLog.objects.select_related('user', 'agent'))
     
     @action(detail=True, methods=['post'])
     def reset_password(self, request, pk=None):
@@ -500,6 +511,7 @@ class UserManagementViewSet(ModelViewSet):
         user = self.get_object()
         
         user.unlock_account()
+        lockout.clear_failures(user)
         
         log_audit(
             user=request.user,